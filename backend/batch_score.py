@@ -0,0 +1,312 @@
+"""
+Offline Batch Scoring
+Scores a directory or archive (.zip, .tar, .tar.gz) of resumes against one or
+more job description files on a process pool, without going through the HTTP API.
+Results stream to CSV or JSONL as they complete; a checkpoint file records
+successfully scored resumes so an interrupted run picks up where it stopped.
+
+Usage (from backend/):
+    python batch_score.py resumes/ --jd backend_role.txt --jd data_role.txt --output scores.csv
+    python batch_score.py applicants.zip --jd role.txt --output scores.jsonl --workers 8
+    python batch_score.py applicants.zip --jd role.txt --output scores.jsonl   # after an interruption: continues from the checkpoint
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import tarfile
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+import logging
+
+from services.resume_ranking import RESUME_EXTENSIONS
+
+logger = logging.getLogger(__name__)
+
+CSV_COLUMNS = [
+    'resume', 'job', 'overall_match', 'semantic_similarity', 'experience_years', 'email',
+    'matched_skills', 'missing_skills', 'partial_matches', 'error',
+]
+
+# (ref, filename, locator): locator is ('path', path), ('zip', archive, member) or
+# ('bytes', data). Workers open paths and zip members themselves, so only tar
+# members (no random access) are read by the parent.
+Task = Tuple[str, str, tuple]
+
+_worker: Dict = {}
+
+
+# ------------------------------------------------------------------ workers
+def _init_worker(jobs: List[Dict], semantic: bool) -> None:
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    # Per-file failures are reported in the output rows, not as worker tracebacks
+    logging.getLogger('services').setLevel(logging.CRITICAL)
+    from services.resume_parser import ResumeParser
+    from services.skill_matcher import SkillMatcher
+    matcher = SkillMatcher(load_model=semantic)
+    _worker.update(
+        parser=ResumeParser(),
+        matcher=matcher,
+        jobs=jobs,
+        embeddings=matcher.embed_skills([s for job in jobs for s in job['skills']]),
+        archives={},
+    )
+
+
+def _load(locator: tuple) -> bytes:
+    kind = locator[0]
+    if kind == 'path':
+        with open(locator[1], 'rb') as fh:
+            return fh.read()
+    if kind == 'zip':
+        archives = _worker['archives']
+        if locator[1] not in archives:
+            archives[locator[1]] = zipfile.ZipFile(locator[1])
+        return archives[locator[1]].read(locator[2])
+    return locator[1]
+
+
+def score_resume(task: Task) -> Tuple[str, List[Dict]]:
+    """Parse one resume and score it against every job; one row per job"""
+    ref, filename, locator = task
+    try:
+        parsed = _worker['parser'].parse(_load(locator), filename)
+    except Exception as e:
+        return ref, [{'resume': ref, 'job': job['name'], 'error': str(e) or type(e).__name__}
+                     for job in _worker['jobs']]
+
+    matcher = _worker['matcher']
+    metadata = parsed['metadata']
+    embeddings = None
+    if _worker['embeddings']:
+        embeddings = matcher.embeddings_with(_worker['embeddings'], parsed['skills'])
+    rows = []
+    for job in _worker['jobs']:
+        match = matcher.match(parsed['skills'], job['skills'], job['text'], embeddings)
+        rows.append({
+            'resume': ref,
+            'job': job['name'],
+            'overall_match': match['overall_match'],
+            'semantic_similarity': match.get('semantic_similarity', 0.0),
+            'experience_years': metadata.get('experience_years', 0),
+            'email': ((metadata.get('contact_info') or {}).get('emails') or [None])[0],
+            'matched_skills': match['matched_skills'],
+            'missing_skills': match['missing_skills'],
+            'partial_matches': match['partial_matches'],
+            'error': None,
+        })
+    return ref, rows
+
+
+# ------------------------------------------------------------------ inputs
+def _is_resume(name: str) -> bool:
+    return name.lower().endswith(RESUME_EXTENSIONS)
+
+
+def iter_tasks(source: str) -> Iterator[Task]:
+    """Resumes under a directory or inside an archive, in a stable order"""
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                if _is_resume(name):
+                    path = os.path.join(root, name)
+                    yield os.path.relpath(path, source), name, ('path', path)
+    elif zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            names = [i.filename for i in archive.infolist() if not i.is_dir() and _is_resume(i.filename)]
+        for member in names:
+            yield member, os.path.basename(member), ('zip', os.path.abspath(source), member)
+    elif tarfile.is_tarfile(source):
+        with tarfile.open(source, 'r:*') as archive:
+            for info in archive:
+                if info.isfile() and _is_resume(info.name):
+                    yield info.name, os.path.basename(info.name), ('bytes', archive.extractfile(info).read())
+    else:
+        raise ValueError(f"{source} is not a directory, zip or tar archive")
+
+
+def count_tasks(source: str) -> Optional[int]:
+    """Total resumes when cheap to know (not for compressed tars)"""
+    if os.path.isdir(source):
+        return sum(1 for root, _, files in os.walk(source) for name in files if _is_resume(name))
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            return sum(1 for i in archive.infolist() if not i.is_dir() and _is_resume(i.filename))
+    return None
+
+
+def load_jobs(paths: List[str]) -> List[Dict]:
+    """Parse each job description file once, in the parent"""
+    from services.job_parser import JobDescriptionParser
+    parser = JobDescriptionParser()
+    jobs = []
+    for path in paths:
+        with open(path, encoding='utf-8', errors='replace') as fh:
+            text = fh.read()
+        jobs.append({'name': os.path.basename(path), 'text': text,
+                     'skills': parser.extract_skills(text)['skills']})
+        logger.info("%s: %d skills", path, len(jobs[-1]['skills']))
+    return jobs
+
+
+# ------------------------------------------------------------------ outputs
+class ResultWriter:
+    def __init__(self, path: str, fmt: str):
+        """Append rows to CSV or JSONL, flushing after every resume"""
+        self.fmt = fmt
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.fh = open(path, 'a', encoding='utf-8', newline='')
+        if fmt == 'csv':
+            self.csv = csv.DictWriter(self.fh, fieldnames=CSV_COLUMNS)
+            if new_file:
+                self.csv.writeheader()
+
+    def write(self, rows: List[Dict]) -> None:
+        for row in rows:
+            if self.fmt == 'csv':
+                self.csv.writerow({
+                    k: ';'.join(v) if isinstance(v, list) else v
+                    for k, v in ((c, row.get(c)) for c in CSV_COLUMNS)
+                })
+            else:
+                self.fh.write(json.dumps(row, ensure_ascii=False) + '\n')
+        self.fh.flush()
+
+    def close(self) -> None:
+        self.fh.close()
+
+
+class Checkpoint:
+    def __init__(self, path: str):
+        """One successfully scored resume ref per line; written after its rows are flushed"""
+        self.path = path
+        self.done: Set[str] = set()
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as fh:
+                self.done = {line.rstrip('\n') for line in fh if line.strip()}
+        self.fh = open(path, 'a', encoding='utf-8')
+
+    def mark(self, ref: str) -> None:
+        self.fh.write(ref + '\n')
+        self.fh.flush()
+
+    def close(self) -> None:
+        self.fh.close()
+
+
+class Progress:
+    def __init__(self, total: Optional[int], skipped: int, stream=sys.stderr, interval: float = 0.5):
+        """Throughput line on stderr: redrawn in place on a TTY, periodic lines otherwise"""
+        self.total = total
+        self.skipped = skipped
+        self.stream = stream
+        self.tty = stream.isatty()
+        self.interval = interval if self.tty else 10.0
+        self.start = time.perf_counter()
+        self.last = 0.0
+        self.done = 0
+        self.failed = 0
+
+    def update(self, failed: bool, force: bool = False) -> None:
+        self.done += 1
+        self.failed += int(failed)
+        self.render(force)
+
+    def render(self, force: bool = False) -> None:
+        now = time.perf_counter()
+        if not force and now - self.last < self.interval:
+            return
+        self.last = now
+        elapsed = now - self.start
+        rate = self.done / elapsed if elapsed else 0.0
+        line = f"{self.done} scored ({self.failed} failed, {self.skipped} skipped) | {rate:.2f} resumes/s | {elapsed:.0f}s"
+        if self.total is not None:
+            remaining = self.total - self.skipped - self.done
+            eta = remaining / rate if rate else 0.0
+            line = f"{self.done + self.skipped}/{self.total} | " + line + f" | ETA {eta:.0f}s"
+        self.stream.write(('\r' + line + '\033[K') if self.tty else line + '\n')
+        self.stream.flush()
+
+    def finish(self) -> None:
+        self.render(force=True)
+        if self.tty:
+            self.stream.write('\n')
+
+
+# ------------------------------------------------------------------ driver
+def run(args) -> Dict:
+    fmt = args.format or ('jsonl' if args.output.endswith(('.jsonl', '.ndjson')) else 'csv')
+    jobs = load_jobs(args.jd)
+    checkpoint = Checkpoint(args.checkpoint or args.output + '.checkpoint')
+    writer = ResultWriter(args.output, fmt)
+    progress = Progress(count_tasks(args.source), skipped=0)
+    max_in_flight = args.workers * 4
+
+    pool = ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                               initargs=(jobs, not args.no_semantic))
+    pending = set()
+    try:
+        tasks = iter_tasks(args.source)
+        exhausted = False
+        while True:
+            # Bounded window: only max_in_flight resumes are queued at once
+            while not exhausted and len(pending) < max_in_flight:
+                task = next(tasks, None)
+                if task is None:
+                    exhausted = True
+                elif task[0] in checkpoint.done:
+                    progress.skipped += 1
+                else:
+                    pending.add(pool.submit(score_resume, task))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                ref, rows = future.result()
+                writer.write(rows)
+                failed = any(row.get('error') for row in rows)
+                if not failed:
+                    checkpoint.mark(ref)  # failed resumes are retried by the next run
+                progress.update(failed=failed)
+    except KeyboardInterrupt:
+        logger.warning("\nInterrupted; re-run the same command to resume from %s", checkpoint.path)
+        for future in pending:
+            future.cancel()
+        raise
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+        writer.close()
+        checkpoint.close()
+        progress.finish()
+    return {'scored': progress.done, 'failed': progress.failed, 'skipped': progress.skipped,
+            'seconds': round(time.perf_counter() - progress.start, 2)}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('source', help='directory, .zip or .tar[.gz] of resumes (PDF/DOCX)')
+    parser.add_argument('--jd', action='append', required=True, help='job description text file (repeatable)')
+    parser.add_argument('--output', required=True, help='results file (.csv or .jsonl)')
+    parser.add_argument('--format', choices=['csv', 'jsonl'], help='default: from the output extension')
+    parser.add_argument('--checkpoint', help='default: <output>.checkpoint')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--no-semantic', action='store_true',
+                        help='skip embedding similarity (no sentence-transformer per worker)')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logger.setLevel(logging.INFO)
+    try:
+        summary = run(args)
+    except KeyboardInterrupt:
+        return 130
+    logger.info("Scored %(scored)d resumes (%(failed)d failed, %(skipped)d already done) in %(seconds)ss", summary)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
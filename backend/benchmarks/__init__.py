@@ -0,0 +1 @@
+# Benchmark suite and synthetic corpus generator
@@ -0,0 +1,199 @@
+"""
+Synthetic Resume / Job Description Corpus
+Deterministic generator for benchmark inputs: plain text, digital PDF,
+scanned (image-only) PDF and DOCX documents of configurable size and skill density
+"""
+import io
+import random
+from typing import List, Optional
+
+from docx import Document
+from PIL import Image, ImageDraw, ImageFont
+
+# Skills the parsers recognize, plus aliases the matcher normalizes
+TAXONOMY_SKILLS = [
+    'Python', 'Java', 'JavaScript', 'TypeScript', 'C++', 'Go', 'Rust', 'Kotlin', 'Scala',
+    'HTML', 'CSS', 'React', 'Angular', 'Vue.js', 'Node.js', 'Django', 'Flask', 'Spring Boot',
+    'MySQL', 'PostgreSQL', 'MongoDB', 'Redis', 'Elasticsearch', 'Cassandra', 'DynamoDB',
+    'AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes', 'Jenkins', 'Terraform', 'Ansible', 'Helm',
+    'Machine Learning', 'Deep Learning', 'NLP', 'TensorFlow', 'PyTorch', 'Pandas', 'NumPy',
+    'Git', 'GitHub', 'Jira', 'Figma', 'Agile', 'Scrum', 'DevOps', 'CI/CD', 'Microservices',
+    'REST API', 'GraphQL', 'Leadership', 'Communication', 'Project Management',
+]
+ALIASES = ['JS', 'ReactJS', 'NodeJS', 'K8s', 'Amazon Web Services', 'Postgres', 'ML', 'Py']
+# Plausible terms outside the taxonomy (exercise the "no match" paths)
+UNKNOWN_SKILLS = ['FastAPI', 'Snowflake', 'dbt', 'Airflow', 'Kafka', 'Spark', 'Svelte', 'Pulumi']
+
+FILLER = (
+    'designed built delivered improved maintained led migrated scaled optimized owned '
+    'the a an and with for across using to of on in team platform service pipeline '
+    'customers latency reliability features releases production systems data users '
+    'reduced increased automated collaborated mentored reviewed shipped tested'
+).split()
+
+SECTION_HEADERS = ['Summary', 'Experience', 'Projects', 'Skills', 'Education']
+JD_HEADERS = ['About us', 'Responsibilities', 'Requirements', 'Nice to have', 'Benefits']
+
+LINE_WIDTH = 90
+
+
+def _words(rng: random.Random, n_words: int, skill_density: float,
+           skills: List[str]) -> List[str]:
+    out = []
+    for _ in range(n_words):
+        if rng.random() < skill_density:
+            out.append(rng.choice(skills))
+        else:
+            out.append(rng.choice(FILLER))
+    return out
+
+
+def _wrap(words: List[str], width: int = LINE_WIDTH) -> List[str]:
+    lines, current = [], ''
+    for word in words:
+        if current and len(current) + len(word) + 1 > width:
+            lines.append(current)
+            current = word
+        else:
+            current = f'{current} {word}' if current else word
+    if current:
+        lines.append(current)
+    return lines
+
+
+def resume_text(seed: int = 0, n_words: int = 500, skill_density: float = 0.05,
+                years: Optional[int] = None) -> str:
+    """Plain-text resume with contact details, sections and ~n_words of body"""
+    rng = random.Random(seed)
+    skills = TAXONOMY_SKILLS + ALIASES + UNKNOWN_SKILLS
+    years = years if years is not None else rng.randint(0, 15)
+    lines = [
+        f'Candidate {seed}',
+        f'candidate{seed}@example.com | +1 555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}',
+        f'linkedin.com/in/candidate-{seed} | github.com/candidate{seed}',
+        f'{years}+ years of experience',
+    ]
+    per_section = max(1, n_words // len(SECTION_HEADERS))
+    for header in SECTION_HEADERS:
+        lines.append('')
+        lines.append(header)
+        lines.extend(_wrap(_words(rng, per_section, skill_density, skills)))
+    return '\n'.join(lines)
+
+
+def job_description_text(seed: int = 0, n_words: int = 300, skill_density: float = 0.08) -> str:
+    """Plain-text job description with requirement/preferred sections"""
+    rng = random.Random(10_000 + seed)
+    skills = TAXONOMY_SKILLS + ALIASES + UNKNOWN_SKILLS
+    lines = [f'Senior Engineer {seed}', f'{rng.randint(2, 8)}+ years of experience required']
+    per_section = max(1, n_words // len(JD_HEADERS))
+    for header in JD_HEADERS:
+        lines.append('')
+        lines.append(header)
+        body = _words(rng, per_section, skill_density, skills)
+        if header == 'Requirements':
+            body = ['must', 'have'] + body
+        lines.extend(_wrap(body))
+    return '\n'.join(lines)
+
+
+# ------------------------------------------------------------------ documents
+def _pdf_escape(line: str) -> str:
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def text_pdf(text: str, lines_per_page: int = 55) -> bytes:
+    """Minimal digital (text-layer) PDF using the built-in Helvetica font"""
+    lines = text.split('\n') or ['']
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
+
+    objects: List[bytes] = []
+    font_id = 3
+    page_ids = []
+    next_id = 4
+    page_objs = []
+    for page_lines in pages:
+        stream = ['BT', '/F1 10 Tf', '12 TL', '50 800 Td']
+        for line in page_lines:
+            stream.append(f'({_pdf_escape(line)}) Tj T*')
+        stream.append('ET')
+        data = '\n'.join(stream).encode('latin-1', 'replace')
+        content_id, page_id = next_id, next_id + 1
+        next_id += 2
+        page_ids.append(page_id)
+        page_objs.append((content_id, b'<< /Length %d >>\nstream\n' % len(data) + data + b'\nendstream'))
+        page_objs.append((page_id, (
+            '<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] '
+            f'/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {content_id} 0 R >>'
+        ).encode()))
+
+    kids = ' '.join(f'{pid} 0 R' for pid in page_ids)
+    objects.append(b'<< /Type /Catalog /Pages 2 0 R >>')
+    objects.append(f'<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>'.encode())
+    objects.append(b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>')
+    objects.extend(body for _, body in sorted(page_objs))
+
+    out = io.BytesIO()
+    out.write(b'%PDF-1.4\n')
+    offsets = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b'%d 0 obj\n' % i + body + b'\nendobj\n')
+    xref = out.tell()
+    out.write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1))
+    for off in offsets:
+        out.write(b'%010d 00000 n \n' % off)
+    out.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def scanned_pdf(text: str, lines_per_page: int = 45, dpi: int = 150) -> bytes:
+    """Image-only PDF (no text layer), forcing the OCR extraction path"""
+    font = ImageFont.load_default()
+    width, height = int(8.27 * dpi), int(11.69 * dpi)
+    lines = text.split('\n') or ['']
+    images = []
+    for start in range(0, len(lines), lines_per_page):
+        img = Image.new('L', (width, height), 255)
+        draw = ImageDraw.Draw(img)
+        y = dpi // 2
+        for line in lines[start:start + lines_per_page]:
+            draw.text((dpi // 2, y), line, fill=0, font=font)
+            y += int(dpi * 0.22)
+        images.append(img)
+    out = io.BytesIO()
+    images[0].save(out, 'PDF', resolution=dpi, save_all=True, append_images=images[1:])
+    return out.getvalue()
+
+
+def docx_document(text: str) -> bytes:
+    """DOCX with one paragraph per line"""
+    doc = Document()
+    for line in text.split('\n'):
+        doc.add_paragraph(line)
+    out = io.BytesIO()
+    doc.save(out)
+    return out.getvalue()
+
+
+def resume_document(kind: str, seed: int = 0, n_words: int = 500,
+                    skill_density: float = 0.05) -> bytes:
+    """Render a synthetic resume as 'pdf', 'scanned_pdf' or 'docx'"""
+    text = resume_text(seed, n_words, skill_density)
+    if kind == 'pdf':
+        return text_pdf(text)
+    if kind == 'scanned_pdf':
+        return scanned_pdf(text)
+    if kind == 'docx':
+        return docx_document(text)
+    raise ValueError(f"Unknown document kind: {kind}")
+
+
+def skill_list(seed: int = 0, count: int = 15, unknown_ratio: float = 0.1) -> List[str]:
+    """Random skill list (as produced by the parsers) for matcher/recommender benchmarks"""
+    rng = random.Random(20_000 + seed)
+    skills = []
+    for _ in range(count):
+        pool = UNKNOWN_SKILLS if rng.random() < unknown_ratio else TAXONOMY_SKILLS + ALIASES
+        skills.append(rng.choice(pool))
+    return list(dict.fromkeys(skills))
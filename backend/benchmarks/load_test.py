@@ -0,0 +1,250 @@
+"""
+End-to-end Load Test
+Asyncio load generator for /api/analyze, /api/match_skills, /api/login and the
+mock-interview flow. By default it drives the in-process FastAPI app with an
+in-memory Mongo stand-in (MONGO_URI=mongomock://); --url targets a live server.
+
+Usage (from backend/):
+    python -m benchmarks.load_test --concurrency 16 --duration 30
+    python -m benchmarks.load_test --mix analyze=1,match=6,login=2,mock=1 --output load.json
+    python -m benchmarks.load_test --url http://localhost:8000 --concurrency 64
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Dict, List, Optional
+import logging
+
+import httpx
+
+from benchmarks import corpus
+
+logger = logging.getLogger(__name__)
+
+SCENARIOS = ('analyze', 'match', 'login', 'mock')
+DEFAULT_MIX = 'analyze=1,match=6,login=2,mock=1'
+LOAD_TEST_PASSWORD = 'load-test-password'
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class Stats:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {name: [] for name in SCENARIOS}
+        self.errors: Dict[str, int] = {name: 0 for name in SCENARIOS}
+        self.loop_lag: List[float] = []
+
+    def record(self, scenario: str, seconds: float, ok: bool) -> None:
+        self.latencies[scenario].append(seconds)
+        if not ok:
+            self.errors[scenario] += 1
+
+    def summary(self, elapsed: float) -> Dict:
+        report = {'elapsed_s': round(elapsed, 3), 'scenarios': {}}
+        total = errors = 0
+        for name in SCENARIOS:
+            samples = sorted(self.latencies[name])
+            if not samples:
+                continue
+            total += len(samples)
+            errors += self.errors[name]
+            report['scenarios'][name] = {
+                'requests': len(samples),
+                'errors': self.errors[name],
+                'error_rate': round(self.errors[name] / len(samples), 4),
+                'throughput_rps': round(len(samples) / elapsed, 2),
+                'p50_ms': round(percentile(samples, 50) * 1000, 2),
+                'p95_ms': round(percentile(samples, 95) * 1000, 2),
+                'p99_ms': round(percentile(samples, 99) * 1000, 2),
+                'mean_ms': round(statistics.fmean(samples) * 1000, 2),
+            }
+        report['total'] = {
+            'requests': total,
+            'errors': errors,
+            'error_rate': round(errors / total, 4) if total else 0.0,
+            'throughput_rps': round(total / elapsed, 2) if elapsed else 0.0,
+        }
+        if self.loop_lag:
+            lag = sorted(self.loop_lag)
+            report['event_loop_lag'] = {
+                'p50_ms': round(percentile(lag, 50) * 1000, 2),
+                'p99_ms': round(percentile(lag, 99) * 1000, 2),
+                'max_ms': round(lag[-1] * 1000, 2),
+            }
+        return report
+
+
+class LoadGenerator:
+    def __init__(self, client: httpx.AsyncClient, mix: Dict[str, float], seed: int = 0,
+                 resume_words: int = 400, n_users: int = 20):
+        self.client = client
+        self.mix = mix
+        self.rng = random.Random(seed)
+        self.stats = Stats()
+        self.users = [f'loadtest{i}@example.com' for i in range(n_users)]
+        # Pre-render inputs so the generator itself stays cheap
+        self.resumes = [
+            (f'resume{i}.{"pdf" if i % 2 else "docx"}',
+             corpus.resume_document('pdf' if i % 2 else 'docx', seed=i, n_words=resume_words))
+            for i in range(8)
+        ]
+        self.job_descriptions = [corpus.job_description_text(seed=i, n_words=250) for i in range(8)]
+        self.skill_lists = [corpus.skill_list(seed=i, count=12) for i in range(32)]
+
+    async def setup(self) -> None:
+        """Create the login users (signup is idempotent enough: 400 when they exist)"""
+        for email in self.users:
+            await self.client.post('/api/signup', json={
+                'fullname': 'Load Test', 'email': email, 'password': LOAD_TEST_PASSWORD})
+
+    def pick(self) -> str:
+        names = list(self.mix)
+        return self.rng.choices(names, weights=[self.mix[n] for n in names])[0]
+
+    async def _timed(self, scenario: str, coro) -> None:
+        start = time.perf_counter()
+        ok = False
+        try:
+            ok = await coro
+        except Exception as e:
+            logger.debug("%s failed: %s", scenario, e)
+        self.stats.record(scenario, time.perf_counter() - start, ok)
+
+    async def analyze(self) -> bool:
+        filename, content = self.rng.choice(self.resumes)
+        response = await self.client.post(
+            '/api/analyze',
+            files={'resume_file': (filename, content)},
+            data={'job_description': self.rng.choice(self.job_descriptions),
+                  'user_id': f'user{self.rng.randrange(len(self.users))}'},
+        )
+        return response.status_code == 200
+
+    async def match(self) -> bool:
+        response = await self.client.post('/api/match_skills', json={
+            'resume_skills': self.rng.choice(self.skill_lists),
+            'job_skills': self.rng.choice(self.skill_lists),
+        })
+        return response.status_code == 200
+
+    async def login(self) -> bool:
+        response = await self.client.post('/api/login', json={
+            'email': self.rng.choice(self.users), 'password': LOAD_TEST_PASSWORD})
+        return response.status_code == 200
+
+    async def mock(self) -> bool:
+        """Full mock interview: start, answer every round, fetch feedback"""
+        company = self.rng.choice(['product', 'service', 'startup'])
+        response = await self.client.post('/api/mock/start', json={'company_type': company})
+        if response.status_code != 200:
+            return False
+        session_id = response.json()['session_id']
+        for round_number in range(1, 4):
+            response = await self.client.post('/api/mock/answer', json={
+                'session_id': session_id, 'round_number': round_number, 'answer': 'answer text'})
+            if response.status_code != 200:
+                return False
+        response = await self.client.get('/api/mock/feedback', params={'session_id': session_id})
+        return response.status_code == 200
+
+    async def worker(self, deadline: float, remaining: List[int]) -> None:
+        while time.perf_counter() < deadline:
+            if remaining[0] <= 0:
+                return
+            remaining[0] -= 1
+            scenario = self.pick()
+            await self._timed(scenario, getattr(self, scenario)())
+
+    async def monitor_loop_lag(self, interval: float = 0.01) -> None:
+        """Oversleep of a periodic timer == time the event loop was blocked"""
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            self.stats.loop_lag.append(max(0.0, time.perf_counter() - start - interval))
+
+    async def run(self, concurrency: int, duration: float, max_requests: Optional[int]) -> Dict:
+        await self.setup()
+        deadline = time.perf_counter() + duration
+        remaining = [max_requests if max_requests else sys.maxsize]
+        monitor = asyncio.create_task(self.monitor_loop_lag())
+        start = time.perf_counter()
+        try:
+            await asyncio.gather(*(self.worker(deadline, remaining) for _ in range(concurrency)))
+        finally:
+            monitor.cancel()
+        return self.stats.summary(time.perf_counter() - start)
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    mix = {}
+    for part in spec.split(','):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario '{name}' (expected one of {', '.join(SCENARIOS)})")
+        mix[name] = float(weight or 1)
+    return {k: v for k, v in mix.items() if v > 0}
+
+
+async def run_load_test(args) -> Dict:
+    mix = parse_mix(args.mix)
+    timeout = httpx.Timeout(args.timeout)
+
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=timeout) as client:
+            generator = LoadGenerator(client, mix, seed=args.seed, resume_words=args.resume_words)
+            return await generator.run(args.concurrency, args.duration, args.requests)
+
+    # In-process: the stand-in must be configured before main is imported
+    os.environ.setdefault('MONGO_URI', 'mongomock://localhost')
+    import main
+
+    await main.app.router.startup()
+    try:
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://loadtest',
+                                     timeout=timeout) as client:
+            generator = LoadGenerator(client, mix, seed=args.seed, resume_words=args.resume_words)
+            return await generator.run(args.concurrency, args.duration, args.requests)
+    finally:
+        await main.app.router.shutdown()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='target a running server instead of the in-process app')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=20.0, help='seconds')
+    parser.add_argument('--requests', type=int, help='stop after this many scenarios')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help='scenario weights, e.g. analyze=1,match=6')
+    parser.add_argument('--resume-words', type=int, default=400)
+    parser.add_argument('--timeout', type=float, default=60.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write the JSON report here')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    report = asyncio.run(run_load_test(args))
+    report['config'] = {k: v for k, v in vars(args).items() if k != 'output'}
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as fh:
+            json.dump(report, fh, indent=2)
+    return 0 if report['total']['requests'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
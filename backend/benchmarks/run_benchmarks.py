@@ -0,0 +1,215 @@
+"""
+Micro-benchmark Suite
+Times ResumeParser.parse, JobDescriptionParser.extract_skills, SkillMatcher.match
+and SkillRecommender.get_recommendations over the synthetic corpus and saves JSON results.
+Catalog lookup regressions (CATALOG_MATCH_CHECKS) are checked first; any failure exits 1.
+
+Usage (from backend/):
+    python -m benchmarks.run_benchmarks --sizes 200,1000 --repeat 5
+    python -m benchmarks.run_benchmarks --compare benchmarks/results/old.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+import logging
+
+from benchmarks import corpus
+
+logger = logging.getLogger(__name__)
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+
+# Catalog lookups that must not regress (None: the generic recommendation). Java is a
+# parser skill of its own and must not be taken for the JavaScript entry.
+CATALOG_MATCH_CHECKS = (
+    ('Java', None),
+    ('JavaScript', 'javascript'),
+    ('kube', 'kubernetes'),
+    ('postgres', 'postgresql'),
+    ('AWS Lambda', 'aws'),
+)
+
+
+def check_catalog_matches(skill_recommender) -> List[str]:
+    """Failed CATALOG_MATCH_CHECKS, as messages"""
+    snapshot = skill_recommender.catalog.snapshot
+    return [f"catalog match {skill!r}: expected {expected!r}, got {snapshot.match(skill)!r}"
+            for skill, expected in CATALOG_MATCH_CHECKS if snapshot.match(skill) != expected]
+
+
+def measure(fn: Callable[[], object], repeat: int, warmup: int = 1) -> Dict[str, float]:
+    """Run `fn` warmup + repeat times and summarize wall-clock seconds"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    p95_index = min(len(samples) - 1, int(round(0.95 * (len(samples) - 1))))
+    return {
+        'repeat': repeat,
+        'min_s': samples[0],
+        'median_s': statistics.median(samples),
+        'mean_s': statistics.fmean(samples),
+        'p95_s': samples[p95_index],
+        'max_s': samples[-1],
+        'ops_per_s': 1.0 / statistics.median(samples) if statistics.median(samples) else 0.0,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def _ocr_available() -> bool:
+    try:
+        import pytesseract
+        pytesseract.get_tesseract_version()
+        return True
+    except Exception:
+        return False
+
+
+def run(sizes: List[int], density: float, repeat: int, skill_counts: List[int],
+        include_scanned: bool) -> Dict:
+    from services.resume_parser import ResumeParser
+    from services.job_parser import JobDescriptionParser
+    from services.skill_matcher import SkillMatcher
+    from services.recommender import SkillRecommender
+
+    resume_parser = ResumeParser()
+    job_parser = JobDescriptionParser()
+    skill_matcher = SkillMatcher()
+    skill_recommender = SkillRecommender(known_skills=resume_parser.all_skills + job_parser.all_skills)
+
+    results = []
+    failures = check_catalog_matches(skill_recommender)
+    for failure in failures:
+        logger.error(failure)
+
+    def record(name: str, params: Dict, fn: Callable[[], object], n: int = repeat) -> None:
+        stats = measure(fn, n)
+        results.append({'name': name, 'params': params, 'stats': stats})
+        logger.info("%-28s %-36s median %8.2f ms", name, params, stats['median_s'] * 1000)
+
+    kinds = ['pdf', 'docx'] + (['scanned_pdf'] if include_scanned else [])
+    for n_words in sizes:
+        for kind in kinds:
+            content = corpus.resume_document(kind, seed=n_words, n_words=n_words, skill_density=density)
+            filename = f'resume.{"pdf" if kind.endswith("pdf") else "docx"}'
+            # OCR is orders of magnitude slower; keep its sample count small
+            n = max(1, repeat // 5) if kind == 'scanned_pdf' else repeat
+            record('resume_parser.parse', {'kind': kind, 'words': n_words, 'density': density},
+                   lambda c=content, f=filename: resume_parser.parse(c, f), n)
+
+        jd = corpus.job_description_text(seed=n_words, n_words=n_words, skill_density=density)
+        record('job_parser.extract_skills', {'words': n_words, 'density': density},
+               lambda t=jd: job_parser.extract_skills(t))
+
+    model = skill_matcher.model
+    for count in skill_counts:
+        resume_skills = corpus.skill_list(seed=count, count=count)
+        job_skills = corpus.skill_list(seed=count + 1, count=count)
+        if model is not None:
+            record('skill_matcher.match', {'skills': count, 'embedding': True},
+                   lambda r=resume_skills, j=job_skills: skill_matcher.match(r, j))
+        skill_matcher.model = None
+        try:
+            record('skill_matcher.match', {'skills': count, 'embedding': False},
+                   lambda r=resume_skills, j=job_skills: skill_matcher.match(r, j))
+        finally:
+            skill_matcher.model = model
+
+        missing = skill_matcher.match(resume_skills, job_skills)['missing_skills'] or job_skills
+        record('recommender.get_recommendations', {'skills': len(missing)},
+               lambda m=missing: skill_recommender.get_recommendations(m))
+
+    return {
+        'meta': {
+            'created_at': datetime.utcnow().isoformat(),
+            'git_commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'embedding_model': skill_matcher.model_name if model is not None else None,
+            'matcher_version': skill_matcher.version,
+            'recommender_version': skill_recommender.version,
+        },
+        'results': results,
+        'check_failures': failures,
+    }
+
+
+def _key(entry: Dict) -> str:
+    return entry['name'] + ' ' + json.dumps(entry['params'], sort_keys=True)
+
+
+def compare(baseline: Dict, current: Dict) -> List[str]:
+    """Median deltas for benchmarks present in both result files"""
+    old = {_key(e): e['stats']['median_s'] for e in baseline['results']}
+    lines = []
+    for entry in current['results']:
+        key = _key(entry)
+        if key not in old or not old[key]:
+            continue
+        new = entry['stats']['median_s']
+        change = (new - old[key]) / old[key] * 100
+        lines.append(f"{key:70s} {old[key] * 1000:9.2f} ms -> {new * 1000:9.2f} ms ({change:+6.1f}%)")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='200,1000,5000', help='document sizes in words')
+    parser.add_argument('--density', type=float, default=0.05, help='fraction of words that are skills')
+    parser.add_argument('--skills', default='5,20,50', help='skill list lengths for match/recommend')
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--no-scanned', action='store_true', help='skip scanned-PDF (OCR) cases')
+    parser.add_argument('--output', help='result file (default: benchmarks/results/<timestamp>.json)')
+    parser.add_argument('--compare', help='previous result file to diff against')
+    args = parser.parse_args(argv)
+
+    # Keep per-call service logging out of the timing output
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logger.setLevel(logging.INFO)
+    include_scanned = not args.no_scanned and _ocr_available()
+    if not args.no_scanned and not include_scanned:
+        logger.warning("tesseract not found; skipping scanned-PDF benchmarks")
+
+    report = run(
+        sizes=[int(s) for s in args.sizes.split(',') if s],
+        density=args.density,
+        repeat=args.repeat,
+        skill_counts=[int(s) for s in args.skills.split(',') if s],
+        include_scanned=include_scanned,
+    )
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, datetime.utcnow().strftime('%Y%m%dT%H%M%S') + '.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as fh:
+        json.dump(report, fh, indent=2)
+    logger.info("Saved %d results to %s", len(report['results']), output)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as fh:
+            for line in compare(json.load(fh), report):
+                logger.info(line)
+    return 1 if report['check_failures'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,36 @@
+"""
+Gunicorn configuration for the pre-fork multi-worker server
+Models are loaded and warmed once in the master, then shared copy-on-write by the workers
+
+Usage:
+    gunicorn -c gunicorn_conf.py main:app
+"""
+import gc
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", str(max(2, multiprocessing.cpu_count()))))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = int(os.getenv("WORKER_TIMEOUT", "120"))
+graceful_timeout = 30
+
+# Import main (and load spaCy + the sentence transformer) in the master before forking.
+# Database clients are opened by the app's startup event, which runs inside each worker.
+preload_app = True
+
+
+def when_ready(server):
+    """Runs in the master after the app is preloaded, before any worker is forked"""
+    import main
+
+    main.warm_up_models()
+    # Move everything allocated so far into the permanent generation so the cyclic GC
+    # never touches (and therefore never copies) the shared model pages in workers.
+    gc.collect()
+    gc.freeze()
+    server.log.info("Models warmed; %d objects frozen for copy-on-write sharing", gc.get_freeze_count())
+
+
+def post_fork(server, worker):
+    server.log.info("Worker %s forked from preloaded master", worker.pid)
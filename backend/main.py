@@ -3,16 +3,24 @@ FastAPI Backend for Resume Skill Matching + Mock Interview
 NLP-powered skill extraction, matching, and mock interview service
 """
 
+import asyncio
+import functools
+import hashlib
 from datetime import datetime
-from fastapi import FastAPI, File, Form, UploadFile, HTTPException
+from fastapi import FastAPI, File, Form, UploadFile, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel, EmailStr
 from typing import List, Dict
 import uvicorn
 import logging
 import os
+import time
 from dotenv import load_dotenv
 
+from bson import ObjectId
+from bson.errors import InvalidId
 from pymongo import MongoClient
 from passlib.hash import bcrypt
 
@@ -20,6 +28,28 @@ from services.resume_parser import ResumeParser
 from services.job_parser import JobDescriptionParser
 from services.skill_matcher import SkillMatcher
 from services.recommender import SkillRecommender
+from services.admission import AdmissionMiddleware, create_limiters
+from services.analysis_store import AnalysisWriter
+from services.blob_store import create_blob_store, is_blob_id, parse_range
+from services.candidate_index import CandidateIndex
+from services.executor import InstrumentedExecutor
+from services.job_index import JobIndex
+from services.learning_catalog import create_catalog_source
+from services.metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE, HTTP_LATENCY, HTTP_REQUESTS, REGISTRY, stage_timer,
+)
+from services.near_duplicates import NearDuplicateIndex
+from services.request_timing import (
+    DEBUG_PROFILE_HEADER, current_timer, record_stages, run_profiled, start_request_timer,
+)
+from services.response_cache import ResponseCache, canonical_skills, fingerprint
+from services.rescoring import AnalysisRescorer
+from services.resume_ranking import RESUME_EXTENSIONS, ResumeRanker, SkipResume, failed_source, zip_sources
+from services.serialization import json_response, ndjson_lines
+from services.session_store import create_session_store
+from services.single_flight import SingleFlight
+from services.skill_discovery import SkillDiscovery
+from services.user_summary import UserSummaryStore
 
 logging.basicConfig(
     level=logging.INFO,
@@ -36,10 +66,36 @@ app = FastAPI(
 # Mongo + env
 load_dotenv()
 MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017")
-client = MongoClient(MONGO_URI)
-db = client["skill_matcher_db"]
-users_collection = db["users"]
-analyses_collection = db["analyses"]  # used by resume scores
+# Allows X-Debug-Profile: 1 on /api/analyze to dump a profiler report (keep off in production)
+DEBUG_PROFILING = os.getenv("DEBUG_PROFILING", "false").lower() in ("1", "true", "yes")
+# Clients are opened on startup so pre-fork workers each get their own after fork
+client = None
+db = None
+users_collection = None
+analyses_collection = None  # used by resume scores
+analysis_writer = None  # AnalysisWriter: write-behind inserts into analyses_collection
+user_summaries = None  # UserSummaryStore: per-user aggregates updated on each analysis insert
+resume_blobs = None  # BlobStore: uploaded resume files keyed by SHA-256 (None when disabled)
+rescorer = None  # AnalysisRescorer: brings stored analyses up to the current matcher version
+job_index = None  # JobIndex: stored job descriptions + vector index for job search
+candidate_index = None  # CandidateIndex: stored resumes + skill -> resume inverted index
+resume_duplicates = None  # NearDuplicateIndex over stored resumes
+job_duplicates = None  # NearDuplicateIndex over stored job descriptions
+
+def open_database():
+    global client, db, users_collection, analyses_collection
+    if MONGO_URI.startswith("mongomock://"):
+        # In-memory stand-in for local runs and load tests (dev dependency)
+        import mongomock
+        client = mongomock.MongoClient()
+    else:
+        client = MongoClient(MONGO_URI)
+    db = client["skill_matcher_db"]
+    users_collection = db["users"]
+    analyses_collection = db["analyses"]
+
+# Innermost middleware, so shed requests still get CORS headers and request metrics
+app.add_middleware(AdmissionMiddleware, limiters=create_limiters())
 
 # CORS - explicit origins when using credentials
 app.add_middleware(
@@ -54,6 +110,29 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ------------------ Metrics ------------------
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    start = time.perf_counter()
+    timer = start_request_timer()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        if timer.stages:
+            response.headers["Server-Timing"] = timer.server_timing()
+        return response
+    finally:
+        # Label by route template (not raw path) to keep series cardinality bounded
+        route = request.scope.get("route")
+        route_path = getattr(route, "path", "unmatched")
+        HTTP_LATENCY.observe(time.perf_counter() - start, method=request.method, route=route_path)
+        HTTP_REQUESTS.inc(method=request.method, route=route_path, status=str(status))
+
+@app.get("/metrics")
+async def metrics():
+    return Response(content=REGISTRY.render(), media_type=METRICS_CONTENT_TYPE)
+
 # ------------------ Auth ------------------
 class SignupData(BaseModel):
     fullname: str
@@ -64,21 +143,33 @@ class LoginData(BaseModel):
     email: EmailStr
     password: str
 
+# bcrypt is deliberately slow (~100s of ms), so it runs on the light pool, never on the event loop
+def create_user(user: SignupData) -> bool:
+    """Insert a new user; False if the email is already registered"""
+    if users_collection.find_one({"email": user.email}):
+        return False
+    users_collection.insert_one({
+        "fullname": user.fullname,
+        "email": user.email,
+        "password": bcrypt.hash(user.password)
+    })
+    return True
+
+def authenticate(user: LoginData) -> Dict | None:
+    record = users_collection.find_one({"email": user.email})
+    if not record or not bcrypt.verify(user.password, record["password"]):
+        return None
+    return record
+
 @app.post("/api/signup")
 async def signup(user: SignupData):
-    existing_user = users_collection.find_one({"email": user.email})
-    if existing_user:
-        raise HTTPException(status_code=400, detail="Email already registered")
     try:
-        hashed_password = bcrypt.hash(user.password)
-        users_collection.insert_one({
-            "fullname": user.fullname,
-            "email": user.email,
-            "password": hashed_password
-        })
+        created = await light_executor.run(create_user, user)
     except Exception as e:
         logger.error(f"Error inserting user to DB: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
+    if not created:
+        raise HTTPException(status_code=400, detail="Email already registered")
     return {"message": "User registered successfully", "fullname": user.fullname, "email": user.email}
 
 @app.post("/api/register")
@@ -87,8 +178,8 @@ async def register(user: SignupData):
 
 @app.post("/api/login")
 async def login(user: LoginData):
-    record = users_collection.find_one({"email": user.email})
-    if not record or not bcrypt.verify(user.password, record["password"]):
+    record = await light_executor.run(authenticate, user)
+    if record is None:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     return {
         "message": "Login successful",
@@ -98,20 +189,38 @@ async def login(user: LoginData):
     }
 
 # ---------- Resume scores endpoint ----------
+def find_resume_scores(user_id: str) -> List[Dict]:
+    # Most recent first using created_at
+    # Include analyses still in the write-behind buffer so a fresh result shows up immediately
+    pending = analysis_writer.pending(lambda d: d.get("user_id") == str(user_id))
+    with stage_timer("mongo", "find_analyses"):
+        scores_cursor = analyses_collection.find({"user_id": str(user_id)}).sort("created_at", -1)
+        scores = []
+        pending_ids = {d["_id"] for d in pending}
+        stored = [s for s in scores_cursor if s.get("_id") not in pending_ids]
+        for s in sorted(pending, key=lambda d: d["created_at"], reverse=True) + stored:
+            scores.append({
+                "id": str(s.get("_id")),
+                "filename": s.get("resume_filename", "Unknown"),
+                "score": s.get("overall_match"),
+                "date": s.get("created_at"),
+            })
+    return scores
+
 @app.get("/api/users/{user_id}/resume-scores")
 async def get_resume_scores(user_id: str):
     logger.info(f"Fetching analyses for user_id: {user_id}")
-    # Most recent first using created_at
-    scores_cursor = analyses_collection.find({"user_id": str(user_id)}).sort("created_at", -1)
-    scores = []
-    for s in scores_cursor:
-        scores.append({
-            "id": str(s.get("_id")),
-            "filename": s.get("resume_filename", "Unknown"),
-            "score": s.get("overall_match"),
-            "date": s.get("created_at"),
-        })
-    return scores
+    return await light_executor.run(find_resume_scores, user_id)
+
+def find_user_summary(user_id: str) -> Dict:
+    # Analyses still in the write-behind buffer are folded in on their flush
+    with stage_timer("mongo", "find_summary"):
+        return user_summaries.get(str(user_id), analyses=analyses_collection)
+
+@app.get("/api/users/{user_id}/summary")
+async def get_user_summary(user_id: str):
+    """Dashboard aggregates (count, average, best, recent trend, top missing skills)"""
+    return await light_executor.run(find_user_summary, user_id)
 
 # ------------------ Services ------------------
 try:
@@ -119,12 +228,49 @@ try:
     resume_parser = ResumeParser()
     job_parser = JobDescriptionParser()
     skill_matcher = SkillMatcher()
-    skill_recommender = SkillRecommender()
+    skill_recommender = SkillRecommender(known_skills=resume_parser.all_skills + job_parser.all_skills)
+    # Taxonomy embeddings are computed here, before a pre-fork server forks
+    skill_discovery = SkillDiscovery(
+        skill_matcher,
+        resume_parser.all_skills + job_parser.all_skills + list(skill_matcher.skill_synonyms),
+        threshold=float(os.getenv("SKILL_DISCOVERY_THRESHOLD", "0.5")),
+        budget_ms=float(os.getenv("SKILL_DISCOVERY_BUDGET_MS", "50")),
+    )
     logger.info("All services initialized ✅")
 except Exception as e:
     logger.error("Service initialization failed: %s", e, exc_info=True)
     raise
 
+# Blocking parse/match work runs here instead of on the event loop
+cpu_executor = InstrumentedExecutor("cpu", max_workers=int(os.getenv("CPU_WORKERS", "4")))
+# Cheap blocking calls (auth, per-user reads) get their own threads so heavy work can't queue them
+light_executor = InstrumentedExecutor("light", max_workers=int(os.getenv("LIGHT_WORKERS", "8")))
+
+# ------------------ Response cache ------------------
+# /api/match_skills is pure, so responses are memoized per canonical skill sets
+match_cache = ResponseCache(
+    ttl_seconds=float(os.getenv("MATCH_CACHE_TTL_SECONDS", "600")),
+    max_entries=int(os.getenv("MATCH_CACHE_MAX_ENTRIES", "10000")),
+    max_bytes=int(os.getenv("MATCH_CACHE_MAX_MB", "64")) * 1024 * 1024,
+)
+
+for _executor in (cpu_executor, light_executor):
+    REGISTRY.gauge("executor_queue_depth", "Tasks waiting for an executor thread", ("executor",)) \
+        .set_function(lambda e=_executor: e.queued, executor=_executor.name)
+    REGISTRY.gauge("executor_active_tasks", "Tasks running on an executor thread", ("executor",)) \
+        .set_function(lambda e=_executor: e.active, executor=_executor.name)
+_cache_gauge = REGISTRY.gauge("response_cache_stat", "Response cache statistics", ("cache", "stat"))
+for _stat in ("hits", "misses", "hit_rate", "entries", "bytes", "evictions"):
+    _cache_gauge.set_function(lambda stat=_stat: match_cache.stats()[stat], cache="match_skills", stat=_stat)
+
+def match_cache_key(resume_skills: List[str], job_skills: List[str]) -> str:
+    return fingerprint(
+        canonical_skills(resume_skills),
+        canonical_skills(job_skills),
+        skill_matcher.version,
+        skill_recommender.version,
+    )
+
 # ------------------ Models for parsing/matching ------------------
 class JobDescriptionRequest(BaseModel):
     text: str
@@ -133,76 +279,297 @@ class SkillMatchRequest(BaseModel):
     resume_skills: List[str]
     job_skills: List[str]
 
-class SkillMatchResponse(BaseModel):
-    overall_match: float
-    matched_skills: List[str]
+class LearningPathRequest(BaseModel):
     missing_skills: List[str]
-    partial_matches: List[str]
-    recommendations: List[Dict]
 
 # ------------------ Core endpoints ------------------
+async def store_upload(upload: UploadFile) -> str | None:
+    """Stream an uploaded resume into the blob store; returns its blob id"""
+    if resume_blobs is None:
+        return None
+    try:
+        await upload.seek(0)
+        with stage_timer("blob_store", "put"):
+            info = await run_in_threadpool(resume_blobs.put, upload.file)
+        return info["blob_id"]
+    except Exception as e:
+        # Storage is best-effort; the analysis itself does not depend on it
+        logger.warning("Failed to store resume %s: %s", upload.filename, e)
+        return None
+
+def parse_resume_content(content: bytes, filename: str, user_id: str | None = None) -> Dict:
+    """
+    Parse a resume; skills are reused only for byte-identical content already parsed by
+    this parser version. A near-duplicate among the same user's resumes is only reported.
+    """
+    text = resume_parser.extract_text(content, filename)
+    resume_id = hashlib.sha256(content).hexdigest()  # same as the blob id
+    stored = resume_duplicates.collection.find_one(
+        {"_id": resume_id, "parser_version": resume_parser.version}, {"skills": 1})
+    result = resume_parser.parse_text(text, filename, skills=stored.get("skills") if stored else None)
+    result["suggested_skills"] = skill_discovery.suggest(text, result["skills"])
+    result["resume_id"] = resume_id
+    result["near_duplicate"] = None
+    signature = resume_duplicates.signature(text)
+    if user_id:
+        # Other users' resumes are never matched: their ids are blob ids
+        duplicate = resume_duplicates.find(signature, query={"user_id": str(user_id), "_id": {"$ne": resume_id}})
+        if duplicate:
+            result["near_duplicate"] = {"resume_id": duplicate[0]["_id"], "similarity": duplicate[1]}
+    result["fingerprint"] = resume_duplicates.fields(signature)
+    return result
+
+def index_resume(content: bytes, filename: str, blob_id: str | None, result: Dict,
+                 user_id: str | None = None) -> None:
+    """Record a parsed resume for candidate search and duplicate detection (keyed by content hash)"""
+    try:
+        metadata = result["metadata"]
+        near_duplicate = result.get("near_duplicate")
+        candidate_index.add_resume(
+            result.get("resume_id") or hashlib.sha256(content).hexdigest(),
+            filename,
+            result["skills"],
+            experience_years=metadata.get("experience_years", 0),
+            email=((metadata.get("contact_info") or {}).get("emails") or [None])[0],
+            user_id=user_id,
+            blob_id=blob_id,
+            extra={
+                **result.get("fingerprint", {}),
+                "parser_version": resume_parser.version,
+                "duplicate_of": near_duplicate["resume_id"] if near_duplicate else None,
+            },
+        )
+    except Exception as e:
+        # Best-effort, like blob storage; the parse result is still returned
+        logger.warning("Failed to index resume %s: %s", filename, e)
+
 @app.get("/")
 async def root():
     return {"message": "Resume Skill Matcher API", "status": "running"}
 
 @app.post("/api/parse_resume")
-async def parse_resume(file: UploadFile = File(...)):
+async def parse_resume(request: Request, file: UploadFile = File(...), fields: str | None = None):
     try:
         if not file.filename.endswith((".pdf", ".docx", ".doc")):
             raise HTTPException(status_code=400, detail="Only PDF / DOCX files are supported")
         content = await file.read()
         if not content:
             raise HTTPException(status_code=400, detail="Empty resume file uploaded")
-        result = resume_parser.parse(content, file.filename)
-        return {
+        blob_id = await store_upload(file)
+        result = await cpu_executor.run(parse_resume_content, content, file.filename)
+        await run_in_threadpool(index_resume, content, file.filename, blob_id, result)
+        return json_response(request, {
             "filename": file.filename,
+            "blob_id": blob_id,
             "text": result["text"],
             "skills": result["skills"],
             "metadata": result["metadata"],
-        }
+            "suggested_skills": result["suggested_skills"],
+            "near_duplicate": result["near_duplicate"],
+        }, fields)
     except Exception as e:
         logger.error("Error parsing resume: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error parsing resume: {e}")
 
+def parse_job_text(text: str) -> Dict:
+    """Job description parse plus out-of-taxonomy skill suggestions"""
+    result = job_parser.extract_skills(text)
+    result["suggested_skills"] = skill_discovery.suggest(text, result["skills"])
+    return result
+
 @app.post("/api/parse_job_description")
-async def parse_job_description(request: JobDescriptionRequest):
+async def parse_job_description(request: JobDescriptionRequest, http_request: Request,
+                                fields: str | None = None):
     try:
         if not request.text.strip():
             raise HTTPException(status_code=400, detail="Job description text is required")
-        result = job_parser.extract_skills(request.text)
-        return {
+        result = await cpu_executor.run(parse_job_text, request.text)
+        return json_response(http_request, {
             "text": request.text,
             "skills": result["skills"],
+            "suggested_skills": result["suggested_skills"],
             "requirements": result["requirements"],
             "metadata": result["metadata"],
-        }
+        }, fields)
     except Exception as e:
         logger.error("Error parsing job description: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error parsing job description: {e}")
 
-@app.post("/api/match_skills", response_model=SkillMatchResponse)
-async def match_skills(request: SkillMatchRequest):
+def compute_skill_match(resume_skills: List[str], job_skills: List[str]) -> Dict:
+    """
+    Match on the canonical (case-folded, sorted) skill lists the cache is keyed by, so the
+    cached value holds for every request with that key. Skills are returned case-folded.
+    """
+    result = skill_matcher.match(list(canonical_skills(resume_skills)), list(canonical_skills(job_skills)))
+    return {
+        "overall_match": result["overall_match"],
+        "matched_skills": sorted(result["matched_skills"]),
+        "partial_matches": sorted(result["partial_matches"]),
+    }
+
+def skill_match_response(match: Dict, job_skills: List[str]) -> Dict:
+    """A cached canonical match in this request's own spellings and job skill order"""
+    matched_keys, partial_keys = set(match["matched_skills"]), set(match["partial_matches"])
+    matched, partial, missing = [], [], []
+    for skill in job_skills:
+        key = skill.strip().lower() if skill else ""
+        if not key:
+            continue
+        if key in matched_keys:
+            if skill not in matched:
+                matched.append(skill)
+        elif key in partial_keys:
+            if skill not in partial:
+                partial.append(skill)
+        else:
+            missing.append(skill)
+    # Built as a plain dict; recommendations are memoized per spelling, so this stays cheap
+    return {
+        "overall_match": match["overall_match"],
+        "matched_skills": matched,
+        "missing_skills": missing,
+        "partial_matches": partial,
+        "recommendations": skill_recommender.get_recommendations(missing),
+    }
+
+@app.post("/api/match_skills")
+async def match_skills(request: SkillMatchRequest, http_request: Request, fields: str | None = None):
     try:
         if not request.resume_skills or not request.job_skills:
             raise HTTPException(status_code=400, detail="Both resume and job skills are required")
-        result = skill_matcher.match(request.resume_skills, request.job_skills)
-        recommendations = skill_recommender.get_recommendations(result["missing_skills"])
-        return SkillMatchResponse(
-            overall_match=result["overall_match"],
-            matched_skills=result["matched_skills"],
-            missing_skills=result["missing_skills"],
-            partial_matches=result["partial_matches"],
-            recommendations=recommendations,
-        )
+        cache_key = match_cache_key(request.resume_skills, request.job_skills)
+        cached = match_cache.get(cache_key)
+        if cached is None:
+            cached = await cpu_executor.run(compute_skill_match, request.resume_skills, request.job_skills)
+            match_cache.set(cache_key, cached)
+        return json_response(http_request, skill_match_response(cached, request.job_skills), fields)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Error matching skills: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error matching skills: {e}")
 
+@app.post("/api/learning_path")
+async def learning_path(request: LearningPathRequest, http_request: Request, fields: str | None = None):
+    """Missing skills ordered by prerequisites, priority and difficulty, with week estimates"""
+    skills = [s.strip() for s in request.missing_skills if s and s.strip()]
+    if not skills:
+        raise HTTPException(status_code=400, detail="missing_skills must not be empty")
+    return json_response(http_request, skill_recommender.plan_learning_path(skills), fields)
+
+@app.get("/api/resumes/{blob_id}")
+async def download_resume(blob_id: str, request: Request):
+    """Original uploaded file; honours single `Range: bytes=...` requests"""
+    if resume_blobs is None or not is_blob_id(blob_id):
+        raise HTTPException(status_code=404, detail="Resume not found")
+    size = await run_in_threadpool(resume_blobs.size, blob_id)
+    if size is None:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    headers = {"Accept-Ranges": "bytes", "ETag": f'"{blob_id}"', "Cache-Control": "private, max-age=31536000, immutable"}
+    try:
+        byte_range = parse_range(request.headers.get("range"), size)
+    except ValueError:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+    media_type = await run_in_threadpool(resume_blobs.content_type, blob_id) if size else "application/octet-stream"
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(resume_blobs.iter_range(blob_id), media_type=media_type, headers=headers)
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(resume_blobs.iter_range(blob_id, start, end), status_code=206,
+                             media_type=media_type, headers=headers)
+
+@app.get("/api/cache/stats")
+async def cache_stats():
+    return {"match_skills": match_cache.stats()}
+
+def run_analysis(resume_content: bytes, filename: str, job_description: str, user_id: str | None = None):
+    resume_result = parse_resume_content(resume_content, filename, user_id)
+    job_result = parse_job_text(job_description)
+    match_result = skill_matcher.match(resume_result["skills"], job_result["skills"])
+    recommendations = skill_recommender.get_recommendations(match_result["missing_skills"])
+    return resume_result, job_result, match_result, recommendations
+
+# Double-clicks and client retries send the same analysis several times within a second
+analysis_flights = SingleFlight("analyze", linger=float(os.getenv("ANALYZE_COALESCE_SECONDS", "2")))
+
+def analysis_key(resume_content: bytes, job_description: str, user_id: str | None) -> str:
+    """Coalescing key: resume bytes, whitespace-normalized job description and user"""
+    return fingerprint(hashlib.sha256(resume_content).hexdigest(),
+                       hashlib.sha256(" ".join(job_description.split()).encode("utf-8")).hexdigest(),
+                       str(user_id) if user_id else None)
+
+async def analyze_and_store(resume_content: bytes, filename: str, job_description: str,
+                            user_id: str | None, blob_id: str | None, profiled: bool = False):
+    """Run the analysis, index the resume and persist the analysis; returns (payload, profile report path)"""
+    report_path = None
+    if profiled:
+        analysis, report_path = await cpu_executor.run(
+            run_profiled, run_analysis, resume_content, filename, job_description, user_id
+        )
+    else:
+        analysis = await cpu_executor.run(run_analysis, resume_content, filename, job_description, user_id)
+    resume_result, job_result, match_result, recommendations = analysis
+    timer = current_timer()
+    await run_in_threadpool(index_resume, resume_content, filename, blob_id, resume_result,
+                            str(user_id) if user_id else None)
+
+    # Persist analysis if user_id provided so dashboard can load past scores
+    try:
+        doc = {
+            "user_id": str(user_id) if user_id else None,
+            "resume_filename": filename,
+            "resume_blob_id": blob_id,
+            "overall_match": match_result["overall_match"],
+            "matched_skills": match_result["matched_skills"],
+            "missing_skills": match_result["missing_skills"],
+            "partial_matches": match_result["partial_matches"],
+            "job_skills": job_result["skills"],
+            "resume_skills": resume_result["skills"],
+            "semantic_similarity": match_result.get("semantic_similarity", 0.0),
+            "match_version": skill_matcher.version,
+            "processing_time_seconds": round(timer.elapsed(), 4) if timer else None,
+            "stage_timings": timer.as_dict() if timer else {},
+            "created_at": datetime.utcnow().isoformat(),
+        }
+        if user_id:
+            analysis_writer.enqueue(doc)
+    except Exception as e:
+        logger.warning(f"Failed to save analysis: {e}")
+
+    return {
+        "resume": {"filename": filename, "blob_id": blob_id, "skills": resume_result["skills"],
+                   "suggested_skills": resume_result["suggested_skills"],
+                   "near_duplicate": resume_result["near_duplicate"]},
+        "job": {"skills": job_result["skills"], "suggested_skills": job_result["suggested_skills"],
+                "requirements": job_result["requirements"]},
+        "analysis": {
+            "overall_match": match_result["overall_match"],
+            "matched_skills": match_result["matched_skills"],
+            "missing_skills": match_result["missing_skills"],
+            "partial_matches": match_result["partial_matches"],
+            "recommendations": recommendations,
+        },
+    }, report_path
+
+async def coalesced_analysis(resume_content: bytes, filename: str, job_description: str,
+                             user_id: str | None, blob_id: str | None):
+    """
+    analyze_and_store for SingleFlight. The shared task gets its own timer, since it runs in
+    the first caller's copied context; every caller adds the returned stages to its own.
+    """
+    timer = start_request_timer()
+    payload, _ = await analyze_and_store(resume_content, filename, job_description, user_id, blob_id)
+    return payload, dict(timer.stages)
+
 @app.post("/api/analyze")
 async def analyze_resume_job(
+    request: Request,
     resume_file: UploadFile = File(...),
     job_description: str = Form(...),
     user_id: str | None = Form(None),  # accept optional user_id from client
+    fields: str | None = None,
 ):
     try:
         resume_content = await resume_file.read()
@@ -210,46 +577,319 @@ async def analyze_resume_job(
             raise HTTPException(status_code=400, detail="Uploaded resume file is empty")
         if not job_description.strip():
             raise HTTPException(status_code=400, detail="Job description text is required")
+        blob_id = await store_upload(resume_file)
 
-        resume_result = resume_parser.parse(resume_content, resume_file.filename)
-        job_result = job_parser.extract_skills(job_description)
-
-        match_result = skill_matcher.match(resume_result["skills"], job_result["skills"])
-        recommendations = skill_recommender.get_recommendations(match_result["missing_skills"])
-
-        # Persist analysis if user_id provided so dashboard can load past scores
-        try:
-            doc = {
-                "user_id": str(user_id) if user_id else None,
-                "resume_filename": resume_file.filename,
-                "overall_match": match_result["overall_match"],
-                "matched_skills": match_result["matched_skills"],
-                "missing_skills": match_result["missing_skills"],
-                "partial_matches": match_result["partial_matches"],
-                "job_skills": job_result["skills"],
-                "resume_skills": resume_result["skills"],
-                "created_at": datetime.utcnow().isoformat(),
-            }
-            if user_id:
-                analyses_collection.insert_one(doc)
-        except Exception as e:
-            logger.warning(f"Failed to save analysis: {e}")
-
-        return {
-            "resume": {"filename": resume_file.filename, "skills": resume_result["skills"]},
-            "job": {"skills": job_result["skills"], "requirements": job_result["requirements"]},
-            "analysis": {
-                "overall_match": match_result["overall_match"],
-                "matched_skills": match_result["matched_skills"],
-                "missing_skills": match_result["missing_skills"],
-                "partial_matches": match_result["partial_matches"],
-                "recommendations": recommendations,
-            },
-        }
+        headers = {}
+        if DEBUG_PROFILING and request.headers.get(DEBUG_PROFILE_HEADER):
+            payload, report_path = await analyze_and_store(
+                resume_content, resume_file.filename, job_description, user_id, blob_id, profiled=True
+            )
+            headers["X-Profile-Report"] = os.path.basename(report_path)
+        else:
+            # Identical in-flight requests share one run, and so one stored analysis
+            (payload, stages), shared = await analysis_flights.run(
+                analysis_key(resume_content, job_description, user_id),
+                functools.partial(coalesced_analysis, resume_content, resume_file.filename,
+                                  job_description, user_id, blob_id),
+            )
+            record_stages(stages)
+            if shared:
+                headers["X-Coalesced"] = "1"
+                # Same bytes, but possibly uploaded under another name
+                payload = {**payload, "resume": {**payload["resume"], "filename": resume_file.filename}}
+        return json_response(request, payload, fields, headers=headers)
     except Exception as e:
         logger.error("Error in complete analysis: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Analysis error: {e}")
 
+MAX_JOBS_PER_REQUEST = int(os.getenv("MAX_JOBS_PER_REQUEST", "50"))
+
+async def load_resume(resume_file: UploadFile | None, resume_blob_id: str | None):
+    """(content, filename, blob_id) from an upload or a previously stored blob"""
+    if resume_file is not None:
+        content = await resume_file.read()
+        if not content:
+            raise HTTPException(status_code=400, detail="Uploaded resume file is empty")
+        return content, resume_file.filename, await store_upload(resume_file)
+    if not resume_blob_id:
+        raise HTTPException(status_code=400, detail="resume_file or resume_blob_id is required")
+    if resume_blobs is None or not is_blob_id(resume_blob_id):
+        raise HTTPException(status_code=404, detail="Resume not found")
+    try:
+        content = await run_in_threadpool(resume_blobs.read, resume_blob_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    filename = await run_in_threadpool(resume_blobs.parser_filename, resume_blob_id)
+    return content, filename, resume_blob_id
+
+def load_job_descriptions(job_ids: List[str]) -> Dict[str, str]:
+    """Texts of stored job descriptions by id"""
+    try:
+        object_ids = [ObjectId(job_id) for job_id in job_ids]
+    except InvalidId:
+        raise HTTPException(status_code=400, detail="Invalid job description id")
+    found = {str(d["_id"]): d.get("text", "") for d in db["job_descriptions"].find(
+        {"_id": {"$in": object_ids}, "deleted": {"$ne": True}}, {"text": 1})}
+    missing = [job_id for job_id in job_ids if job_id not in found]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Job descriptions not found: {', '.join(missing)}")
+    return found
+
+def match_resume_to_jobs(resume_skills: List[str], job_results: List[Dict], job_texts: List[str]) -> List[Dict]:
+    """Match one skill set against every job with a single shared embedding pass"""
+    matches = skill_matcher.match_many(resume_skills, [j["skills"] for j in job_results], job_texts)
+    for match in matches:
+        match["recommendations"] = skill_recommender.get_recommendations(match["missing_skills"])
+    return matches
+
+@app.post("/api/analyze_many")
+async def analyze_many(
+    request: Request,
+    resume_file: UploadFile | None = File(None),
+    resume_blob_id: str | None = Form(None),
+    job_descriptions: List[str] = Form([]),
+    job_description_ids: List[str] = Form([]),
+    fields: str | None = None,
+):
+    """One resume against many job descriptions (repeat the form fields), ranked by match"""
+    try:
+        jobs = [{"index": i, "job_id": None, "text": text} for i, text in enumerate(job_descriptions)]
+        if job_description_ids:
+            texts = await run_in_threadpool(load_job_descriptions, job_description_ids)
+            jobs += [{"index": len(jobs) + i, "job_id": job_id, "text": texts[job_id]}
+                     for i, job_id in enumerate(job_description_ids)]
+        if not jobs:
+            raise HTTPException(status_code=400, detail="At least one job description is required")
+        if len(jobs) > MAX_JOBS_PER_REQUEST:
+            raise HTTPException(status_code=400,
+                                detail=f"At most {MAX_JOBS_PER_REQUEST} job descriptions per request")
+        if any(not job["text"].strip() for job in jobs):
+            raise HTTPException(status_code=400, detail="Job description text is required")
+        content, filename, blob_id = await load_resume(resume_file, resume_blob_id)
+
+        # Resume and each distinct JD are parsed concurrently on the CPU pool
+        distinct_texts = list(dict.fromkeys(" ".join(job["text"].split()) for job in jobs))
+        resume_result, *parsed = await asyncio.gather(
+            cpu_executor.run(parse_resume_content, content, filename),
+            *(cpu_executor.run(job_parser.extract_skills, text) for text in distinct_texts),
+        )
+        parsed_by_text = dict(zip(distinct_texts, parsed))
+        await run_in_threadpool(index_resume, content, filename, blob_id, resume_result)
+        job_results = [parsed_by_text[" ".join(job["text"].split())] for job in jobs]
+
+        matches = await cpu_executor.run(
+            match_resume_to_jobs, resume_result["skills"], job_results, [job["text"] for job in jobs]
+        )
+        results = [{
+            "index": job["index"],
+            "job_id": job["job_id"],
+            "overall_match": match["overall_match"],
+            "semantic_similarity": match.get("semantic_similarity", 0.0),
+            "job_skills": job_result["skills"],
+            "matched_skills": match["matched_skills"],
+            "missing_skills": match["missing_skills"],
+            "partial_matches": match["partial_matches"],
+            "recommendations": match["recommendations"],
+        } for job, job_result, match in zip(jobs, job_results, matches)]
+        results.sort(key=lambda r: (-r["overall_match"], -r["semantic_similarity"], r["index"]))
+        for rank, result in enumerate(results, start=1):
+            result["rank"] = rank
+
+        return json_response(request, {
+            "resume": {"filename": filename, "blob_id": blob_id, "skills": resume_result["skills"],
+                       "suggested_skills": resume_result["suggested_skills"],
+                       "near_duplicate": resume_result["near_duplicate"]},
+            "results": results,
+        }, fields)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error in multi-job analysis: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Analysis error: {e}")
+
+MAX_RESUMES_PER_RANKING = int(os.getenv("MAX_RESUMES_PER_RANKING", "1000"))
+MAX_RESUME_FILE_BYTES = int(os.getenv("MAX_RESUME_FILE_MB", "10")) * 1024 * 1024
+resume_ranker = ResumeRanker(max_workers=int(os.getenv("RANKING_WORKERS", "2")))
+
+def read_spooled(stream) -> bytes:
+    stream.seek(0)
+    return stream.read()
+
+def ranking_blob_filenames(blob_ids: List[str]) -> Dict[str, str]:
+    """Parser file names of stored resumes; all must exist, so a ranking never starts with a missing one"""
+    filenames = {}
+    for blob_id in blob_ids:
+        if resume_blobs.size(blob_id) is None:
+            raise HTTPException(status_code=404, detail=f"Resume not found: {blob_id}")
+        filenames[blob_id] = resume_blobs.parser_filename(blob_id)
+    return filenames
+
+def ranking_sources(resume_files: List[UploadFile], blob_filenames: Dict[str, str]):
+    """Lazy (ref, filename, load) sources over uploads, zip members and stored blobs"""
+    count = 0
+    def limited(sources):
+        nonlocal count
+        for source in sources:
+            count += 1
+            if count > MAX_RESUMES_PER_RANKING:
+                logger.warning("Ranking input truncated at %d resumes", MAX_RESUMES_PER_RANKING)
+                return
+            yield source
+    def all_sources():
+        for i, upload in enumerate(resume_files):
+            name = upload.filename or f"upload{i}"
+            if name.lower().endswith(".zip"):
+                yield from zip_sources(upload.file, name, MAX_RESUME_FILE_BYTES)
+            elif name.lower().endswith(RESUME_EXTENSIONS):
+                yield f"upload:{name}", name, functools.partial(read_spooled, upload.file)
+            else:
+                yield failed_source(f"upload:{name}", name, SkipResume("unsupported file type"))
+        for blob_id, filename in blob_filenames.items():
+            yield f"blob:{blob_id}", filename, functools.partial(resume_blobs.read, blob_id)
+    return limited(all_sources())
+
+@app.post("/api/rank_resumes")
+async def rank_resumes(
+    job_description: str | None = Form(None),
+    job_description_id: str | None = Form(None),
+    resume_files: List[UploadFile] = File([]),
+    resume_blob_ids: List[str] = Form([]),
+    top_k: int = Form(20),
+):
+    """
+    Rank many resumes (uploads, zip archives, stored blob ids) against one job description.
+    Streams NDJSON: one `result`/`error` line per resume as it is scored, then a final `top_k` line.
+    """
+    if job_description_id:
+        job_description = (await run_in_threadpool(load_job_descriptions, [job_description_id]))[job_description_id]
+    if not job_description or not job_description.strip():
+        raise HTTPException(status_code=400, detail="job_description or job_description_id is required")
+    if not resume_files and not resume_blob_ids:
+        raise HTTPException(status_code=400, detail="At least one resume is required")
+    if resume_blob_ids and (resume_blobs is None or not all(is_blob_id(b) for b in resume_blob_ids)):
+        raise HTTPException(status_code=400, detail="Invalid resume blob id")
+    if top_k < 1:
+        raise HTTPException(status_code=400, detail="top_k must be positive")
+    blob_filenames = await run_in_threadpool(ranking_blob_filenames, list(dict.fromkeys(resume_blob_ids)))
+
+    # The JD is parsed and its skills embedded once for the whole pool
+    job_result = await cpu_executor.run(job_parser.extract_skills, job_description)
+    job_skills = job_result["skills"]
+    job_embeddings = await cpu_executor.run(skill_matcher.embed_skills, job_skills)
+
+    def score(resume_skills: List[str]) -> Dict:
+        embeddings = skill_matcher.embeddings_with(job_embeddings, resume_skills) if job_embeddings else None
+        return skill_matcher.match(resume_skills, job_skills, job_description, embeddings)
+
+    events = resume_ranker.rank(job_skills, ranking_sources(resume_files, blob_filenames),
+                                score, top_k=top_k, run_cpu=cpu_executor.run)
+    return StreamingResponse(ndjson_lines(events), media_type="application/x-ndjson")
+
+# ------------------ Stored job descriptions + job search ------------------
+class JobDescriptionCreate(BaseModel):
+    text: str
+    title: str | None = None
+    company: str | None = None
+
+class JobSearchRequest(BaseModel):
+    resume_skills: List[str]
+    top_k: int = 10
+
+def create_job(request: JobDescriptionCreate) -> Dict:
+    """
+    Store a job description. Skills are reused only from a stored job with identical
+    text; a near-duplicate repost is flagged but still parsed.
+    """
+    content_hash = hashlib.sha256(request.text.encode("utf-8")).hexdigest()
+    stored = job_duplicates.collection.find_one(
+        {"content_hash": content_hash, "deleted": {"$ne": True}, "parser_version": job_parser.version},
+        {"skills": 1})
+    if stored and stored.get("skills") is not None:
+        skills = stored["skills"]
+    else:
+        skills = job_parser.extract_skills(request.text)["skills"]
+    signature = job_duplicates.signature(request.text)
+    duplicate = job_duplicates.find(signature, query={"deleted": {"$ne": True}})
+    duplicate_of = str(duplicate[0]["_id"]) if duplicate else None
+    doc = job_index.add_job(request.text, skills, title=request.title, company=request.company, extra={
+        **job_duplicates.fields(signature),
+        "content_hash": content_hash,
+        "parser_version": job_parser.version,
+        "duplicate_of": duplicate_of,
+    })
+    return {"job_id": str(doc["_id"]), "title": doc["title"], "company": doc["company"],
+            "skills": skills, "indexed": doc["embedding"] is not None,
+            "duplicate_of": duplicate_of, "similarity": duplicate[1] if duplicate else None}
+
+@app.post("/api/job_descriptions")
+async def store_job_description(request: JobDescriptionCreate):
+    """Store a job description for /api/jobs/search, /api/analyze_many and /api/rank_resumes"""
+    if not request.text.strip():
+        raise HTTPException(status_code=400, detail="Job description text is required")
+    return await cpu_executor.run(create_job, request)
+
+@app.delete("/api/job_descriptions/{job_id}")
+async def delete_job_description(job_id: str):
+    if not await run_in_threadpool(job_index.delete_job, job_id):
+        raise HTTPException(status_code=404, detail="Job description not found")
+    return {"deleted": job_id}
+
+@app.post("/api/jobs/search")
+async def search_jobs(request: JobSearchRequest, http_request: Request, fields: str | None = None):
+    """Best-matching stored job descriptions for a resume's skills"""
+    if not job_index.available:
+        raise HTTPException(status_code=503, detail="Job search needs the sentence-transformer model")
+    if not request.resume_skills:
+        raise HTTPException(status_code=400, detail="resume_skills is required")
+    top_k = max(1, min(request.top_k, 100))
+    results = await cpu_executor.run(job_index.search, request.resume_skills, top_k)
+    return json_response(http_request, {"results": results}, fields)
+
+# ------------------ Candidate search ------------------
+class CandidateSearchRequest(BaseModel):
+    required_skills: List[str] = []
+    optional_skills: List[str] = []
+    min_experience: int | None = None
+    max_experience: int | None = None
+    page: int = 1
+    page_size: int = 20
+
+def find_candidates(request: CandidateSearchRequest) -> Dict:
+    found = candidate_index.search(
+        request.required_skills, request.optional_skills,
+        min_experience=request.min_experience, max_experience=request.max_experience,
+        page=max(1, request.page), page_size=max(1, min(request.page_size, 100)),
+    )
+    # Display fields for this page only
+    docs = {d["_id"]: d for d in db["resumes"].find(
+        {"_id": {"$in": [r["resume_id"] for r in found["results"]]}},
+        {"filename": 1, "email": 1, "user_id": 1, "blob_id": 1, "duplicate_of": 1})}
+    for result in found["results"]:
+        doc = docs.get(result["resume_id"], {})
+        result.update(filename=doc.get("filename"), email=doc.get("email"), user_id=doc.get("user_id"),
+                      blob_id=doc.get("blob_id"), duplicate_of=doc.get("duplicate_of"))
+    return found
+
+@app.post("/api/candidates/search")
+async def search_candidates(request: CandidateSearchRequest, http_request: Request, fields: str | None = None):
+    """Stored resumes with all required skills, ranked by optional-skill coverage and experience"""
+    if not any(s.strip() for s in request.required_skills + request.optional_skills):
+        raise HTTPException(status_code=400, detail="required_skills or optional_skills is required")
+    return json_response(http_request, await run_in_threadpool(find_candidates, request), fields)
+
+# ------------------ Admin ------------------
+@app.post("/api/admin/rescore")
+async def start_rescore():
+    """Re-score stored analyses to the current matcher version in the background"""
+    if skill_matcher.model is None:
+        raise HTTPException(status_code=503, detail="Embedding model is not loaded; re-scoring would drop semantic scores")
+    started = rescorer.start()
+    return {"started": started, **await run_in_threadpool(rescorer.status)}
+
+@app.get("/api/admin/rescore")
+async def rescore_status():
+    return await run_in_threadpool(rescorer.status)
+
 # ------------------ Mock interview ------------------
 class StartMockRequest(BaseModel):
     company_type: str
@@ -259,7 +899,7 @@ class AnswerRequest(BaseModel):
     round_number: int
     answer: str
 
-mock_sessions = {}
+mock_sessions = None  # SessionStore, created on startup
 questions_dict = {
     "product": [
         {"round": 1, "type": "coding", "question": "Write a function to reverse a linked list."},
@@ -280,18 +920,15 @@ questions_dict = {
 
 @app.post("/api/mock/start")
 async def start_mock(req: StartMockRequest):
-    session_id = f"session_{len(mock_sessions)}"
+    session_id = await light_executor.run(mock_sessions.create, req.company_type)
     rounds = questions_dict.get(req.company_type.lower(), [])
-    mock_sessions[session_id] = {"company_type": req.company_type, "round": 0, "answers": []}
     return {"session_id": session_id, "question": rounds[0] if rounds else {}}
 
 @app.post("/api/mock/answer")
 async def mock_answer(req: AnswerRequest):
-    sess = mock_sessions.get(req.session_id)
+    sess = await light_executor.run(mock_sessions.record_answer, req.session_id, req.answer)
     if not sess:
         raise HTTPException(status_code=404, detail="Session not found")
-    sess["answers"].append(req.answer)
-    sess["round"] += 1
     rounds = questions_dict.get(sess["company_type"].lower(), [])
     if sess["round"] < len(rounds):
         return {"question": rounds[sess["round"]]}
@@ -299,12 +936,96 @@ async def mock_answer(req: AnswerRequest):
 
 @app.get("/api/mock/feedback")
 async def mock_feedback(session_id: str):
-    sess = mock_sessions.get(session_id, {})
+    sess = await light_executor.run(mock_sessions.get, session_id) or {}
     return {
         "strengths": "Good technical depth.",
         "weaknesses": "Could improve on communication.",
         "score": 7
     }
 
+# ------------------ Lifecycle ------------------
+def warm_up_models():
+    """Run every model once so lazy allocations happen before a pre-fork server forks"""
+    sample = "Senior Python developer at Google with 5 years of experience in AWS, Docker and React."
+    resume_parser.extract_skills_nlp(sample)
+    job_parser.extract_skills(sample)
+    skill_matcher.match(["Python", "Docker", "React"], ["Python", "AWS", "Kubernetes"])
+    skill_recommender.get_recommendations(["AWS", "Kubernetes"])
+    skill_discovery.suggest(sample)
+
+@app.on_event("startup")
+async def startup():
+    global mock_sessions, analysis_writer, user_summaries, resume_blobs, rescorer, job_index, candidate_index
+    global resume_duplicates, job_duplicates
+    open_database()
+    mock_sessions = create_session_store(db)
+    resume_blobs = create_blob_store(db)
+    if os.getenv("RANKING_PREWARM", "false").lower() in ("1", "true", "yes"):
+        resume_ranker.warm_up()
+    analyses_collection.create_index([("user_id", 1), ("created_at", -1)])
+    user_summaries = UserSummaryStore(
+        db["user_summaries"],
+        trend_window=int(os.getenv("SUMMARY_TREND_WINDOW", "20")),
+        top_missing=int(os.getenv("SUMMARY_TOP_MISSING_SKILLS", "10")),
+    )
+    analysis_writer = AnalysisWriter(
+        analyses_collection,
+        max_batch=int(os.getenv("ANALYSIS_FLUSH_BATCH", "100")),
+        flush_interval=float(os.getenv("ANALYSIS_FLUSH_INTERVAL_SECONDS", "1.0")),
+        on_written=user_summaries.record,
+    )
+    analysis_writer.start()
+    rescorer = AnalysisRescorer(
+        analyses_collection,
+        db["background_jobs"],
+        skill_matcher,
+        batch_size=int(os.getenv("RESCORE_BATCH_SIZE", "500")),
+        pause_seconds=float(os.getenv("RESCORE_PAUSE_SECONDS", "0.1")),
+        on_batch=lambda user_ids: user_summaries.rebuild_many(user_ids, analyses_collection),
+    )
+    job_index = JobIndex(
+        db["job_descriptions"],
+        skill_matcher,
+        snapshot_path=os.getenv("JOB_INDEX_PATH", "indexes/job_index.npz"),
+        ivf_threshold=int(os.getenv("JOB_INDEX_IVF_THRESHOLD", "20000")),
+        nprobe=int(os.getenv("JOB_INDEX_NPROBE", "16")),
+    )
+    job_index.load()
+    job_index.start(interval=float(os.getenv("JOB_INDEX_SYNC_SECONDS", "5")))
+    duplicate_threshold = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.8"))
+    resume_duplicates = NearDuplicateIndex(db["resumes"], "resume", threshold=duplicate_threshold)
+    job_duplicates = NearDuplicateIndex(db["job_descriptions"], "job", threshold=duplicate_threshold)
+    db["job_descriptions"].create_index([("content_hash", 1)])
+    candidate_index = CandidateIndex(db["resumes"], skill_matcher)
+    candidate_index.load()
+    candidate_index.start(interval=float(os.getenv("CANDIDATE_INDEX_SYNC_SECONDS", "5")))
+    # The catalog file was loaded at import; switch to the configured source and poll it for edits
+    skill_recommender.catalog.set_source(create_catalog_source(db))
+    skill_recommender.catalog.start(interval=float(os.getenv("LEARNING_CATALOG_POLL_SECONDS", "30")))
+    if os.getenv("RESCORE_ON_STARTUP", "true").lower() in ("1", "true", "yes"):
+        if skill_matcher.model is None:
+            # A worker that failed to load the model would rewrite every analysis without semantic scores
+            logger.warning("Embedding model unavailable; skipping the startup re-score")
+        else:
+            rescorer.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    cpu_executor.shutdown(wait=False)
+    light_executor.shutdown(wait=False)
+    resume_ranker.shutdown()
+    resume_parser.ocr.close()
+    skill_recommender.catalog.close()
+    if rescorer is not None:
+        rescorer.stop()
+    if job_index is not None:
+        job_index.close()
+    if candidate_index is not None:
+        candidate_index.close()
+    if analysis_writer is not None:
+        analysis_writer.close()
+    if client is not None:
+        client.close()
+
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
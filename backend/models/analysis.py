@@ -26,10 +26,13 @@ class Analysis(BaseModel):
 
     # Metadata
     analysis_version: str = "1.0"
+    match_version: Optional[str] = None  # SkillMatcher.version that produced the scores
     processing_time_seconds: Optional[float] = None
+    stage_timings: Dict[str, float] = {}  # extract/parse/match/semantic/recommend seconds
 
     # === Dashboard related ===
     resume_filename: Optional[str] = None  # Store file name for dashboard
+    resume_blob_id: Optional[str] = None  # SHA-256 of the uploaded file in the resume blob store
     # You could add job title, summary, etc if needed for extra dashboard context
 
     class Config:
@@ -0,0 +1,192 @@
+"""
+Admission Control Service
+Per-route concurrency limits with a bounded FIFO wait queue, so bursts of heavy
+requests (OCR, NER, embeddings) are shed early instead of slowing down every route
+"""
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+import logging
+
+from services.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# path=concurrency/queue; paths not listed are not limited
+DEFAULT_LIMITS = (
+    '/api/analyze=4/16,/api/analyze_many=2/8,/api/parse_resume=4/16,'
+    '/api/parse_job_description=8/32,/api/job_descriptions=4/16,/api/rank_resumes=1/4'
+)
+
+ADMISSIONS = REGISTRY.counter(
+    'admission_decisions_total', 'Admission decisions by limiter and outcome', ('limiter', 'result'))
+ADMISSION_WAIT = REGISTRY.histogram(
+    'admission_queue_seconds', 'Time admitted requests spent in the admission queue', ('limiter',))
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, status_code: int, retry_after: int, reason: str):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class AdmissionLimiter:
+    def __init__(self, name: str, max_concurrent: int, max_queue: int, max_wait: float = 10.0):
+        """
+        At most `max_concurrent` requests run; up to `max_queue` more wait in arrival order
+        for at most `max_wait` seconds. Service time is tracked so Retry-After and the
+        arrival check reflect how long the queue actually takes to drain.
+        """
+        self.name = name
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.max_wait = max_wait
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._service_seconds = 1.0  # moving average; the first requests correct the guess
+
+        REGISTRY.gauge('admission_active', 'Requests holding an admission slot', ('limiter',)) \
+            .set_function(lambda: self.active, limiter=name)
+        REGISTRY.gauge('admission_queued', 'Requests waiting for an admission slot', ('limiter',)) \
+            .set_function(lambda: len(self._waiters), limiter=name)
+        REGISTRY.gauge('admission_limit', 'Configured admission limits', ('limiter', 'limit')) \
+            .set_function(lambda: self.max_concurrent, limiter=name, limit='concurrency')
+        REGISTRY.gauge('admission_limit', 'Configured admission limits', ('limiter', 'limit')) \
+            .set_function(lambda: self.max_queue, limiter=name, limit='queue')
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def expected_wait(self, position: Optional[int] = None) -> float:
+        """Seconds until a request at queue `position` (default: a new arrival) would start"""
+        if position is None:
+            position = len(self._waiters)
+            if self.active < self.max_concurrent:
+                return 0.0
+        return (position + 1) * self._service_seconds / self.max_concurrent
+
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.expected_wait()))
+
+    def _reject(self, status_code: int, result: str, reason: str) -> AdmissionRejected:
+        ADMISSIONS.inc(limiter=self.name, result=result)
+        return AdmissionRejected(status_code, self.retry_after(), reason)
+
+    async def acquire(self) -> None:
+        """Take a slot, waiting in line if needed; raises AdmissionRejected when shedding"""
+        if self.active < self.max_concurrent and not self._waiters:
+            self.active += 1
+            ADMISSIONS.inc(limiter=self.name, result='admitted')
+            ADMISSION_WAIT.observe(0.0, limiter=self.name)
+            return
+        if len(self._waiters) >= self.max_queue:
+            raise self._reject(429, 'rejected_queue_full', f"{self.name} queue is full")
+        if self.expected_wait() > self.max_wait:
+            raise self._reject(429, 'rejected_wait', f"{self.name} queue wait would exceed {self.max_wait:g}s")
+
+        start = time.perf_counter()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.max_wait)
+        except asyncio.TimeoutError:
+            self._discard(waiter)
+            raise self._reject(503, 'timed_out', f"{self.name} queue wait exceeded {self.max_wait:g}s")
+        except BaseException:
+            # Client went away while queued; hand on a slot it may have just been given
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            self._discard(waiter)
+            raise
+        ADMISSIONS.inc(limiter=self.name, result='admitted')
+        ADMISSION_WAIT.observe(time.perf_counter() - start, limiter=self.name)
+
+    def _discard(self, waiter: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def release(self, elapsed: Optional[float] = None) -> None:
+        """Free a slot, passing it straight to the longest-waiting request if any"""
+        if elapsed is not None:
+            self._service_seconds = 0.8 * self._service_seconds + 0.2 * elapsed
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)  # the slot changes hands; `active` is unchanged
+                return
+        self.active -= 1
+
+
+class AdmissionMiddleware:
+    def __init__(self, app, limiters: Dict[str, AdmissionLimiter]):
+        """
+        ASGI middleware applying `limiters` by request path. It runs before the body is
+        read, so shed uploads cost nothing, and holds the slot until the response
+        (streamed ones included) has been sent.
+        """
+        self.app = app
+        self.limiters = limiters
+
+    async def __call__(self, scope, receive, send):
+        limiter = self.limiters.get(scope.get('path', '')) if scope['type'] == 'http' else None
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+        try:
+            await limiter.acquire()
+        except AdmissionRejected as e:
+            await self._send_rejection(send, e)
+            return
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release(time.perf_counter() - start)
+
+    @staticmethod
+    async def _send_rejection(send, rejection: AdmissionRejected) -> None:
+        body = ('{"detail":"Server busy: %s. Retry in %ds."}' % (rejection.reason, rejection.retry_after)).encode()
+        await send({
+            'type': 'http.response.start',
+            'status': rejection.status_code,
+            'headers': [
+                (b'content-type', b'application/json'),
+                (b'content-length', str(len(body)).encode()),
+                (b'retry-after', str(rejection.retry_after).encode()),
+            ],
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+
+def parse_limits(spec: str, max_wait: float) -> Dict[str, AdmissionLimiter]:
+    """'/api/analyze=4/16,...' -> {path: limiter}; 'none' disables admission control"""
+    limiters = {}
+    if spec.strip().lower() == 'none':
+        return limiters
+    for item in spec.split(','):
+        if not item.strip():
+            continue
+        try:
+            path, limits = item.strip().rsplit('=', 1)
+            concurrency, _, queue = limits.partition('/')
+            limiters[path] = AdmissionLimiter(path, int(concurrency), int(queue or 0), max_wait)
+        except ValueError:
+            raise ValueError(f"Invalid ADMISSION_LIMITS entry {item!r}; expected /path=concurrency/queue")
+    return limiters
+
+
+def create_limiters() -> Dict[str, AdmissionLimiter]:
+    """Limiters from ADMISSION_LIMITS and ADMISSION_MAX_WAIT_SECONDS"""
+    limiters = parse_limits(os.getenv('ADMISSION_LIMITS', DEFAULT_LIMITS),
+                            float(os.getenv('ADMISSION_MAX_WAIT_SECONDS', '10')))
+    for path, limiter in limiters.items():
+        logger.info("Admission limit %s: %d concurrent, %d queued", path, limiter.max_concurrent, limiter.max_queue)
+    return limiters
@@ -0,0 +1,160 @@
+"""
+Analysis Persistence Service
+Write-behind buffer that moves analysis inserts off the request path and
+flushes them to the `analyses` collection with batched, unordered insert_many
+"""
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+import logging
+
+from bson import ObjectId
+from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from services.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY = 11000
+
+ANALYSES_WRITTEN = REGISTRY.counter(
+    'analysis_writes_total', 'Analysis documents persisted by the write-behind buffer')
+ANALYSES_FAILED = REGISTRY.counter(
+    'analysis_write_failures_total', 'Analysis documents dropped after retries or on overflow', ('reason',))
+FLUSH_BATCH = REGISTRY.histogram(
+    'analysis_flush_batch_size', 'Documents per insert_many flush', buckets=(1, 5, 10, 25, 50, 100, 250, 500))
+
+
+class AnalysisWriter:
+    def __init__(self, collection: Collection, max_batch: int = 100, flush_interval: float = 1.0,
+                 max_buffer: int = 10000, max_retries: int = 3, retry_backoff: float = 0.5,
+                 on_written: Optional[Callable[[List[Dict]], None]] = None):
+        """
+        Buffer analysis documents and flush them by size (max_batch) or time (flush_interval).
+        `on_written` is called with each batch of documents once they are stored.
+        """
+        self.collection = collection
+        self.on_written = on_written
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+        self._buffer: List[Dict] = []
+        self._inflight: List[Dict] = []  # batch currently being written
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        REGISTRY.gauge('analysis_buffer_size', 'Analysis documents waiting to be flushed') \
+            .set_function(lambda: len(self._buffer))
+
+    def start(self) -> None:
+        """Start the flusher thread (call after fork, e.g. from the app's startup event)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name='analysis-writer', daemon=True)
+            self._thread.start()
+
+    def enqueue(self, doc: Dict) -> Dict:
+        """
+        Buffer a document for insertion. An `_id` is assigned up front so a retried
+        batch that partially succeeded is de-duplicated by the unique index on `_id`.
+        """
+        doc.setdefault('_id', ObjectId())
+        with self._lock:
+            if len(self._buffer) >= self.max_buffer:
+                ANALYSES_FAILED.inc(reason='overflow')
+                logger.error("Analysis buffer full (%d); dropping analysis %s", self.max_buffer, doc['_id'])
+                return doc
+            self._buffer.append(doc)
+            full = len(self._buffer) >= self.max_batch
+        if full or self._thread is None:
+            self._wakeup.set()
+        if self._thread is None:
+            # Not started (scripts, tests): write through synchronously
+            self.flush()
+        return doc
+
+    def pending(self, predicate: Callable[[Dict], bool]) -> List[Dict]:
+        """Buffered or in-flight documents matching `predicate`, for read-your-writes"""
+        with self._lock:
+            return [doc for doc in self._inflight + self._buffer if predicate(doc)]
+
+    def flush(self) -> int:
+        """Write everything currently buffered; returns the number of documents inserted"""
+        written = 0
+        while True:
+            with self._lock:
+                batch = self._buffer[:self.max_batch]
+                del self._buffer[:self.max_batch]
+                self._inflight = batch
+            if not batch:
+                return written
+            try:
+                written += self._write_batch(batch)
+            finally:
+                with self._lock:
+                    self._inflight = []
+
+    def _write_batch(self, batch: List[Dict]) -> int:
+        FLUSH_BATCH.observe(len(batch))
+        pending = batch
+        inserted: List[Dict] = []
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.collection.insert_many(pending, ordered=False)
+                inserted.extend(pending)
+                pending = []
+                break
+            except BulkWriteError as e:
+                failed_indexes = set()
+                retryable = []
+                for err in e.details.get('writeErrors', []):
+                    failed_indexes.add(err['index'])
+                    # Duplicate _id means an earlier attempt already wrote it
+                    if err.get('code') == DUPLICATE_KEY:
+                        inserted.append(pending[err['index']])
+                    else:
+                        retryable.append(pending[err['index']])
+                inserted.extend(doc for i, doc in enumerate(pending) if i not in failed_indexes)
+                pending = retryable
+                if not pending:
+                    break
+                logger.warning("insert_many: %d analyses failed (attempt %d)", len(pending), attempt + 1)
+            except PyMongoError as e:
+                logger.warning("insert_many failed for %d analyses (attempt %d): %s", len(pending), attempt + 1, e)
+            if attempt < self.max_retries:
+                time.sleep(self.retry_backoff * (2 ** attempt))
+
+        if pending:
+            ANALYSES_FAILED.inc(len(pending), reason='retries_exhausted')
+            logger.error("Dropping %d analyses after %d retries", len(pending), self.max_retries)
+        ANALYSES_WRITTEN.inc(len(inserted))
+        if inserted and self.on_written is not None:
+            try:
+                self.on_written(inserted)
+            except Exception as e:
+                logger.error("on_written hook failed for %d analyses: %s", len(inserted), e, exc_info=True)
+        return len(inserted)
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error("Analysis flush failed: %s", e, exc_info=True)
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Stop the flusher and write whatever is still buffered"""
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
@@ -0,0 +1,223 @@
+"""
+Resume Blob Store
+Content-addressed storage for uploaded resume files: blobs are keyed by the
+SHA-256 of their bytes, so identical uploads are stored once
+"""
+import hashlib
+import os
+import re
+import tempfile
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple
+import logging
+
+import gridfs
+from gridfs.errors import FileExists
+from pymongo.errors import DuplicateKeyError
+
+from services.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 256 * 1024
+BLOB_ID_RE = re.compile(r'^[0-9a-f]{64}$')
+
+PARSER_FILENAMES = {'application/pdf': 'resume.pdf', 'application/msword': 'resume.doc'}
+
+BLOB_WRITES = REGISTRY.counter(
+    'resume_blob_writes_total', 'Resume uploads written to the blob store', ('result',))
+
+
+def is_blob_id(value: str) -> bool:
+    return bool(value) and BLOB_ID_RE.match(value) is not None
+
+
+def sniff_content_type(head: bytes) -> str:
+    """Media type from the leading bytes of a resume file"""
+    if head.startswith(b'%PDF'):
+        return 'application/pdf'
+    if head.startswith(b'PK\x03\x04'):
+        return 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+    if head.startswith(b'\xd0\xcf\x11\xe0'):
+        return 'application/msword'
+    return 'application/octet-stream'
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range `Range: bytes=...` header into an inclusive (start, end).
+    Returns None when the header is absent or not a single byte range (serve the
+    whole blob); raises ValueError when the range is unsatisfiable.
+    """
+    if not header or not header.startswith('bytes=') or ',' in header:
+        return None
+    start_s, _, end_s = header[len('bytes='):].strip().partition('-')
+    try:
+        if start_s == '':
+            # Suffix range: the last N bytes
+            length = int(end_s)
+            if length <= 0:
+                raise ValueError('empty suffix range')
+            return max(0, size - length), size - 1
+        start = int(start_s)
+        end = int(end_s) if end_s else size - 1
+    except ValueError:
+        raise ValueError(f'Invalid range: {header}')
+    if start >= size or end < start:
+        raise ValueError(f'Unsatisfiable range: {header}')
+    return start, min(end, size - 1)
+
+
+class BlobStore:
+    """Interface shared by all blob store backends"""
+
+    def put(self, stream: BinaryIO) -> Dict:
+        """Store the remaining bytes of `stream`; returns {'blob_id', 'size', 'created'}"""
+        raise NotImplementedError
+
+    def size(self, blob_id: str) -> Optional[int]:
+        """Blob size in bytes, or None if it does not exist"""
+        raise NotImplementedError
+
+    def iter_range(self, blob_id: str, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        """Yield bytes [start, end] (inclusive) of a blob in chunks"""
+        raise NotImplementedError
+
+    def read(self, blob_id: str) -> bytes:
+        """Whole blob as bytes (for reprocessing jobs)"""
+        if self.size(blob_id) is None:
+            raise KeyError(blob_id)
+        return b''.join(self.iter_range(blob_id))
+
+    def content_type(self, blob_id: str) -> str:
+        return sniff_content_type(next(self.iter_range(blob_id, 0, 7), b''))
+
+    def parser_filename(self, blob_id: str) -> str:
+        """Stand-in file name for ResumeParser, which dispatches on the extension"""
+        return PARSER_FILENAMES.get(self.content_type(blob_id), 'resume.docx')
+
+
+class LocalBlobStore(BlobStore):
+    def __init__(self, root: str):
+        """Blobs live at <root>/<id[:2]>/<id>; partial writes stay in <root>/.tmp"""
+        self.root = os.path.abspath(root)
+        self.tmp_dir = os.path.join(self.root, '.tmp')
+        os.makedirs(self.tmp_dir, exist_ok=True)
+
+    def path(self, blob_id: str) -> str:
+        if not is_blob_id(blob_id):
+            raise ValueError(f'Invalid blob id: {blob_id!r}')
+        return os.path.join(self.root, blob_id[:2], blob_id)
+
+    def put(self, stream: BinaryIO) -> Dict:
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.tmp_dir)
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                for chunk in iter(lambda: stream.read(CHUNK_SIZE), b''):
+                    digest.update(chunk)
+                    out.write(chunk)
+                    size += len(chunk)
+            blob_id = digest.hexdigest()
+            target = self.path(blob_id)
+            created = not os.path.exists(target)
+            if created:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                # Atomic publish; a concurrent writer of the same bytes produces the same file
+                os.replace(tmp_path, target)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+        BLOB_WRITES.inc(result='stored' if created else 'deduplicated')
+        return {'blob_id': blob_id, 'size': size, 'created': created}
+
+    def size(self, blob_id: str) -> Optional[int]:
+        try:
+            return os.path.getsize(self.path(blob_id))
+        except (OSError, ValueError):
+            return None
+
+    def iter_range(self, blob_id: str, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        with open(self.path(blob_id), 'rb') as fh:
+            fh.seek(start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                chunk = fh.read(CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    return
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+
+class GridFSBlobStore(BlobStore):
+    def __init__(self, db, bucket_name: str = 'resumes'):
+        """
+        GridFS bucket where the file name is the blob id. A unique index on
+        filename makes concurrent uploads of the same bytes store one copy.
+        """
+        self.bucket = gridfs.GridFSBucket(db, bucket_name=bucket_name)
+        self.files = db[f'{bucket_name}.files']
+        self.chunks = db[f'{bucket_name}.chunks']
+        self.files.create_index('filename', unique=True)
+
+    def put(self, stream: BinaryIO) -> Dict:
+        # The id is only known after hashing, so spool first (memory, then disk)
+        digest = hashlib.sha256()
+        size = 0
+        with tempfile.SpooledTemporaryFile(max_size=4 * 1024 * 1024) as spool:
+            for chunk in iter(lambda: stream.read(CHUNK_SIZE), b''):
+                digest.update(chunk)
+                spool.write(chunk)
+                size += len(chunk)
+            blob_id = digest.hexdigest()
+            created = self.files.find_one({'filename': blob_id}, {'_id': 1}) is None
+            if created:
+                spool.seek(0)
+                grid_in = self.bucket.open_upload_stream(blob_id, chunk_size_bytes=CHUNK_SIZE)
+                try:
+                    for chunk in iter(lambda: spool.read(CHUNK_SIZE), b''):
+                        grid_in.write(chunk)
+                    grid_in.close()
+                except (FileExists, DuplicateKeyError):
+                    # Lost the race: drop our chunks, keep the winner's copy
+                    self.chunks.delete_many({'files_id': grid_in._id})
+                    created = False
+        BLOB_WRITES.inc(result='stored' if created else 'deduplicated')
+        return {'blob_id': blob_id, 'size': size, 'created': created}
+
+    def size(self, blob_id: str) -> Optional[int]:
+        if not is_blob_id(blob_id):
+            return None
+        doc = self.files.find_one({'filename': blob_id}, {'length': 1})
+        return doc['length'] if doc else None
+
+    def iter_range(self, blob_id: str, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        grid_out = self.bucket.open_download_stream_by_name(blob_id)
+        try:
+            grid_out.seek(start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                chunk = grid_out.read(CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    return
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+        finally:
+            grid_out.close()
+
+
+def create_blob_store(db=None) -> Optional[BlobStore]:
+    """Build the store selected by RESUME_BLOB_STORE (local | gridfs | none)"""
+    backend = os.getenv("RESUME_BLOB_STORE", "local").lower()
+    if backend == "none":
+        return None
+    if backend == "gridfs":
+        if db is None:
+            raise ValueError("RESUME_BLOB_STORE=gridfs requires a database handle")
+        logger.info("Using GridFS resume blob store")
+        return GridFSBlobStore(db)
+    root = os.getenv("RESUME_BLOB_DIR", "uploads")
+    logger.info("Using local resume blob store at %s", root)
+    return LocalBlobStore(root)
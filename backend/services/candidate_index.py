@@ -0,0 +1,206 @@
+"""
+Candidate Index Service
+Inverted index from canonical skill to the stored resumes listing it, for recruiter
+searches like "must have Python and AWS, nice to have Kubernetes, 3+ years"
+"""
+import heapq
+import math
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Set
+import logging
+
+from pymongo import ASCENDING
+from pymongo.collection import Collection
+
+from services.metrics import REGISTRY, stage_timer
+
+logger = logging.getLogger(__name__)
+
+# Sync re-reads this far back so writes with slightly skewed clocks are not missed
+SYNC_OVERLAP = timedelta(seconds=5)
+
+_EMPTY: Set[int] = frozenset()
+
+# Search queries bring arbitrary skill strings, so the raw -> canonical memo is capped
+MAX_CANONICAL_NAMES = 100000
+
+
+class CandidateIndex:
+    def __init__(self, collection: Collection, matcher):
+        """`collection` holds one document per parsed resume, keyed by its content hash"""
+        self.collection = collection
+        self.matcher = matcher
+        self.synced_at: Optional[datetime] = None
+        self._lock = threading.RLock()
+        # Resumes are numbered densely so posting lists are sets of small ints
+        self._ids: List[str] = []
+        self._numbers: Dict[str, int] = {}
+        self._skills: List[frozenset] = []
+        self._experience: List[int] = []
+        self._postings: Dict[str, Set[int]] = {}
+        self._canonical_names: Dict[str, str] = {}  # raw skill -> canonical
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+        self.collection.create_index([('updated_at', ASCENDING)])
+        REGISTRY.gauge('candidate_index_size', 'Resumes in the candidate skill index') \
+            .set_function(lambda: len(self._ids))
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _canonical(self, skills: Sequence[str]) -> frozenset:
+        names = self._canonical_names
+        canonical = set()
+        for skill in skills:
+            name = names.get(skill)
+            if name is None:
+                if len(names) >= MAX_CANONICAL_NAMES:
+                    names.clear()
+                name = names[skill] = self.matcher.canonical_skill(skill)
+            if name:
+                canonical.add(name)
+        return frozenset(canonical)
+
+    def _index(self, resume_id: str, skills: Sequence[str], experience_years: int) -> None:
+        canonical = self._canonical(skills)
+        with self._lock:
+            number = self._numbers.get(resume_id)
+            if number is None:
+                number = len(self._ids)
+                self._ids.append(resume_id)
+                self._numbers[resume_id] = number
+                self._skills.append(frozenset())
+                self._experience.append(0)
+            previous = self._skills[number]
+            for skill in previous - canonical:
+                posting = self._postings[skill]
+                posting.discard(number)
+                if not posting:
+                    del self._postings[skill]
+            for skill in canonical - previous:
+                self._postings.setdefault(skill, set()).add(number)
+            self._skills[number] = canonical
+            self._experience[number] = int(experience_years or 0)
+
+    # ------------------------------------------------------------ updates
+    def add_resume(self, resume_id: str, filename: str, skills: List[str], experience_years: int = 0,
+                   email: Optional[str] = None, user_id: Optional[str] = None,
+                   blob_id: Optional[str] = None, extra: Optional[Dict] = None) -> None:
+        """Store a parsed resume (re-parses replace it) and index it immediately; `extra` adds fields"""
+        now = datetime.utcnow()
+        fields = {
+            'filename': filename,
+            'skills': skills,
+            'experience_years': int(experience_years or 0),
+            'email': email,
+            'blob_id': blob_id,
+            'updated_at': now,
+        }
+        if user_id:
+            fields['user_id'] = user_id
+        fields.update(extra or {})
+        self.collection.update_one({'_id': resume_id},
+                                   {'$set': fields, '$setOnInsert': {'created_at': now}}, upsert=True)
+        self._index(resume_id, skills, experience_years)
+
+    def sync(self) -> int:
+        """Index resumes stored or re-parsed (here or by other workers) since the last sync"""
+        query = {}
+        if self.synced_at is not None:
+            query['updated_at'] = {'$gt': self.synced_at - SYNC_OVERLAP}
+        changed = 0
+        with stage_timer('candidate_index', 'sync'):
+            cursor = self.collection.find(query, {'skills': 1, 'experience_years': 1, 'updated_at': 1}) \
+                .sort('updated_at', ASCENDING)
+            for doc in cursor:
+                self._index(str(doc['_id']), doc.get('skills') or [], doc.get('experience_years') or 0)
+                changed += 1
+                if self.synced_at is None or doc['updated_at'] > self.synced_at:
+                    self.synced_at = doc['updated_at']
+        return changed
+
+    def load(self) -> None:
+        count = self.sync()
+        logger.info("Candidate index built: %d resumes, %d skills", count, len(self._postings))
+
+    def start(self, interval: float = 5.0) -> None:
+        """Background sync so each worker sees resumes parsed by the others"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        def run():
+            while not self._stopping.wait(interval):
+                try:
+                    self.sync()
+                except Exception as e:
+                    logger.error("Candidate index sync failed: %s", e, exc_info=True)
+
+        self._stopping.clear()
+        self._thread = threading.Thread(target=run, name='candidate-index-sync', daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(5.0)
+            self._thread = None
+
+    # ------------------------------------------------------------ search
+    def search(self, required: Sequence[str] = (), optional: Sequence[str] = (),
+               min_experience: Optional[int] = None, max_experience: Optional[int] = None,
+               page: int = 1, page_size: int = 20) -> Dict:
+        """
+        Resumes having every `required` skill (or, with none required, any `optional`
+        one) within the experience range, ranked by IDF-weighted coverage of the
+        optional skills, then experience. `page` is 1-based.
+        """
+        required_keys = list(self._canonical(required))
+        # Query spelling of each optional skill, so results echo what was asked for
+        optional_keys = {}
+        for skill in optional:
+            if skill and skill.strip():
+                optional_keys.setdefault(self.matcher.canonical_skill(skill), skill.strip())
+        for key in required_keys:
+            optional_keys.pop(key, None)
+
+        with self._lock, stage_timer('candidate_index', 'search'):
+            # Intersect smallest posting list first; any unknown required skill means no match
+            if required_keys:
+                postings = sorted((self._postings.get(key, _EMPTY) for key in required_keys), key=len)
+                candidates = set(postings[0]).intersection(*postings[1:])
+            else:
+                candidates = set().union(*(self._postings.get(key, _EMPTY) for key in optional_keys))
+
+            if min_experience is not None or max_experience is not None:
+                low = min_experience if min_experience is not None else -math.inf
+                high = max_experience if max_experience is not None else math.inf
+                experience = self._experience
+                candidates = {n for n in candidates if low <= experience[n] <= high}
+
+            # Rarer optional skills count for more
+            total = len(self._ids)
+            weights = {key: math.log(1 + total / (1 + len(self._postings.get(key, _EMPTY))))
+                       for key in optional_keys}
+            weight_sum = sum(weights.values())
+            scores = dict.fromkeys(candidates, 0.0)
+            for key, weight in weights.items():
+                for number in candidates.intersection(self._postings.get(key, _EMPTY)):
+                    scores[number] += weight
+
+            start = (page - 1) * page_size
+            experience = self._experience
+            ranked = heapq.nlargest(start + page_size, scores,
+                                    key=lambda n: (scores[n], experience[n], n))[start:]
+            results = []
+            for number in ranked:
+                skills = self._skills[number]
+                results.append({
+                    'resume_id': self._ids[number],
+                    'score': round(100.0 * scores[number] / weight_sum, 1) if weight_sum else 100.0,
+                    'experience_years': experience[number],
+                    'matched_optional': [name for key, name in optional_keys.items() if key in skills],
+                    'missing_optional': [name for key, name in optional_keys.items() if key not in skills],
+                })
+        return {'total': len(candidates), 'page': page, 'page_size': page_size, 'results': results}
@@ -0,0 +1,53 @@
+"""
+CPU Executor Service
+Runs blocking parse/match work off the event loop and tracks queue depth
+"""
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class InstrumentedExecutor:
+    def __init__(self, name: str, max_workers: int):
+        """Thread pool that counts queued (waiting) and active (running) tasks"""
+        self.name = name
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.active = 0
+
+    def _call(self, fn: Callable, ctx: contextvars.Context) -> Any:
+        with self._lock:
+            self.queued -= 1
+            self.active += 1
+        try:
+            # Run inside the caller's context so per-request contextvars stay visible
+            return ctx.run(fn)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    async def run(self, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Await `fn(*args, **kwargs)` on the pool"""
+        with self._lock:
+            self.queued += 1
+        call = functools.partial(fn, *args, **kwargs)
+        future = self._pool.submit(self._call, call, contextvars.copy_context())
+        future.add_done_callback(self._done)
+        return await asyncio.wrap_future(future)
+
+    def _done(self, future: Future) -> None:
+        # Only a future that never started can be cancelled; _call did not run to dequeue it
+        if future.cancelled():
+            with self._lock:
+                self.queued -= 1
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
@@ -0,0 +1,213 @@
+"""
+Job Search Index Service
+Stored job descriptions with one pooled skill embedding each, kept in a
+VectorIndex that every worker syncs from MongoDB and snapshots to disk
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import logging
+
+import numpy as np
+from bson import Binary, ObjectId
+from bson.errors import InvalidId
+from pymongo import ASCENDING
+from pymongo.collection import Collection
+
+from services.metrics import REGISTRY, stage_timer
+from services.vector_index import VectorIndex
+
+logger = logging.getLogger(__name__)
+
+# Sync re-reads this far back so writes with slightly skewed clocks are not missed
+SYNC_OVERLAP = timedelta(seconds=5)
+
+
+def _to_binary(vector: np.ndarray) -> Binary:
+    return Binary(np.asarray(vector, dtype=np.float32).tobytes())
+
+
+def _from_binary(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype=np.float32)
+
+
+class JobIndex:
+    def __init__(self, collection: Collection, matcher, snapshot_path: Optional[str] = None,
+                 ivf_threshold: int = 20000, nprobe: int = 16):
+        """`collection` holds the job descriptions; deletes are soft so other workers see them"""
+        self.collection = collection
+        self.matcher = matcher
+        self.snapshot_path = snapshot_path
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        self.index: Optional[VectorIndex] = None
+        self.synced_at: Optional[datetime] = None
+        self._dirty = False
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+        self.collection.create_index([('updated_at', ASCENDING)])
+        REGISTRY.gauge('job_index_size', 'Job descriptions in the vector index') \
+            .set_function(lambda: len(self.index) if self.index is not None else 0)
+
+    @property
+    def available(self) -> bool:
+        return self.matcher.model is not None
+
+    def _new_index(self) -> VectorIndex:
+        dim = self.matcher.model.get_sentence_embedding_dimension()
+        return VectorIndex(dim, ivf_threshold=self.ivf_threshold, nprobe=self.nprobe)
+
+    # ------------------------------------------------------------ lifecycle
+    def load(self) -> None:
+        """Restore the disk snapshot if it matches the model, then catch up from MongoDB"""
+        if not self.available:
+            logger.info("Job search disabled: no embedding model")
+            return
+        self.index = self._new_index()
+        if self.snapshot_path:
+            try:
+                index, meta = VectorIndex.load(self.snapshot_path, self.index.dim,
+                                               ivf_threshold=self.ivf_threshold, nprobe=self.nprobe)
+                if meta.get('model') == self.matcher.model_name:
+                    self.index, self.synced_at = index, meta.get('synced_at')
+                    logger.info("Loaded job index snapshot: %d jobs", len(index))
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning("Ignoring unreadable job index snapshot: %s", e)
+        self.sync()
+
+    def sync(self) -> int:
+        """Apply job descriptions added, changed or deleted since the last sync"""
+        if self.index is None:
+            return 0
+        query = {'model': self.matcher.model_name}
+        if self.synced_at is not None:
+            query['updated_at'] = {'$gt': self.synced_at - SYNC_OVERLAP}
+        changed = 0
+        ids, vectors = [], []
+        with stage_timer('job_index', 'sync'):
+            for doc in self.collection.find(query, {'embedding': 1, 'deleted': 1, 'updated_at': 1}) \
+                    .sort('updated_at', ASCENDING):
+                job_id = str(doc['_id'])
+                if doc.get('deleted') or not doc.get('embedding'):
+                    changed += self.index.delete(job_id)
+                elif job_id not in self.index:  # embeddings never change once stored
+                    ids.append(job_id)
+                    vectors.append(_from_binary(doc['embedding']))
+                if self.synced_at is None or doc['updated_at'] > self.synced_at:
+                    self.synced_at = doc['updated_at']
+            if ids:
+                self.index.add_many(ids, np.stack(vectors))
+                changed += len(ids)
+        if changed:
+            self._dirty = True
+        return changed
+
+    def save(self) -> None:
+        if self.index is not None and self.snapshot_path and self._dirty:
+            self.index.save(self.snapshot_path, model=self.matcher.model_name, synced_at=self.synced_at)
+            self._dirty = False
+
+    def start(self, interval: float = 5.0, save_interval: float = 300.0) -> None:
+        """Background sync (other workers' writes) and periodic snapshots"""
+        if self.index is None or (self._thread is not None and self._thread.is_alive()):
+            return
+
+        def run():
+            last_save = time.monotonic()
+            while not self._stopping.wait(interval):
+                try:
+                    self.sync()
+                    if time.monotonic() - last_save >= save_interval:
+                        self.save()
+                        last_save = time.monotonic()
+                except Exception as e:
+                    logger.error("Job index sync failed: %s", e, exc_info=True)
+
+        self._stopping.clear()
+        self._thread = threading.Thread(target=run, name='job-index-sync', daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(5.0)
+            self._thread = None
+        self.save()
+
+    # ------------------------------------------------------------ jobs
+    def add_job(self, text: str, skills: List[str], title: Optional[str] = None,
+                company: Optional[str] = None, extra: Optional[Dict] = None) -> Dict:
+        """Store a parsed job description and index its pooled skill embedding; `extra` adds fields"""
+        vector = self.matcher.pooled_embedding(skills) if self.available else None
+        now = datetime.utcnow()
+        doc = {
+            'title': title,
+            'company': company,
+            'text': text,
+            'skills': skills,
+            'embedding': _to_binary(vector) if vector is not None else None,
+            'model': self.matcher.model_name if vector is not None else None,
+            'deleted': False,
+            'created_at': now,
+            'updated_at': now,
+            **(extra or {}),
+        }
+        doc['_id'] = self.collection.insert_one(doc).inserted_id
+        if vector is not None and self.index is not None:
+            self.index.add(str(doc['_id']), vector)
+            self._dirty = True
+        return doc
+
+    def delete_job(self, job_id: str) -> bool:
+        try:
+            oid = ObjectId(job_id)
+        except InvalidId:
+            return False
+        result = self.collection.update_one(
+            {'_id': oid, 'deleted': {'$ne': True}},
+            {'$set': {'deleted': True, 'updated_at': datetime.utcnow()}, '$unset': {'embedding': ''}},
+        )
+        if self.index is not None:
+            self._dirty |= self.index.delete(job_id)
+        return bool(result.modified_count)
+
+    def search(self, resume_skills: List[str], k: int = 10, nprobe: Optional[int] = None) -> List[Dict]:
+        """Top-k stored jobs by pooled-embedding similarity, with their exact skill match"""
+        if self.index is None:
+            raise RuntimeError('Job search needs the sentence-transformer model')
+        with stage_timer('job_index', 'embed', 'semantic'):
+            embeddings = self.matcher.embed_skills(resume_skills)
+        if not embeddings:
+            return []
+        query = np.mean(list(embeddings.values()), axis=0)
+        with stage_timer('job_index', 'search'):
+            hits = self.index.search(query, k, nprobe)
+        if not hits:
+            return []
+        docs = {str(d['_id']): d for d in self.collection.find(
+            {'_id': {'$in': [ObjectId(job_id) for job_id, _ in hits]}, 'deleted': {'$ne': True}},
+            {'title': 1, 'company': 1, 'skills': 1})}
+        results = []
+        with stage_timer('job_index', 'match', 'match'):
+            for job_id, similarity in hits:
+                doc = docs.get(job_id)
+                if doc is None:
+                    continue
+                job_skills = doc.get('skills') or []
+                match = self.matcher.match(resume_skills, job_skills,
+                                           embeddings=self.matcher.embeddings_with(embeddings, job_skills))
+                results.append({
+                    'job_id': job_id,
+                    'title': doc.get('title'),
+                    'company': doc.get('company'),
+                    'similarity': round(similarity, 4),
+                    'overall_match': match['overall_match'],
+                    'semantic_similarity': match.get('semantic_similarity', 0.0),
+                    'matched_skills': match['matched_skills'],
+                    'missing_skills': match['missing_skills'],
+                })
+        return results
@@ -4,19 +4,18 @@ NLP-powered extraction of skills and requirements from job descriptions
 """
 import re
 from typing import Dict, List
-import spacy
 import logging
 
+from services.metrics import stage_timer
+from services.nlp_models import load_spacy_model
+from services.response_cache import fingerprint
+
 logger = logging.getLogger(__name__)
 
 class JobDescriptionParser:
     def __init__(self):
         """Initialize the job description parser"""
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except OSError:
-            logger.warning("SpaCy model not found. Install with: python -m spacy download en_core_web_sm")
-            self.nlp = None
+        self.nlp = load_spacy_model("en_core_web_sm")  # shared with ResumeParser
 
         # Enhanced skill patterns
         self.skill_patterns = {
@@ -75,6 +74,11 @@ class JobDescriptionParser:
             'desirable', 'ideal', 'would be great'
         ]
 
+    @property
+    def version(self) -> str:
+        """Fingerprint of the skill lists, so stored skills from another version are not reused"""
+        return fingerprint(self.skill_patterns)
+
     def extract_sections(self, text: str) -> Dict[str, str]:
         """Extract different sections from job description"""
         if not text:
@@ -220,16 +224,20 @@ class JobDescriptionParser:
                     }
                 }
             # Extract sections
-            sections = self.extract_sections(text)
+            with stage_timer('job_parser', 'sections', 'parse'):
+                sections = self.extract_sections(text)
 
             # Extract all skills
-            all_skills = self.extract_skills_from_text(text)
+            with stage_timer('job_parser', 'skills', 'parse'):
+                all_skills = self.extract_skills_from_text(text)
 
             # Categorize requirements
-            requirements = self.categorize_requirements(text)
+            with stage_timer('job_parser', 'requirements', 'parse'):
+                requirements = self.categorize_requirements(text)
 
             # Extract experience requirements
-            experience_info = self.extract_experience_level(text)
+            with stage_timer('job_parser', 'experience', 'parse'):
+                experience_info = self.extract_experience_level(text)
 
             # Additional metadata
             metadata = {
@@ -0,0 +1,484 @@
+"""
+Learning Catalog Service
+Loads the learning-resource catalog from a JSON/YAML file or a MongoDB document,
+validates it and swaps in an immutable, indexed snapshot whenever the source changes
+"""
+import heapq
+import json
+import os
+import re
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+
+from pymongo.collection import Collection
+
+from services.metrics import REGISTRY, stage_timer
+from services.response_cache import fingerprint
+
+try:
+    import yaml
+    YAML_AVAILABLE = True
+except ImportError:
+    YAML_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATALOG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                    'data', 'learning_resources.json')
+PRIORITIES = ('High', 'Medium', 'Low')
+DIFFICULTY_LEVELS = {'beginner': 1, 'intermediate': 2, 'advanced': 3, 'expert': 4}
+_URL_RE = re.compile(r'^https?://\S+$')
+_DIFFICULTY_RE = re.compile('|'.join(DIFFICULTY_LEVELS))
+_DURATION_RE = re.compile(r'(\d+(?:\.\d+)?)(?:\s*(?:-|–|to)\s*(\d+(?:\.\d+)?))?\s*(day|week|month)s?')
+_WEEKS_PER_UNIT = {'day': 1 / 7, 'week': 1.0, 'month': 52 / 12}
+
+# Shortest query matched as the start of a catalog word ("kub" -> kubernetes)
+_MIN_PREFIX = 3
+_SEPARATORS = ' /'
+_WORD_START_RE = re.compile(r'(?<![^ /])[^ /]')
+# Trie nodes map characters to child nodes; these int keys never collide with them
+_PREFIX_BEST = 0  # earliest catalog entry with a word passing through this node
+_NAME_END = 1     # earliest catalog entry whose full name or alias ends here
+
+CATALOG_RELOADS = REGISTRY.counter(
+    'learning_catalog_reloads_total', 'Learning catalog reload attempts by outcome', ('result',))
+
+
+class CatalogError(ValueError):
+    """The catalog source is unreadable or fails validation"""
+
+
+def normalize_skill(skill: str) -> str:
+    return skill.lower().replace('.', '').replace('-', ' ').strip()
+
+
+def _word_starts(name: str) -> List[int]:
+    return [m.start() for m in _WORD_START_RE.finditer(name)]
+
+
+def difficulty_range(difficulty: str) -> Tuple[int, int]:
+    """(lowest, highest) level named in strings like "Beginner to Advanced"; "Varies" is intermediate"""
+    levels = [DIFFICULTY_LEVELS[m] for m in _DIFFICULTY_RE.findall((difficulty or '').lower())]
+    return (min(levels), max(levels)) if levels else (2, 2)
+
+
+def duration_weeks(estimate: str) -> Optional[Tuple[float, float]]:
+    """(low, high) weeks for strings like "2-4 weeks", "3 months" or "10 days"; None if unparseable"""
+    m = _DURATION_RE.search((estimate or '').lower())
+    if m is None:
+        return None
+    scale = _WEEKS_PER_UNIT[m.group(3)]
+    low = float(m.group(1))
+    high = float(m.group(2)) if m.group(2) else low
+    return round(low * scale, 1), round(high * scale, 1)
+
+
+class FrozenDict(dict):
+    """Read-only dict for memoized payloads shared across requests and threads"""
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(f"{type(self).__name__} is read-only")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+def freeze(value: Any) -> Any:
+    """Deep copy of JSON-like data as FrozenDicts and tuples"""
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+# ------------------------------------------------------------ validation
+def _check_text(errors: List[str], where: str, value: Any, field: str) -> None:
+    if not isinstance(value, str) or not value.strip():
+        errors.append(f"{where}: '{field}' must be a non-empty string")
+
+
+def validate_catalog(data: Any) -> Tuple[Dict[str, Dict], List[Dict]]:
+    """
+    Check a raw catalog and return (learning_resources, generic_platforms) with skill keys
+    lowercased. `learning_resources` may be a mapping of skill -> entry or a list of entries
+    carrying a 'skill' field (the form stored in MongoDB, where keys cannot contain dots).
+    """
+    if not isinstance(data, dict):
+        raise CatalogError("catalog must be an object with 'learning_resources' and 'generic_platforms'")
+    raw = data.get('learning_resources')
+    if isinstance(raw, list):
+        raw = {entry.get('skill'): {k: v for k, v in entry.items() if k != 'skill'}
+               for entry in raw if isinstance(entry, dict)}
+    if not isinstance(raw, dict) or not raw:
+        raise CatalogError("'learning_resources' must be a non-empty object or list")
+
+    errors: List[str] = []
+    resources: Dict[str, Dict] = {}
+    owners: Dict[str, str] = {}  # normalized name or alias -> skill, to catch collisions
+    for skill, entry in raw.items():
+        where = f"learning_resources[{skill!r}]"
+        if not isinstance(skill, str) or not skill.strip():
+            errors.append(f"{where}: skill name must be a non-empty string")
+            continue
+        if not isinstance(entry, dict):
+            errors.append(f"{where}: entry must be an object")
+            continue
+        if entry.get('priority') not in PRIORITIES:
+            errors.append(f"{where}: 'priority' must be one of {', '.join(PRIORITIES)}")
+        for field in ('category', 'difficulty', 'time_estimate'):
+            _check_text(errors, where, entry.get(field), field)
+        aliases = entry.get('aliases', [])
+        if not isinstance(aliases, list) or not all(isinstance(a, str) and a.strip() for a in aliases):
+            errors.append(f"{where}: 'aliases' must be a list of non-empty strings")
+            aliases = []
+        key = skill.strip().lower()
+        for name in (key, *aliases):
+            owner = owners.setdefault(normalize_skill(name), key)
+            if owner != key:
+                errors.append(f"{where}: name {name!r} is already used by {owner!r}")
+        if isinstance(entry.get('time_estimate'), str) and duration_weeks(entry['time_estimate']) is None:
+            errors.append(f"{where}: 'time_estimate' must look like '2-4 weeks'")
+        prerequisites = entry.get('prerequisites', [])
+        if not isinstance(prerequisites, list) or not all(isinstance(p, str) and p.strip() for p in prerequisites):
+            errors.append(f"{where}: 'prerequisites' must be a list of skill names")
+        links = entry.get('resources')
+        if not isinstance(links, list) or not links:
+            errors.append(f"{where}: 'resources' must be a non-empty list")
+            links = []
+        for i, link in enumerate(links):
+            link_where = f"{where}.resources[{i}]"
+            if not isinstance(link, dict):
+                errors.append(f"{link_where}: must be an object")
+                continue
+            _check_text(errors, link_where, link.get('name'), 'name')
+            _check_text(errors, link_where, link.get('type'), 'type')
+            if not isinstance(link.get('url'), str) or not _URL_RE.match(link['url']):
+                errors.append(f"{link_where}: 'url' must be an http(s) URL")
+            if not isinstance(link.get('free'), bool):
+                errors.append(f"{link_where}: 'free' must be true or false")
+        resources[key] = entry
+
+    # Prerequisites may name a skill or one of its aliases; stored resolved to catalog keys
+    for key, entry in resources.items():
+        resolved = []
+        for name in entry.get('prerequisites', []) if isinstance(entry.get('prerequisites'), list) else []:
+            target = owners.get(normalize_skill(name)) if isinstance(name, str) else None
+            if target is None:
+                errors.append(f"learning_resources[{key!r}]: unknown prerequisite {name!r}")
+            elif target == key:
+                errors.append(f"learning_resources[{key!r}]: lists itself as a prerequisite")
+            elif target not in resolved:
+                resolved.append(target)
+        if 'prerequisites' in entry:
+            resources[key] = {**entry, 'prerequisites': resolved}
+    if not errors:
+        cycle = _find_cycle({key: entry.get('prerequisites', []) for key, entry in resources.items()})
+        if cycle:
+            errors.append(f"prerequisite cycle: {' -> '.join(cycle)}")
+
+    platforms = data.get('generic_platforms', [])
+    if not isinstance(platforms, list):
+        errors.append("'generic_platforms' must be a list")
+        platforms = []
+    for i, platform in enumerate(platforms):
+        where = f"generic_platforms[{i}]"
+        if not isinstance(platform, dict):
+            errors.append(f"{where}: must be an object")
+            continue
+        for field in ('name', 'type', 'url'):
+            _check_text(errors, where, platform.get(field), field)
+
+    if errors:
+        shown = '; '.join(errors[:10])
+        more = f" (+{len(errors) - 10} more)" if len(errors) > 10 else ''
+        raise CatalogError(f"invalid learning catalog: {shown}{more}")
+    return resources, platforms
+
+
+def _find_cycle(graph: Dict[str, List[str]]) -> Optional[List[str]]:
+    """One cycle in a skill -> prerequisites graph, as a path of skills, or None"""
+    state: Dict[str, int] = {}  # 1 = on the current path, 2 = finished
+    for root in graph:
+        if state.get(root):
+            continue
+        path, stack = [root], [iter(graph[root])]
+        state[root] = 1
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                state[path.pop()] = 2
+                stack.pop()
+            elif state.get(child) == 1:
+                return path[path.index(child):] + [child]
+            elif not state.get(child):
+                state[child] = 1
+                path.append(child)
+                stack.append(iter(graph.get(child, ())))
+    return None
+
+
+# ------------------------------------------------------------ snapshot
+class CatalogSnapshot:
+    def __init__(self, learning_resources: Dict[str, Dict], generic_platforms: List[Dict],
+                 known_skills: Iterable[str] = ()):
+        """
+        Validated catalog content, frozen, with a name/alias map and a word-suffix trie.
+        `version` changes whenever the content does, so caches can key on it.
+        `known_skills` (the parsers' vocabulary) are never prefix-matched: "java" is
+        a skill of its own, not the start of "javascript".
+        """
+        self.version = fingerprint(learning_resources, generic_platforms)
+        self.learning_resources = freeze(learning_resources)
+        self.generic_platforms = freeze(generic_platforms)
+        self._keys = list(self.learning_resources)
+        self._names: Dict[str, str] = {}
+        self._known = frozenset(normalize_skill(skill) for skill in known_skills)
+        self._trie: Dict = {}
+        for order, (key, entry) in enumerate(self.learning_resources.items()):
+            for name in (key, *entry.get('aliases', ())):
+                name = normalize_skill(name)
+                self._names.setdefault(name, key)
+                for start in _word_starts(name):
+                    node = self._trie
+                    for ch in name[start:]:
+                        node = node.setdefault(ch, {})
+                        # Entries are inserted in catalog order, so the first one seen is the earliest
+                        node.setdefault(_PREFIX_BEST, order)
+                    if start == 0:
+                        node.setdefault(_NAME_END, order)
+        self._build_graph()
+        # Memoized payloads built from this snapshot; they are dropped along with it
+        self.recommendations: Dict[str, FrozenDict] = {}
+        self.tips: Dict[Tuple[str, str], Tuple[str, ...]] = {}
+        self.plans: Dict[Tuple[str, ...], FrozenDict] = {}
+
+    def _build_graph(self) -> None:
+        """
+        Transitive prerequisites of every skill, and one global topological order that takes
+        higher priority, then easier, skills first whenever the prerequisites allow. Any
+        subset sorted by `rank` is therefore a valid learning order.
+        """
+        entries = self.learning_resources
+        self.difficulty = {key: difficulty_range(entry['difficulty']) for key, entry in entries.items()}
+        self.weeks = {key: duration_weeks(entry['time_estimate']) for key, entry in entries.items()}
+        prerequisites = {key: entry.get('prerequisites', ()) for key, entry in entries.items()}
+        dependents: Dict[str, List[str]] = {key: [] for key in entries}
+        waiting = {key: len(required) for key, required in prerequisites.items()}
+        for key, required in prerequisites.items():
+            for prerequisite in required:
+                dependents[prerequisite].append(key)
+
+        position = {key: i for i, key in enumerate(self._keys)}
+
+        def order_key(key: str) -> Tuple:
+            return (PRIORITIES.index(entries[key]['priority']), self.difficulty[key][0], position[key], key)
+
+        ready = [order_key(key) for key, count in waiting.items() if not count]
+        heapq.heapify(ready)
+        self.rank: Dict[str, int] = {}
+        self.ancestors: Dict[str, frozenset] = {}
+        while ready:
+            key = heapq.heappop(ready)[-1]
+            self.rank[key] = len(self.rank)
+            # Every prerequisite is ranked (and closed) before its dependents
+            self.ancestors[key] = frozenset().union(
+                *(self.ancestors[p] | {p} for p in prerequisites[key]))
+            for dependent in dependents[key]:
+                waiting[dependent] -= 1
+                if not waiting[dependent]:
+                    heapq.heappush(ready, order_key(dependent))
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def match(self, skill: str) -> Optional[str]:
+        """Catalog key for `skill`: exact name or alias first, then the trie"""
+        name = normalize_skill(skill)
+        key = self._names.get(name)
+        return key if key is not None else self._search(name, prefix=name not in self._known)
+
+    def _search(self, name: str, prefix: bool = True) -> Optional[str]:
+        """
+        Earliest catalog entry that `name` starts a word of ("postgres", "kube"), or whose
+        name or alias appears as whole words in `name` ("react native", "aws lambda")
+        """
+        best = None
+        if prefix and len(name) >= _MIN_PREFIX:
+            node = self._trie
+            for ch in name:
+                node = node.get(ch)
+                if node is None:
+                    break
+            else:
+                best = node[_PREFIX_BEST]
+        for start in _word_starts(name):
+            node = self._trie
+            for i in range(start, len(name)):
+                node = node.get(name[i])
+                if node is None:
+                    break
+                order = node.get(_NAME_END)
+                if order is not None and (best is None or order < best) \
+                        and (i + 1 == len(name) or name[i + 1] in _SEPARATORS):
+                    best = order
+        return None if best is None else self._keys[best]
+
+
+# ------------------------------------------------------------ sources
+class FileCatalogSource:
+    """JSON, or YAML when PyYAML is installed, chosen by file extension"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __repr__(self) -> str:
+        return f"file {self.path}"
+
+    def stamp(self) -> Any:
+        """Cheap change marker, polled between reloads"""
+        st = os.stat(self.path)
+        return st.st_mtime_ns, st.st_size
+
+    def load(self) -> Any:
+        with open(self.path, 'r', encoding='utf-8') as f:
+            if self.path.endswith(('.yaml', '.yml')):
+                if not YAML_AVAILABLE:
+                    raise CatalogError(f"{self.path} is YAML but PyYAML is not installed")
+                return yaml.safe_load(f)
+            return json.load(f)
+
+
+class MongoCatalogSource:
+    """One document in `collection` holding the whole catalog, with an updated_at stamp"""
+
+    def __init__(self, collection: Collection, document_id: str = 'learning_resources'):
+        self.collection = collection
+        self.document_id = document_id
+
+    def __repr__(self) -> str:
+        return f"mongo {self.collection.name}/{self.document_id}"
+
+    def stamp(self) -> Any:
+        doc = self.collection.find_one({'_id': self.document_id}, {'updated_at': 1})
+        return doc and doc.get('updated_at')
+
+    def load(self) -> Any:
+        doc = self.collection.find_one({'_id': self.document_id})
+        if doc is None:
+            raise CatalogError(f"no catalog document {self.document_id!r} in {self.collection.name}")
+        return doc
+
+    def save(self, data: Dict) -> None:
+        """Validate and store a catalog; every worker picks it up on its next poll"""
+        resources, platforms = validate_catalog(data)
+        self.collection.replace_one({'_id': self.document_id}, {
+            'learning_resources': [{'skill': skill, **entry} for skill, entry in resources.items()],
+            'generic_platforms': platforms,
+            'updated_at': datetime.utcnow(),
+        }, upsert=True)
+
+
+def create_catalog_source(db=None):
+    """Build the source selected by LEARNING_CATALOG_SOURCE (file | mongo)"""
+    backend = os.getenv('LEARNING_CATALOG_SOURCE', 'file').lower()
+    if backend == 'mongo':
+        if db is None:
+            raise ValueError("LEARNING_CATALOG_SOURCE=mongo requires a database handle")
+        return MongoCatalogSource(db['learning_catalog'])
+    return FileCatalogSource(os.getenv('LEARNING_CATALOG_PATH', DEFAULT_CATALOG_PATH))
+
+
+# ------------------------------------------------------------ catalog
+class LearningCatalog:
+    def __init__(self, source, known_skills: Iterable[str] = ()):
+        """
+        Loads `source` now (an invalid catalog raises). Later reloads build the new snapshot
+        off to the side and swap one reference, so readers never wait or see a partial catalog;
+        a failed reload keeps the current snapshot.
+        """
+        self.source = source
+        self.known_skills = tuple(known_skills)
+        self._reload_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._stamp = source.stamp()
+        self.snapshot = self._build(source)
+        REGISTRY.gauge('learning_catalog_entries', 'Skills in the learning catalog') \
+            .set_function(lambda: len(self.snapshot))
+
+    @property
+    def version(self) -> str:
+        return self.snapshot.version
+
+    def _build(self, source) -> CatalogSnapshot:
+        with stage_timer('learning_catalog', 'load'):
+            resources, platforms = validate_catalog(source.load())
+            return CatalogSnapshot(resources, platforms, self.known_skills)
+
+    def reload(self, force: bool = False) -> bool:
+        """Swap in the source's current content if it changed; True when a new version went live"""
+        with self._reload_lock:
+            source = self.source
+            stamp = self._stamp
+            try:
+                stamp = source.stamp()
+                if stamp == self._stamp and not force:
+                    return False
+                snapshot = self._build(source)
+            except CatalogError as e:
+                # Not retried until the source changes again
+                self._stamp = stamp
+                CATALOG_RELOADS.inc(result='invalid')
+                logger.error("Learning catalog from %s rejected, keeping %s: %s", source, self.version, e)
+                return False
+            except Exception as e:
+                CATALOG_RELOADS.inc(result='error')
+                logger.error("Learning catalog reload from %s failed: %s", source, e, exc_info=True)
+                return False
+            self._stamp = stamp
+            if snapshot.version == self.snapshot.version:
+                CATALOG_RELOADS.inc(result='unchanged')
+                return False
+            self.snapshot = snapshot
+            CATALOG_RELOADS.inc(result='swapped')
+            logger.info("Learning catalog %s loaded from %s (%d skills)", snapshot.version, source, len(snapshot))
+            return True
+
+    def set_source(self, source) -> bool:
+        """Switch to another source and load it"""
+        with self._reload_lock:
+            self.source = source
+            self._stamp = None
+        return self.reload(force=True)
+
+    def start(self, interval: float = 30.0) -> None:
+        """Poll the source's change stamp in the background"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        def run():
+            while not self._stopping.wait(interval):
+                self.reload()
+
+        self._stopping.clear()
+        self._thread = threading.Thread(target=run, name='learning-catalog-poll', daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(5.0)
+            self._thread = None
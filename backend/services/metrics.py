@@ -0,0 +1,224 @@
+"""
+Metrics Service
+Dependency-free Prometheus-style counters, gauges and latency histograms.
+Values are per process; under the pre-fork server each worker reports its own series.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+import logging
+
+from services.request_timing import record_stage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelKey = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelKey:
+        return tuple(str(labels.get(n, '')) for n in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f'{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}' for k, v in items]
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelKey, float] = {}
+        self._functions: Dict[LabelKey, Callable[[], float]] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set_function(self, fn: Callable[[], float], **labels: str) -> None:
+        """Evaluate `fn` at scrape time instead of storing a value"""
+        with self._lock:
+            self._functions[self._key(labels)] = fn
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = dict(self._values)
+            functions = list(self._functions.items())
+        for key, fn in functions:
+            try:
+                items[key] = float(fn())
+            except Exception as e:
+                logger.debug("Gauge callback %s failed: %s", self.name, e)
+        return [f'{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}' for k, v in items.items()]
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        self._series: Dict[LabelKey, List[float]] = {}  # bucket counts..., sum, count
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._series.items()]
+        lines = []
+        for key, series in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, key, le)} {_format_value(cumulative)}')
+            lines.append(f'{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(series[-2])}')
+            lines.append(f'{self.name}_count{_format_labels(self.labelnames, key)} {_format_value(series[-1])}')
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Shared series used across services
+HTTP_REQUESTS = REGISTRY.counter(
+    'http_requests_total', 'HTTP requests by route and status', ('method', 'route', 'status'))
+HTTP_LATENCY = REGISTRY.histogram(
+    'http_request_duration_seconds', 'HTTP request latency by route', ('method', 'route'))
+STAGE_LATENCY = REGISTRY.histogram(
+    'stage_duration_seconds', 'Latency of internal pipeline stages', ('component', 'stage'))
+PDF_EXTRACTOR_SUCCESS = REGISTRY.counter(
+    'pdf_extractor_success_total', 'PDF text extractions by the extractor that succeeded', ('extractor',))
+OCR_PAGES = REGISTRY.counter(
+    'ocr_pages_total', 'Pages run through OCR by engine', ('engine',))
+
+
+@contextmanager
+def stage_timer(component: str, stage: str, phase: Optional[str] = None) -> Iterator[None]:
+    """
+    Time a pipeline stage into stage_duration_seconds{component,stage}; when `phase`
+    is given the duration is also added to the current request's Server-Timing phase
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        STAGE_LATENCY.observe(seconds, component=component, stage=stage)
+        if phase:
+            record_stage(phase, seconds)
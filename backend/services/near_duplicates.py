@@ -0,0 +1,126 @@
+"""
+Near-Duplicate Detection Service
+MinHash signatures over word shingles, with LSH band keys stored on each document
+so a multikey MongoDB index finds near-duplicate resumes and job descriptions
+"""
+import hashlib
+import re
+import zlib
+from typing import Dict, List, Optional, Tuple
+import logging
+
+import numpy as np
+from bson import Binary
+from pymongo import ASCENDING
+from pymongo.collection import Collection
+
+from services.metrics import REGISTRY, stage_timer
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r'[a-z0-9+#]+')
+
+NEAR_DUPLICATES = REGISTRY.counter(
+    'near_duplicate_checks_total', 'Ingested documents checked for near-duplicates', ('kind', 'result'))
+
+
+def lsh_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """(bands, rows) minimizing false positives + false negatives around `threshold`"""
+    points = np.linspace(0.0, 1.0, 201)
+    below = points < threshold
+    best, best_error = (1, num_perm), float('inf')
+    for bands in range(1, num_perm + 1):
+        rows = num_perm // bands
+        # Probability that two documents with Jaccard s share at least one band
+        collide = 1.0 - (1.0 - points ** rows) ** bands
+        error = collide[below].sum() + (1.0 - collide[~below]).sum()
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+class NearDuplicateIndex:
+    def __init__(self, collection: Collection, kind: str, threshold: float = 0.8,
+                 num_perm: int = 128, shingle_size: int = 3, seed: int = 1):
+        """
+        Documents in `collection` carry `minhash` (signature) and `lsh_bands` (band keys);
+        `threshold` is the estimated Jaccard similarity of word shingles that counts as a duplicate
+        """
+        self.collection = collection
+        self.kind = kind
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = lsh_bands(threshold, num_perm)
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hashing: h(x) = (a*x + b mod 2^64) >> 32 with odd a
+        self._a = rng.integers(0, 1 << 63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.integers(0, 1 << 63, num_perm, dtype=np.uint64)
+        self.collection.create_index([('lsh_bands', ASCENDING)])
+
+    def shingles(self, text: str) -> np.ndarray:
+        """
+        crc32 of each distinct run of `shingle_size` normalized words. Runs stay within
+        a line, so reordered bullets or sections leave the shingle set unchanged.
+        """
+        k = self.shingle_size
+        grams = set()
+        for line in text.lower().splitlines():
+            tokens = _TOKEN_RE.findall(line)
+            if len(tokens) <= k:
+                if tokens:
+                    grams.add(' '.join(tokens))
+            else:
+                grams.update(' '.join(tokens[i:i + k]) for i in range(len(tokens) - k + 1))
+        return np.fromiter((zlib.crc32(g.encode('utf-8')) for g in grams), dtype=np.uint64, count=len(grams))
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """MinHash signature (uint32[num_perm]); None for text without words"""
+        with stage_timer('near_duplicates', 'signature'):
+            hashes = self.shingles(text)
+            if not len(hashes):
+                return None
+            permuted = (np.outer(self._a, hashes) + self._b[:, None]) >> np.uint64(32)
+            return permuted.min(axis=1).astype(np.uint32)
+
+    def band_keys(self, signature: np.ndarray) -> List[str]:
+        return [
+            f'{self.rows}.{band}.' + hashlib.blake2b(
+                signature[band * self.rows:(band + 1) * self.rows].tobytes(), digest_size=8).hexdigest()
+            for band in range(self.bands)
+        ]
+
+    def fields(self, signature: Optional[np.ndarray]) -> Dict:
+        """Fields to store on the document so later ingests can find it"""
+        if signature is None:
+            return {}
+        return {'minhash': Binary(signature.tobytes()), 'lsh_bands': self.band_keys(signature)}
+
+    @staticmethod
+    def similarity(a: np.ndarray, b: np.ndarray) -> float:
+        """Estimated Jaccard similarity: fraction of equal signature slots"""
+        if a.shape != b.shape:
+            return 0.0
+        return float(np.mean(a == b))
+
+    def find(self, signature: Optional[np.ndarray], query: Optional[Dict] = None,
+             projection: Optional[Dict] = None, limit: int = 100) -> Optional[Tuple[Dict, float]]:
+        """Most similar stored document at or above the threshold, with its similarity"""
+        if signature is None:
+            return None
+        with stage_timer('near_duplicates', 'lookup'):
+            candidates = self.collection.find(
+                {**(query or {}), 'lsh_bands': {'$in': self.band_keys(signature)}},
+                {**(projection or {}), 'minhash': 1},
+            ).limit(limit)
+            best, best_similarity = None, 0.0
+            for doc in candidates:
+                stored = np.frombuffer(doc.pop('minhash', b'') or b'', dtype=np.uint32)
+                similarity = self.similarity(signature, stored)
+                if similarity > best_similarity:
+                    best, best_similarity = doc, similarity
+        if best is None or best_similarity < self.threshold:
+            NEAR_DUPLICATES.inc(kind=self.kind, result='unique')
+            return None
+        NEAR_DUPLICATES.inc(kind=self.kind, result='duplicate')
+        return best, round(best_similarity, 4)
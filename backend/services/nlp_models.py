@@ -0,0 +1,20 @@
+"""
+Shared NLP Model Loading
+Each model is loaded once per process and shared by every service that needs it
+"""
+from functools import lru_cache
+import logging
+
+import spacy
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def load_spacy_model(name: str = "en_core_web_sm"):
+    """Load a spaCy pipeline once per process; returns None when it is not installed"""
+    try:
+        return spacy.load(name)
+    except OSError:
+        logger.warning(f"SpaCy model not found. Install: python -m spacy download {name}")
+        return None
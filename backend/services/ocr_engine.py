@@ -0,0 +1,169 @@
+"""
+OCR Engine Service
+Page images are preprocessed (grayscale, downscale, binarize) and recognized by a
+persistent in-process tesseract (tesserocr), falling back to pytesseract
+"""
+import os
+import threading
+from typing import List, Optional, Tuple
+import logging
+
+from PIL import Image
+import pytesseract
+
+from services.metrics import OCR_PAGES, stage_timer
+
+try:
+    from tesserocr import PSM, PyTessBaseAPI
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def otsu_threshold(image: Image.Image) -> int:
+    """Gray level that best separates ink from paper in an 'L' image"""
+    histogram = image.histogram()
+    total = sum(histogram)
+    weighted_total = sum(level * count for level, count in enumerate(histogram))
+    background = weighted_background = 0
+    best_level, best_variance = 127, -1.0
+    for level, count in enumerate(histogram):
+        background += count
+        if not background:
+            continue
+        foreground = total - background
+        if not foreground:
+            break
+        weighted_background += level * count
+        mean_background = weighted_background / background
+        mean_foreground = (weighted_total - weighted_background) / foreground
+        variance = background * foreground * (mean_background - mean_foreground) ** 2
+        if variance > best_variance:
+            best_level, best_variance = level, variance
+    return best_level
+
+
+def render_resolution(width_pt: float, height_pt: float, dpi: int, max_side: int = 2500) -> int:
+    """Render dpi for a page of the given size in points, capped so the long side fits `max_side`"""
+    longest = max(width_pt, height_pt) / 72.0
+    if not max_side or not longest:
+        return dpi
+    return max(1, min(dpi, int(max_side / longest)))
+
+
+def preprocess(image: Image.Image, dpi: int, max_side: int = 2500) -> Tuple[Image.Image, int]:
+    """Grayscale, downscale to at most `max_side` pixels, binarize; returns (image, effective dpi)"""
+    with stage_timer('ocr', 'preprocess'):
+        image = image.convert('L')
+        longest = max(image.size)
+        if max_side and longest > max_side:
+            scale = max_side / longest
+            image = image.resize((max(1, round(image.width * scale)), max(1, round(image.height * scale))),
+                                 Image.BILINEAR)
+            dpi = max(1, round(dpi * scale))
+        threshold = otsu_threshold(image)
+        # Stays 8-bit (0/255) so the pixel buffer can be handed to tesseract as-is
+        image = image.point([0 if level <= threshold else 255 for level in range(256)])
+    return image, dpi
+
+
+class OCREngine:
+    name = 'base'
+
+    def __init__(self, lang: str = 'eng', max_side: int = 2500):
+        self.lang = lang
+        self.max_side = max_side
+
+    def recognize(self, image: Image.Image, dpi: int = 300) -> str:
+        """Text of one page image rendered at `dpi`"""
+        page, dpi = preprocess(image, dpi, self.max_side)
+        with stage_timer('ocr', self.name):
+            text = self._recognize(page, dpi)
+        OCR_PAGES.inc(engine=self.name)
+        return text
+
+    def _recognize(self, image: Image.Image, dpi: int) -> str:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class PytesseractEngine(OCREngine):
+    """Runs the tesseract binary per page (temp image file + subprocess)"""
+    name = 'pytesseract'
+
+    def _recognize(self, image: Image.Image, dpi: int) -> str:
+        return pytesseract.image_to_string(image, lang=self.lang, config=f'--dpi {dpi}')
+
+
+class TesserocrEngine(OCREngine):
+    """
+    One initialized tesseract API per thread, created on first use and kept for the life
+    of the worker; pages are passed as raw 8-bit pixel buffers, never re-encoded
+    """
+    name = 'tesserocr'
+
+    def __init__(self, lang: str = 'eng', max_side: int = 2500, fallback: Optional[OCREngine] = None):
+        super().__init__(lang, max_side)
+        self.fallback = fallback
+        self._local = threading.local()
+        self._apis: List["PyTessBaseAPI"] = []
+        self._lock = threading.Lock()
+        self._failed = False
+
+    def _api(self) -> Optional["PyTessBaseAPI"]:
+        api = getattr(self._local, 'api', None)
+        if api is None and not self._failed:
+            try:
+                with stage_timer('ocr', 'init'):
+                    api = PyTessBaseAPI(lang=self.lang, psm=PSM.AUTO)
+            except RuntimeError as e:
+                # Usually missing tessdata; every later page goes to the fallback
+                logger.warning("tesserocr init failed, using %s: %s",
+                               self.fallback.name if self.fallback else 'no OCR', e)
+                self._failed = True
+                return None
+            self._local.api = api
+            with self._lock:
+                self._apis.append(api)
+        return api
+
+    def recognize(self, image: Image.Image, dpi: int = 300) -> str:
+        if self._api() is None:
+            return self.fallback.recognize(image, dpi) if self.fallback else ''
+        return super().recognize(image, dpi)
+
+    def _recognize(self, image: Image.Image, dpi: int) -> str:
+        api = self._local.api
+        try:
+            api.SetImageBytes(image.tobytes(), image.width, image.height, 1, image.width)
+            api.SetSourceResolution(dpi)
+            return api.GetUTF8Text()
+        finally:
+            api.Clear()
+
+    def close(self) -> None:
+        with self._lock:
+            apis, self._apis = self._apis, []
+            self._local = threading.local()
+        for api in apis:
+            api.End()
+
+
+def create_ocr_engine() -> OCREngine:
+    """Build the engine selected by OCR_ENGINE (auto | tesserocr | pytesseract)"""
+    backend = os.getenv('OCR_ENGINE', 'auto').lower()
+    lang = os.getenv('OCR_LANG', 'eng')
+    max_side = int(os.getenv('OCR_MAX_SIDE', '2500'))
+    fallback = PytesseractEngine(lang, max_side)
+    if backend == 'pytesseract':
+        return fallback
+    if TESSEROCR_AVAILABLE:
+        logger.info("Using in-process tesserocr OCR engine")
+        return TesserocrEngine(lang, max_side, fallback=fallback)
+    if backend == 'tesserocr':
+        logger.warning("OCR_ENGINE=tesserocr but tesserocr is not installed; using pytesseract")
+    return fallback
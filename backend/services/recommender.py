@@ -2,397 +2,49 @@
 Skill Recommender Service
 Provides learning resources and recommendations for missing skills
 """
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Tuple
 import logging
 
-logger = logging.getLogger(__name__)
-
-class SkillRecommender:
-    def __init__(self):
-        """Initialize the skill recommender with learning resources"""
-
-        # Learning resource database
-        self.learning_resources = {
-            # Programming Languages
-            'python': {
-                'priority': 'High',
-                'category': 'Programming Languages',
-                'difficulty': 'Beginner to Advanced',
-                'time_estimate': '2-4 weeks',
-                'resources': [
-                    {
-                        'name': 'Python.org Official Tutorial',
-                        'type': 'Documentation',
-                        'url': 'https://docs.python.org/3/tutorial/',
-                        'free': True
-                    },
-                    {
-                        'name': 'Automate the Boring Stuff with Python',
-                        'type': 'Book/Course',
-                        'url': 'https://automatetheboringstuff.com/',
-                        'free': True
-                    },
-                    {
-                        'name': 'Python for Everybody (Coursera)',
-                        'type': 'Online Course',
-                        'url': 'https://www.coursera.org/specializations/python',
-                        'free': False
-                    }
-                ]
-            },
-            'javascript': {
-                'priority': 'High',
-                'category': 'Programming Languages',
-                'difficulty': 'Beginner to Advanced',
-                'time_estimate': '3-5 weeks',
-                'resources': [
-                    {
-                        'name': 'MDN Web Docs - JavaScript',
-                        'type': 'Documentation',
-                        'url': 'https://developer.mozilla.org/en-US/docs/Web/JavaScript',
-                        'free': True
-                    },
-                    {
-                        'name': 'JavaScript.info',
-                        'type': 'Interactive Tutorial',
-                        'url': 'https://javascript.info/',
-                        'free': True
-                    },
-                    {
-                        'name': 'JavaScript Algorithms and Data Structures (freeCodeCamp)',
-                        'type': 'Online Course',
-                        'url': 'https://www.freecodecamp.org/learn/javascript-algorithms-and-data-structures/',
-                        'free': True
-                    }
-                ]
-            },
-            'typescript': {
-                'priority': 'High',
-                'category': 'Programming Languages',
-                'difficulty': 'Intermediate',
-                'time_estimate': '2-3 weeks',
-                'resources': [
-                    {
-                        'name': 'TypeScript Handbook',
-                        'type': 'Documentation',
-                        'url': 'https://www.typescriptlang.org/docs/',
-                        'free': True
-                    },
-                    {
-                        'name': 'TypeScript Course (Microsoft Learn)',
-                        'type': 'Online Course',
-                        'url': 'https://docs.microsoft.com/en-us/learn/paths/build-javascript-applications-typescript/',
-                        'free': True
-                    }
-                ]
-            },
-
-            # Web Technologies
-            'react': {
-                'priority': 'High',
-                'category': 'Web Technologies',
-                'difficulty': 'Intermediate',
-                'time_estimate': '3-4 weeks',
-                'resources': [
-                    {
-                        'name': 'Official React Documentation',
-                        'type': 'Documentation',
-                        'url': 'https://reactjs.org/docs/getting-started.html',
-                        'free': True
-                    },
-                    {
-                        'name': 'React - The Complete Guide (Udemy)',
-                        'type': 'Video Course',
-                        'url': 'https://www.udemy.com/course/react-the-complete-guide-incl-redux/',
-                        'free': False
-                    }
-                ]
-            },
-            'node.js': {
-                'priority': 'High',
-                'category': 'Web Technologies',
-                'difficulty': 'Intermediate',
-                'time_estimate': '2-3 weeks',
-                'resources': [
-                    {
-                        'name': 'Node.js Official Documentation',
-                        'type': 'Documentation',
-                        'url': 'https://nodejs.org/en/docs/',
-                        'free': True
-                    },
-                    {
-                        'name': 'Node.js Tutorial (W3Schools)',
-                        'type': 'Interactive Tutorial',
-                        'url': 'https://www.w3schools.com/nodejs/',
-                        'free': True
-                    }
-                ]
-            },
-
-            # Cloud Platforms
-            'aws': {
-                'priority': 'Medium',
-                'category': 'Cloud Platforms',
-                'difficulty': 'Intermediate to Advanced',
-                'time_estimate': '4-6 weeks',
-                'resources': [
-                    {
-                        'name': 'AWS Free Tier',
-                        'type': 'Hands-on Practice',
-                        'url': 'https://aws.amazon.com/free/',
-                        'free': True
-                    },
-                    {
-                        'name': 'AWS Cloud Practitioner Essentials',
-                        'type': 'Online Course',
-                        'url': 'https://aws.amazon.com/training/digital/aws-cloud-practitioner-essentials/',
-                        'free': True
-                    },
-                    {
-                        'name': 'AWS Solutions Architect Course',
-                        'type': 'Certification Course',
-                        'url': 'https://aws.amazon.com/training/path-architect/',
-                        'free': False
-                    }
-                ]
-            },
-            'docker': {
-                'priority': 'High',
-                'category': 'DevOps',
-                'difficulty': 'Intermediate',
-                'time_estimate': '2-3 weeks',
-                'resources': [
-                    {
-                        'name': 'Docker Official Tutorial',
-                        'type': 'Documentation',
-                        'url': 'https://docs.docker.com/get-started/',
-                        'free': True
-                    },
-                    {
-                        'name': 'Docker for Developers Course',
-                        'type': 'Video Course',
-                        'url': 'https://www.pluralsight.com/courses/docker-developers',
-                        'free': False
-                    }
-                ]
-            },
-            'kubernetes': {
-                'priority': 'Medium',
-                'category': 'DevOps',
-                'difficulty': 'Advanced',
-                'time_estimate': '4-6 weeks',
-                'resources': [
-                    {
-                        'name': 'Kubernetes Basics',
-                        'type': 'Documentation',
-                        'url': 'https://kubernetes.io/docs/tutorials/kubernetes-basics/',
-                        'free': True
-                    },
-                    {
-                        'name': 'Kubernetes for Developers (CNCF)',
-                        'type': 'Online Course',
-                        'url': 'https://www.cncf.io/certification/ckad/',
-                        'free': False
-                    }
-                ]
-            },
-
-            # Databases
-            'postgresql': {
-                'priority': 'High',
-                'category': 'Databases',
-                'difficulty': 'Intermediate',
-                'time_estimate': '2-3 weeks',
-                'resources': [
-                    {
-                        'name': 'PostgreSQL Documentation',
-                        'type': 'Documentation',
-                        'url': 'https://www.postgresql.org/docs/',
-                        'free': True
-                    },
-                    {
-                        'name': 'PostgreSQL Tutorial',
-                        'type': 'Interactive Tutorial',
-                        'url': 'https://www.postgresqltutorial.com/',
-                        'free': True
-                    }
-                ]
-            },
-            'mongodb': {
-                'priority': 'Medium',
-                'category': 'Databases',
-                'difficulty': 'Intermediate',
-                'time_estimate': '2-3 weeks',
-                'resources': [
-                    {
-                        'name': 'MongoDB University',
-                        'type': 'Online Course',
-                        'url': 'https://university.mongodb.com/',
-                        'free': True
-                    },
-                    {
-                        'name': 'MongoDB Manual',
-                        'type': 'Documentation',
-                        'url': 'https://docs.mongodb.com/manual/',
-                        'free': True
-                    }
-                ]
-            },
-
-            # Testing & Development Practices
-            'testing': {
-                'priority': 'High',
-                'category': 'Development Practices',
-                'difficulty': 'Intermediate',
-                'time_estimate': '2-3 weeks',
-                'resources': [
-                    {
-                        'name': 'Software Testing Fundamentals',
-                        'type': 'Online Course',
-                        'url': 'https://www.coursera.org/learn/software-testing-fundamentals',
-                        'free': False
-                    },
-                    {
-                        'name': 'Jest Testing Framework',
-                        'type': 'Documentation',
-                        'url': 'https://jestjs.io/docs/getting-started',
-                        'free': True
-                    }
-                ]
-            },
-            'graphql': {
-                'priority': 'Medium',
-                'category': 'Web Technologies',
-                'difficulty': 'Intermediate',
-                'time_estimate': '2-3 weeks',
-                'resources': [
-                    {
-                        'name': 'GraphQL Official Tutorial',
-                        'type': 'Documentation',
-                        'url': 'https://graphql.org/learn/',
-                        'free': True
-                    },
-                    {
-                        'name': 'The Road to GraphQL',
-                        'type': 'Book',
-                        'url': 'https://www.roadtographql.com/',
-                        'free': False
-                    }
-                ]
-            },
-            'ci/cd': {
-                'priority': 'High',
-                'category': 'DevOps',
-                'difficulty': 'Intermediate',
-                'time_estimate': '2-4 weeks',
-                'resources': [
-                    {
-                        'name': 'GitHub Actions Documentation',
-                        'type': 'Documentation',
-                        'url': 'https://docs.github.com/en/actions',
-                        'free': True
-                    },
-                    {
-                        'name': 'Jenkins Tutorial',
-                        'type': 'Online Tutorial',
-                        'url': 'https://www.jenkins.io/doc/tutorials/',
-                        'free': True
-                    }
-                ]
-            },
-            'microservices': {
-                'priority': 'Medium',
-                'category': 'Architecture',
-                'difficulty': 'Advanced',
-                'time_estimate': '4-6 weeks',
-                'resources': [
-                    {
-                        'name': 'Microservices Patterns',
-                        'type': 'Book',
-                        'url': 'https://microservices.io/patterns/',
-                        'free': True
-                    },
-                    {
-                        'name': 'Building Microservices (O\'Reilly)',
-                        'type': 'Book',
-                        'url': 'https://www.oreilly.com/library/view/building-microservices/9781491950340/',
-                        'free': False
-                    }
-                ]
-            },
-            'leadership': {
-                'priority': 'Medium',
-                'category': 'Soft Skills',
-                'difficulty': 'Intermediate',
-                'time_estimate': '4-8 weeks',
-                'resources': [
-                    {
-                        'name': 'Leadership in Technology (LinkedIn Learning)',
-                        'type': 'Online Course',
-                        'url': 'https://www.linkedin.com/learning/paths/leadership-in-technology',
-                        'free': False
-                    },
-                    {
-                        'name': 'Technical Leadership Guide',
-                        'type': 'Article/Blog',
-                        'url': 'https://www.thoughtworks.com/insights/articles/technical-leadership-guide',
-                        'free': True
-                    }
-                ]
-            }
-        }
-
-        # Generic learning platforms
-        self.generic_platforms = [
-            {
-                'name': 'Coursera',
-                'type': 'MOOC Platform',
-                'url': 'https://www.coursera.org/',
-                'description': 'University courses and professional certificates'
-            },
-            {
-                'name': 'LinkedIn Learning',
-                'type': 'Professional Development',
-                'url': 'https://www.linkedin.com/learning/',
-                'description': 'Business and technology skills courses'
-            },
-            {
-                'name': 'Pluralsight',
-                'type': 'Tech Skills Platform',
-                'url': 'https://www.pluralsight.com/',
-                'description': 'Technology and creative skills training'
-            },
-            {
-                'name': 'Udemy',
-                'type': 'Online Learning',
-                'url': 'https://www.udemy.com/',
-                'description': 'Wide range of courses on various topics'
-            },
-            {
-                'name': 'freeCodeCamp',
-                'type': 'Free Coding Bootcamp',
-                'url': 'https://www.freecodecamp.org/',
-                'description': 'Free coding curriculum with certifications'
-            }
-        ]
+from services.learning_catalog import (
+    CatalogSnapshot, DEFAULT_CATALOG_PATH, FileCatalogSource, FrozenDict, LearningCatalog, duration_weeks, freeze,
+)
+from services.metrics import stage_timer
 
-    def get_skill_recommendation(self, skill: str) -> Dict:
-        """Get recommendation for a specific skill"""
-        skill_lower = skill.lower().replace('.', '').replace('-', ' ').strip()
+logger = logging.getLogger(__name__)
 
-        # Direct match
-        if skill_lower in self.learning_resources:
-            return self.learning_resources[skill_lower]
+# Recommendation objects and plans kept per catalog version; missing skills come from a small vocabulary
+MAX_MEMOIZED_SKILLS = 10000
 
-        # Fuzzy matching for similar skills
-        for resource_skill, resource_data in self.learning_resources.items():
-            if (skill_lower in resource_skill or 
-                resource_skill in skill_lower or
-                any(skill_lower in alias for alias in resource_data.get('aliases', []))):
-                return resource_data
+class SkillRecommender:
+    def __init__(self, catalog: Optional[LearningCatalog] = None, known_skills: Iterable[str] = ()):
+        """
+        Initialize the skill recommender with a learning catalog (data/learning_resources.json by default).
+        `known_skills` are matched to catalog entries by name only, never as a prefix.
+        """
+        self.catalog = catalog or LearningCatalog(FileCatalogSource(DEFAULT_CATALOG_PATH), known_skills)
+
+    @property
+    def version(self) -> str:
+        """Content version, used by response caches to key on the catalog"""
+        return self.catalog.version
+
+    @property
+    def learning_resources(self) -> Dict:
+        return self.catalog.snapshot.learning_resources
+
+    @property
+    def generic_platforms(self) -> Tuple[Dict, ...]:
+        return self.catalog.snapshot.generic_platforms
+
+    def get_skill_recommendation(self, skill: str, snapshot: Optional[CatalogSnapshot] = None) -> Dict:
+        """Get recommendation for a specific skill (read-only)"""
+        snapshot = snapshot or self.catalog.snapshot
+        key = snapshot.match(skill)
+        if key is not None:
+            return snapshot.learning_resources[key]
 
         # Generic recommendation
-        return {
+        return freeze({
             'priority': 'Medium',
             'category': 'General',
             'difficulty': 'Varies',
@@ -417,41 +69,87 @@ class SkillRecommender:
                     'free': True
                 }
             ]
-        }
+        })
+
+    def plan_learning_path(self, missing_skills: List[str]) -> FrozenDict:
+        """
+        Missing skills in learning order: every (transitive) prerequisite first, then higher
+        priority and easier skills; skills outside the catalog come last. Spellings of one
+        skill (K8s, Kubernetes) share a step. Memoized per catalog version.
+        """
+        snapshot = self.catalog.snapshot
+        memo_key = tuple(missing_skills)
+        plan = snapshot.plans.get(memo_key)
+        if plan is not None:
+            return plan
+
+        with stage_timer('recommender', 'learning_plan', 'recommend'):
+            spelling: Dict[str, str] = {}  # catalog key -> first spelling asked for
+            generic: List[str] = []
+            for skill in missing_skills:
+                key = snapshot.match(skill)
+                if key is None:
+                    if skill not in generic:
+                        generic.append(skill)
+                else:
+                    spelling.setdefault(key, skill)
+
+            steps = []
+            total_low = total_high = 0.0
+            for key in sorted(spelling, key=snapshot.rank.__getitem__) + generic:
+                skill = spelling.get(key, key)
+                recommendation = self.get_skill_recommendation(skill, snapshot)
+                low, high = snapshot.weeks.get(key) or duration_weeks(recommendation['time_estimate']) or (0.0, 0.0)
+                ancestors = snapshot.ancestors.get(key, ())
+                steps.append({
+                    'step': len(steps) + 1,
+                    'skill': skill,
+                    'priority': recommendation['priority'],
+                    'difficulty': recommendation['difficulty'],
+                    'estimated_time': recommendation['time_estimate'],
+                    'start_week': round(total_low, 1),
+                    'weeks': [low, high],
+                    # Prerequisites covered by earlier steps, and ones the plan assumes are known
+                    'after': [spelling[p] for p in sorted(ancestors, key=snapshot.rank.__getitem__) if p in spelling],
+                    'assumes': [p for p in sorted(ancestors, key=snapshot.rank.__getitem__) if p not in spelling],
+                })
+                total_low += low
+                total_high += high
+            plan = freeze({'steps': steps, 'total_weeks': [round(total_low, 1), round(total_high, 1)]})
+
+        if len(snapshot.plans) >= MAX_MEMOIZED_SKILLS:
+            snapshot.plans.clear()
+        snapshot.plans[memo_key] = plan
+        return plan
 
     def create_learning_path(self, missing_skills: List[str]) -> List[Dict]:
-        """Create a prioritized learning path for multiple skills"""
-        learning_path = []
-
-        # Categorize skills by priority and difficulty
-        high_priority = []
-        medium_priority = []
-        low_priority = []
-
-        for skill in missing_skills:
-            recommendation = self.get_skill_recommendation(skill)
-            skill_info = {
-                'skill': skill,
-                'recommendation': recommendation
-            }
-
-            if recommendation['priority'] == 'High':
-                high_priority.append(skill_info)
-            elif recommendation['priority'] == 'Medium':
-                medium_priority.append(skill_info)
-            else:
-                low_priority.append(skill_info)
-
-        # Sort by difficulty within each priority group
-        difficulty_order = {'Beginner': 1, 'Intermediate': 2, 'Advanced': 3, 'Varies': 2}
-
-        for priority_group in [high_priority, medium_priority, low_priority]:
-            priority_group.sort(key=lambda x: difficulty_order.get(x['recommendation']['difficulty'], 2))
-
-        # Combine into final learning path
-        learning_path = high_priority + medium_priority + low_priority
+        """Create a prioritized, prerequisite-ordered learning path for multiple skills"""
+        return [
+            {'skill': step['skill'], 'recommendation': self.get_skill_recommendation(step['skill'])}
+            for step in self.plan_learning_path(missing_skills)['steps']
+        ]
 
-        return learning_path
+    def recommendation(self, skill: str) -> FrozenDict:
+        """Recommendation object for one missing skill, built once per spelling and shared"""
+        # One read of the snapshot, so a concurrent reload cannot mix catalog versions
+        snapshot = self.catalog.snapshot
+        memo = snapshot.recommendations
+        rec = memo.get(skill)
+        if rec is None:
+            recommendation = self.get_skill_recommendation(skill, snapshot)
+            rec = FrozenDict(
+                skill=skill,
+                priority=recommendation['priority'],
+                category=recommendation['category'],
+                difficulty=recommendation['difficulty'],
+                estimated_time=recommendation['time_estimate'],
+                resources=recommendation['resources'][:3],  # Limit to top 3 resources
+                learning_tips=self._learning_tips(snapshot.tips, recommendation),
+            )
+            if len(memo) >= MAX_MEMOIZED_SKILLS:
+                memo.clear()
+            memo[skill] = rec
+        return rec
 
     def get_recommendations(self, missing_skills: List[str]) -> List[Dict]:
         """Main method to get recommendations for missing skills"""
@@ -459,36 +157,30 @@ class SkillRecommender:
             if not missing_skills:
                 return []
 
-            recommendations = []
-
-            for skill in missing_skills:
-                recommendation = self.get_skill_recommendation(skill)
-
-                # Create recommendation object
-                rec = {
-                    'skill': skill,
-                    'priority': recommendation['priority'],
-                    'category': recommendation['category'],
-                    'difficulty': recommendation['difficulty'],
-                    'estimated_time': recommendation['time_estimate'],
-                    'resources': recommendation['resources'][:3],  # Limit to top 3 resources
-                    'learning_tips': self.get_learning_tips(skill, recommendation)
-                }
-
-                recommendations.append(rec)
-
-            return recommendations
+            with stage_timer('recommender', 'lookup', 'recommend'):
+                return [self.recommendation(skill) for skill in missing_skills]
 
         except Exception as e:
             logger.error(f"Error generating recommendations: {str(e)}")
             return []
 
-    def get_learning_tips(self, skill: str, recommendation: Dict) -> List[str]:
-        """Generate learning tips for a skill"""
+    def get_learning_tips(self, skill: str, recommendation: Dict) -> Tuple[str, ...]:
+        """Learning tips for a skill; they depend only on its category and difficulty"""
+        return self._learning_tips(self.catalog.snapshot.tips, recommendation)
+
+    def _learning_tips(self, memo: Dict, recommendation: Dict) -> Tuple[str, ...]:
+        key = (recommendation.get('category', ''), recommendation.get('difficulty', ''))
+        tips = memo.get(key)
+        if tips is None:
+            tips = memo[key] = self._build_tips(*key)
+        return tips
+
+    @staticmethod
+    def _build_tips(category: str, difficulty: str) -> Tuple[str, ...]:
         tips = []
 
-        category = recommendation.get('category', '').lower()
-        difficulty = recommendation.get('difficulty', '').lower()
+        category = category.lower()
+        difficulty = difficulty.lower()
 
         # Category-specific tips
         if 'programming' in category:
@@ -535,4 +227,4 @@ class SkillRecommender:
             "Apply knowledge immediately in projects"
         ])
 
-        return tips[:5]  # Return top 5 tips
+        return tuple(tips[:5])  # Return top 5 tips
@@ -0,0 +1,118 @@
+"""
+Request Timing Service
+Per-request stage timings (extract, parse, match, semantic, recommend) for
+Server-Timing headers, persisted analyses and optional profiler reports
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Callable, Dict, Iterator, Optional, Tuple
+import logging
+
+# Optional: sampling profiler; falls back to cProfile
+try:
+    from pyinstrument import Profiler
+    PYINSTRUMENT_AVAILABLE = True
+except ImportError:
+    PYINSTRUMENT_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+DEBUG_PROFILE_HEADER = "x-debug-profile"
+
+
+class RequestTimer:
+    def __init__(self):
+        """Accumulates seconds per stage for one request"""
+        self.started = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+        self._lock = threading.Lock()  # fan-out endpoints time stages on several threads
+
+    def add(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def as_dict(self) -> Dict[str, float]:
+        """Stage durations in seconds, rounded for storage"""
+        return {stage: round(seconds, 4) for stage, seconds in self.stages.items()}
+
+    def server_timing(self) -> str:
+        """Server-Timing header value (durations in milliseconds)"""
+        parts = [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in self.stages.items()]
+        parts.append(f"total;dur={self.elapsed() * 1000:.1f}")
+        return ", ".join(parts)
+
+
+_current_timer: ContextVar[Optional[RequestTimer]] = ContextVar("request_timer", default=None)
+
+
+def start_request_timer() -> RequestTimer:
+    """Create a timer and make it current for this request's context"""
+    timer = RequestTimer()
+    _current_timer.set(timer)
+    return timer
+
+
+def current_timer() -> Optional[RequestTimer]:
+    return _current_timer.get()
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    """Add to the current request's stage total (no-op outside a request)"""
+    timer = _current_timer.get()
+    if timer is not None:
+        timer.add(stage, seconds)
+
+
+def record_stages(stages: Dict[str, float]) -> None:
+    """Add stage totals measured in another context (e.g. a coalesced run) to the current request"""
+    timer = _current_timer.get()
+    if timer is not None:
+        for stage, seconds in stages.items():
+            timer.add(stage, seconds)
+
+
+def run_profiled(fn: Callable, *args, **kwargs) -> Tuple[object, Optional[str]]:
+    """Run `fn` under a profiler and dump the report; returns (result, report path)"""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+
+    if PYINSTRUMENT_AVAILABLE:
+        profiler = Profiler(interval=0.001)
+        profiler.start()
+        try:
+            result = fn(*args, **kwargs)
+        finally:
+            profiler.stop()
+        path = os.path.join(PROFILE_DIR, f"{fn.__name__}-{stamp}.html")
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(profiler.output_html())
+        return result, path
+
+    import cProfile
+    import io
+    import pstats
+
+    profiler = cProfile.Profile()
+    result = profiler.runcall(fn, *args, **kwargs)
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(60)
+    path = os.path.join(PROFILE_DIR, f"{fn.__name__}-{stamp}.txt")
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write(out.getvalue())
+    return result, path
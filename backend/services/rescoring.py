@@ -0,0 +1,191 @@
+"""
+Analysis Re-scoring Service
+Background job that brings stored analyses up to the current matcher version by
+re-matching their stored resume_skills/job_skills (no documents are re-parsed)
+"""
+import os
+import socket
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional
+import logging
+
+from pymongo import ASCENDING, ReturnDocument, UpdateOne
+from pymongo.collection import Collection
+from pymongo.errors import DuplicateKeyError
+
+from services.metrics import REGISTRY, stage_timer
+
+logger = logging.getLogger(__name__)
+
+JOB_ID = 'analyses_rescore'
+
+ANALYSES_RESCORED = REGISTRY.counter(
+    'analyses_rescored_total', 'Stored analyses re-scored to the current matcher version', ('result',))
+
+
+class AnalysisRescorer:
+    def __init__(self, analyses: Collection, state: Collection, matcher, batch_size: int = 500,
+                 pause_seconds: float = 0.0, lease_seconds: float = 120.0,
+                 on_batch: Optional[Callable[[Iterable[str]], None]] = None):
+        """
+        Re-match analyses whose `match_version` differs from `matcher.version`.
+        Progress (last _id) is kept in `state` so the job resumes after a restart;
+        a lease there keeps concurrent workers from running it twice.
+        `on_batch` receives the user ids touched by each written batch.
+        """
+        self.analyses = analyses
+        self.state = state
+        self.matcher = matcher
+        self.batch_size = batch_size
+        self.pause_seconds = pause_seconds
+        self.lease_seconds = lease_seconds
+        self.on_batch = on_batch
+        self.owner = f'{socket.gethostname()}:{os.getpid()}'
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    # ------------------------------------------------------------ state
+    def status(self) -> Dict:
+        state = self.state.find_one({'_id': JOB_ID}) or {}
+        version = self.matcher.version
+        return {
+            'version': version,
+            'running': self._thread is not None and self._thread.is_alive(),
+            'owner': state.get('owner'),
+            'state_version': state.get('version'),
+            'last_id': str(state['last_id']) if state.get('last_id') else None,
+            'processed': state.get('processed', 0),
+            'completed_at': state.get('completed_at'),
+            'remaining': self.analyses.count_documents(self._stale_query(version)),
+        }
+
+    def _claim(self, version: str) -> Optional[Dict]:
+        """Take (or renew) the lease; a new version restarts the cursor from the beginning"""
+        now = datetime.utcnow()
+        lease = now + timedelta(seconds=self.lease_seconds)
+        try:
+            self.state.update_one({'_id': JOB_ID}, {'$setOnInsert': {'lease_until': now}}, upsert=True)
+        except DuplicateKeyError:
+            pass  # another worker created it first
+        state = self.state.find_one_and_update(
+            {'_id': JOB_ID, '$or': [{'owner': self.owner}, {'lease_until': {'$lte': now}}]},
+            {'$set': {'owner': self.owner, 'lease_until': lease}},
+            return_document=ReturnDocument.AFTER,
+        )
+        if state is None:
+            return None
+        if state.get('version') != version:
+            state = self.state.find_one_and_update(
+                {'_id': JOB_ID, 'owner': self.owner},
+                {'$set': {'version': version, 'last_id': None, 'processed': 0,
+                          'started_at': now, 'completed_at': None}},
+                return_document=ReturnDocument.AFTER,
+            )
+        return state
+
+    def _release(self) -> None:
+        self.state.update_one({'_id': JOB_ID, 'owner': self.owner},
+                              {'$set': {'owner': None, 'lease_until': datetime.utcnow()}})
+
+    @staticmethod
+    def _stale_query(version: str) -> Dict:
+        return {
+            'match_version': {'$ne': version},
+            'resume_skills': {'$exists': True},
+            'job_skills': {'$exists': True},
+        }
+
+    # ------------------------------------------------------------ work
+    def _rescore(self, docs: List[Dict], version: str) -> List[UpdateOne]:
+        embeddings = None
+        if self.matcher.model:
+            # One encode for every distinct skill in the batch
+            embeddings = self.matcher.embed_skills(
+                [s for d in docs for s in (d.get('resume_skills') or []) + (d.get('job_skills') or [])])
+        ops = []
+        now = datetime.utcnow()
+        for doc in docs:
+            match = self.matcher.match(doc.get('resume_skills') or [], doc.get('job_skills') or [],
+                                       embeddings=embeddings)
+            ops.append(UpdateOne(
+                # Guard on the version read, so a concurrent newer write is never overwritten
+                {'_id': doc['_id'], 'match_version': doc.get('match_version')},
+                {'$set': {
+                    'overall_match': match['overall_match'],
+                    'matched_skills': match['matched_skills'],
+                    'missing_skills': match['missing_skills'],
+                    'partial_matches': match['partial_matches'],
+                    'semantic_similarity': match.get('semantic_similarity', 0.0),
+                    'match_version': version,
+                    'rescored_at': now,
+                }},
+            ))
+        return ops
+
+    def run_once(self) -> int:
+        """Process stale analyses until none remain or stop() is called; returns the count"""
+        version = self.matcher.version
+        state = self._claim(version)
+        if state is None:
+            logger.info("Re-scoring already running elsewhere; skipping")
+            return 0
+        last_id = state.get('last_id')
+        processed = 0
+        try:
+            while not self._stopping.is_set():
+                query = self._stale_query(version)
+                if last_id is not None:
+                    query['_id'] = {'$gt': last_id}
+                projection = {'resume_skills': 1, 'job_skills': 1, 'match_version': 1, 'user_id': 1}
+                docs = list(self.analyses.find(query, projection)
+                            .sort('_id', ASCENDING).limit(self.batch_size))
+                if not docs:
+                    self.state.update_one({'_id': JOB_ID, 'owner': self.owner},
+                                          {'$set': {'completed_at': datetime.utcnow()}})
+                    break
+                with stage_timer('rescoring', 'batch'):
+                    ops = self._rescore(docs, version)
+                    result = self.analyses.bulk_write(ops, ordered=False)
+                ANALYSES_RESCORED.inc(result.modified_count, result='updated')
+                ANALYSES_RESCORED.inc(len(ops) - result.modified_count, result='skipped')
+                processed += len(docs)
+                last_id = docs[-1]['_id']
+                # Cursor position and lease renewal in one write
+                renewed = self.state.update_one(
+                    {'_id': JOB_ID, 'owner': self.owner},
+                    {'$set': {'last_id': last_id, 'lease_until': datetime.utcnow() + timedelta(seconds=self.lease_seconds)},
+                     '$inc': {'processed': len(docs)}},
+                )
+                if self.on_batch is not None:
+                    self.on_batch({d['user_id'] for d in docs if d.get('user_id')})
+                if not renewed.matched_count:
+                    logger.warning("Re-scoring lease lost; stopping")
+                    return processed
+                if self.pause_seconds:
+                    self._stopping.wait(self.pause_seconds)
+        finally:
+            self._release()
+        logger.info("Re-scored %d analyses to matcher version %s", processed, version)
+        return processed
+
+    def start(self) -> bool:
+        """Run in a background thread; False if it is already running here"""
+        if self._thread is not None and self._thread.is_alive():
+            return False
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name='analysis-rescorer', daemon=True)
+        self._thread.start()
+        return True
+
+    def _run(self) -> None:
+        try:
+            self.run_once()
+        except Exception as e:
+            logger.error("Re-scoring failed: %s", e, exc_info=True)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
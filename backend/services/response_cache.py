@@ -0,0 +1,115 @@
+"""
+Response Cache Service
+In-process LRU + TTL cache for pure, deterministic endpoint responses
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def canonical_skills(skills: Iterable[str]) -> Tuple[str, ...]:
+    """Case-folded, sorted skill tuple (order/case independent; duplicates kept since they affect scores)"""
+    return tuple(sorted(s.strip().lower() for s in skills if s and s.strip()))
+
+
+def fingerprint(*parts: Any) -> str:
+    """Stable short hash of JSON-serializable parts (used for version stamps and keys)"""
+    payload = json.dumps(parts, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+class ResponseCache:
+    def __init__(self, ttl_seconds: float = 600.0, max_entries: int = 10000,
+                 max_bytes: int = 64 * 1024 * 1024):
+        """Initialize the cache with a TTL, an entry cap and an approximate memory budget"""
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._entries: "OrderedDict[str, Tuple[float, int, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def estimate_size(value: Any) -> int:
+        """Approximate footprint of a cached value by its compact JSON length"""
+        try:
+            return len(json.dumps(value, default=str, separators=(',', ':')))
+        except (TypeError, ValueError):
+            return 1024
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value or None; refreshes LRU position on hit"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, size, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self._bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting least recently used entries past the budgets"""
+        size = self.estimate_size(value)
+        if size > self.max_bytes:
+            logger.debug("Response too large to cache (%d bytes)", size)
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, size, value)
+            self._bytes += size
+
+            while self._entries and (len(self._entries) > self.max_entries
+                                     or self._bytes > self.max_bytes):
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit-rate and occupancy metrics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
@@ -3,26 +3,26 @@ Resume Parser Service
 Uses NLP to extract text and skills from PDF/DOCX files
 """
 import io, os, re, logging, tempfile
-from typing import Dict, List
+from typing import Dict, List, Optional
 
-import spacy
 import pdfplumber
 from PyPDF2 import PdfReader
 from docx import Document
 import docx2txt
-from PIL import Image
-import pytesseract
+
+from services.metrics import PDF_EXTRACTOR_SUCCESS, stage_timer
+from services.nlp_models import load_spacy_model
+from services.ocr_engine import create_ocr_engine, render_resolution
+from services.response_cache import fingerprint
 
 logger = logging.getLogger(__name__)
 
 class ResumeParser:
-    def __init__(self):
+    def __init__(self, ocr_engine=None):
         # NLP model
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except OSError:
-            logger.warning("SpaCy model not found. Install: python -m spacy download en_core_web_sm")
-            self.nlp = None
+        self.nlp = load_spacy_model("en_core_web_sm")
+        self.ocr = ocr_engine or create_ocr_engine()
+        self.ocr_resolution = int(os.getenv('OCR_RESOLUTION', '300'))
 
         # Simple skill lists
         self.skill_patterns = {
@@ -56,21 +56,25 @@ class ResumeParser:
         text = ''
         with pdfplumber.open(io.BytesIO(content)) as pdf:
             for p in pdf.pages:
-                img = p.to_image(resolution=300).original
-                pil_img = Image.open(io.BytesIO(img))
-                text += pytesseract.image_to_string(pil_img) + '\n'
+                # Rendering at the capped dpi is cheaper than downscaling a 300 dpi raster;
+                # .original is already a PIL image and goes to the engine without re-encoding
+                dpi = render_resolution(p.width, p.height, self.ocr_resolution, self.ocr.max_side)
+                img = p.to_image(resolution=dpi).original
+                text += self.ocr.recognize(img, dpi) + '\n'
         return text.strip()
 
     def extract_text_from_pdf(self, content: bytes) -> str:
         for extractor, name in (
             (self._pdf_with_pdfplumber, 'pdfplumber'),
             (self._pdf_with_pypdf2,    'PyPDF2'),
-            (self._pdf_with_ocr,       'OCR/pytesseract'),
+            (self._pdf_with_ocr,       f'OCR/{self.ocr.name}'),
         ):
             try:
-                text = extractor(content)
+                with stage_timer('resume_parser', f'pdf_{name}', 'extract'):
+                    text = extractor(content)
                 if text:
                     logger.info(f"PDF text extracted via {name}")
+                    PDF_EXTRACTOR_SUCCESS.inc(extractor=name)
                     return text
             except Exception as e:
                 logger.debug("PDF extractor %s failed: %s", name, e)
@@ -94,7 +98,8 @@ class ResumeParser:
             (self._docx_with_docx2txt,'docx2txt'),
         ):
             try:
-                text = extractor(content)
+                with stage_timer('resume_parser', f'docx_{name}', 'extract'):
+                    text = extractor(content)
                 if text:
                     logger.info(f"DOCX text extracted via {name}")
                     return text
@@ -115,10 +120,13 @@ class ResumeParser:
         }
 
     def extract_skills_nlp(self, text: str) -> List[str]:
-        found = {s.title() for s in self.all_skills if re.search(rf'\b{re.escape(s)}\b', text, re.I)}
+        with stage_timer('resume_parser', 'skill_patterns', 'parse'):
+            found = {s.title() for s in self.all_skills if re.search(rf'\b{re.escape(s)}\b', text, re.I)}
         if self.nlp:
             try:
-                for ent in self.nlp(text).ents:
+                with stage_timer('resume_parser', 'spacy_ner', 'parse'):
+                    ents = self.nlp(text).ents
+                for ent in ents:
                     if ent.label_ in ('ORG', 'PRODUCT'):
                         if any(skill in ent.text.lower() for skill in self.all_skills):
                             found.add(ent.text.title())
@@ -132,35 +140,48 @@ class ResumeParser:
         return max(matches) if matches else 0
 
     # ------------------------------------------------------------------ main
-    def parse(self, content: bytes, filename: str) -> Dict:
-        try:
-            filename = filename.lower()
-            if filename.endswith('.pdf'):
-                text = self.extract_text_from_pdf(content)
-            elif filename.endswith(('.docx', '.doc')):
-                text = self.extract_text_from_docx(content)
-            else:
-                raise ValueError(f"Unsupported file type: {filename}")
-
-            if not text:
-                raise ValueError("No text could be extracted from the file. "
-                                 "If your resume is a scanned image, please "
-                                 "save it as a searchable PDF or DOCX.")
-
-            skills         = self.extract_skills_nlp(text)
+    @property
+    def version(self) -> str:
+        """Fingerprint of the skill lists, so stored skills from another version are not reused"""
+        return fingerprint(self.skill_patterns)
+
+    def extract_text(self, content: bytes, filename: str) -> str:
+        filename = filename.lower()
+        if filename.endswith('.pdf'):
+            text = self.extract_text_from_pdf(content)
+        elif filename.endswith(('.docx', '.doc')):
+            text = self.extract_text_from_docx(content)
+        else:
+            raise ValueError(f"Unsupported file type: {filename}")
+
+        if not text:
+            raise ValueError("No text could be extracted from the file. "
+                             "If your resume is a scanned image, please "
+                             "save it as a searchable PDF or DOCX.")
+        return text
+
+    def parse_text(self, text: str, filename: str, skills: Optional[List[str]] = None) -> Dict:
+        """Skills and metadata for extracted text; pass `skills` to skip NLP extraction"""
+        if skills is None:
+            skills = self.extract_skills_nlp(text)
+        with stage_timer('resume_parser', 'contact_info', 'parse'):
             contact_info   = self.extract_contact_info(text)
+        with stage_timer('resume_parser', 'experience', 'parse'):
             experience_years = self.extract_experience_years(text)
 
-            metadata = {
-                'filename': filename,
-                'text_length': len(text),
-                'skills_count': len(skills),
-                'experience_years': experience_years,
-                'contact_info': contact_info,
-            }
+        metadata = {
+            'filename': filename.lower(),
+            'text_length': len(text),
+            'skills_count': len(skills),
+            'experience_years': experience_years,
+            'contact_info': contact_info,
+        }
 
-            return {'text': text, 'skills': skills, 'metadata': metadata}
+        return {'text': text, 'skills': skills, 'metadata': metadata}
 
+    def parse(self, content: bytes, filename: str) -> Dict:
+        try:
+            return self.parse_text(self.extract_text(content, filename), filename)
         except Exception as e:
             logger.error("Resume parsing failed: %s", e, exc_info=True)
             raise
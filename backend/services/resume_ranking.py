@@ -0,0 +1,217 @@
+"""
+Resume Ranking Service
+Ranks a pool of resumes against one job description: resumes are parsed on a
+process pool while a bounded window of inputs is held in memory, and scored
+results are streamed as they complete while a top-K heap is maintained
+"""
+import asyncio
+import functools
+import heapq
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import AsyncIterator, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import logging
+
+from services.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+RESUME_EXTENSIONS = ('.pdf', '.docx', '.doc')
+
+RESUMES_RANKED = REGISTRY.counter(
+    'resumes_ranked_total', 'Resumes scored by the ranking service', ('result',))
+
+# A source yields (ref, filename, load) where load() returns the file bytes; loading
+# is deferred so only the in-flight window of resumes is ever held in memory
+ResumeSource = Tuple[str, str, Callable[[], bytes]]
+
+_worker_parser = None
+
+
+class SkipResume(Exception):
+    """Raised by a source's load() for an input that is reported as skipped, not failed"""
+
+
+def _raise(error: Exception):
+    raise error
+
+
+def failed_source(ref: str, filename: str, error: Exception) -> ResumeSource:
+    """A source whose load() raises `error`, so it is reported in the stream like any other"""
+    return ref, filename, functools.partial(_raise, error)
+
+
+def _init_worker() -> None:
+    global _worker_parser
+    from services.resume_parser import ResumeParser
+    _worker_parser = ResumeParser()
+
+
+def _parse_in_worker(content: bytes, filename: str) -> Dict:
+    """Runs in a pool process; returns only the small fields ranking needs"""
+    result = _worker_parser.parse(content, filename)
+    metadata = result['metadata']
+    return {
+        'skills': result['skills'],
+        'experience_years': metadata.get('experience_years', 0),
+        'email': ((metadata.get('contact_info') or {}).get('emails') or [None])[0],
+    }
+
+
+def _ready() -> bool:
+    return _worker_parser is not None
+
+
+def zip_sources(stream: BinaryIO, prefix: str, max_member_bytes: int) -> Iterator[ResumeSource]:
+    """
+    Resume files inside a zip archive; members are decompressed one at a time. Other
+    members are reported as skipped, and an unreadable archive as one failed source.
+    """
+    try:
+        archive = zipfile.ZipFile(stream)
+        members = archive.infolist()
+    except (zipfile.BadZipFile, zipfile.LargeZipFile, OSError) as e:
+        yield failed_source(prefix, prefix, ValueError(f'unreadable zip archive: {e}'))
+        return
+    for info in members:
+        if info.is_dir():
+            continue
+        ref, filename = f'{prefix}:{info.filename}', os.path.basename(info.filename)
+        if not info.filename.lower().endswith(RESUME_EXTENSIONS):
+            yield failed_source(ref, filename, SkipResume('unsupported file type'))
+        elif info.file_size > max_member_bytes:
+            yield failed_source(ref, filename, SkipResume(f'{info.file_size} bytes exceeds the per-file limit'))
+        else:
+            yield ref, filename, (lambda info=info: archive.read(info))
+
+
+class ResumeRanker:
+    def __init__(self, max_workers: int = 2, max_in_flight: Optional[int] = None):
+        """
+        `max_workers` parser processes, each loading its own NLP pipeline once.
+        At most `max_in_flight` resumes are read but not yet scored at any time.
+        """
+        self.max_workers = max_workers
+        self.max_in_flight = max_in_flight or max_workers * 2
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: forking a threaded server process is unsafe
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+            )
+        return self._pool
+
+    def warm_up(self) -> None:
+        """Start the parser processes in the background so the first ranking skips their model load"""
+        pool = self._get_pool()
+        for _ in range(self.max_workers):
+            pool.submit(_ready)
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def _parse(self, source: ResumeSource) -> Dict:
+        ref, filename, load = source
+        loop = asyncio.get_running_loop()
+        try:
+            content = await loop.run_in_executor(None, load)
+            if not content:
+                raise ValueError('empty file')
+            parsed = await loop.run_in_executor(self._get_pool(), _parse_in_worker, content, filename)
+            return {'ref': ref, 'filename': filename, **parsed}
+        except SkipResume as e:
+            return {'ref': ref, 'filename': filename, 'skipped': str(e)}
+        except BrokenProcessPool as e:
+            # A worker died (e.g. out of memory on a huge file); start a fresh pool for the rest
+            logger.error("Resume parser pool broke on %s: %s", ref, e)
+            self._pool = None
+            return {'ref': ref, 'filename': filename, 'error': 'parser process crashed'}
+        except Exception as e:
+            return {'ref': ref, 'filename': filename, 'error': str(e)}
+
+    async def rank(self, job_skills: List[str], sources: Iterable[ResumeSource],
+                   score: Callable[[List[str]], Dict], top_k: int = 20,
+                   run_cpu: Optional[Callable] = None) -> AsyncIterator[Dict]:
+        """
+        Yield one {'type': 'result'} (or 'error' / 'skipped') event per resume as it
+        completes, then a final {'type': 'top_k'} event. `score(resume_skills)` returns a SkillMatcher result;
+        `run_cpu(fn, *args)` is awaited to run it off the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        iterator = iter(sources)
+        pending = set()
+        heap: List[Tuple[float, float, int, Dict]] = []  # min-heap of the best top_k
+        processed = failed = skipped = 0
+        exhausted = False
+
+        async def next_source() -> Optional[ResumeSource]:
+            return await loop.run_in_executor(None, next, iterator, None)
+
+        try:
+            while True:
+                while not exhausted and len(pending) < self.max_in_flight:
+                    source = await next_source()
+                    if source is None:
+                        exhausted = True
+                    else:
+                        pending.add(asyncio.ensure_future(self._parse(source)))
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    parsed = task.result()
+                    if 'skipped' in parsed:
+                        skipped += 1
+                        RESUMES_RANKED.inc(result='skipped')
+                        yield {'type': 'skipped', 'ref': parsed['ref'], 'filename': parsed['filename'],
+                               'reason': parsed['skipped']}
+                        continue
+                    processed += 1
+                    if 'error' in parsed:
+                        failed += 1
+                        RESUMES_RANKED.inc(result='failed')
+                        yield {'type': 'error', 'ref': parsed['ref'], 'filename': parsed['filename'],
+                               'error': parsed['error']}
+                        continue
+                    if run_cpu is not None:
+                        match = await run_cpu(score, parsed['skills'])
+                    else:
+                        match = score(parsed['skills'])
+                    RESUMES_RANKED.inc(result='scored')
+                    entry = {
+                        'ref': parsed['ref'],
+                        'filename': parsed['filename'],
+                        'email': parsed.get('email'),
+                        'experience_years': parsed.get('experience_years', 0),
+                        'overall_match': match['overall_match'],
+                        'semantic_similarity': match.get('semantic_similarity', 0.0),
+                        'matched_skills': match['matched_skills'],
+                        'missing_skills': match['missing_skills'],
+                        'partial_matches': match['partial_matches'],
+                    }
+                    key = (entry['overall_match'], entry['semantic_similarity'], -processed, entry)
+                    if len(heap) < top_k:
+                        heapq.heappush(heap, key)
+                    elif key[:3] > heap[0][:3]:
+                        heapq.heapreplace(heap, key)
+                    in_top_k = any(item[3] is entry for item in heap)
+                    yield {'type': 'result', **entry, 'in_top_k': in_top_k}
+        finally:
+            # Client went away mid-stream: stop the remaining parses
+            for task in pending:
+                task.cancel()
+
+        ranked = [item[3] for item in sorted(heap, key=lambda item: item[:3], reverse=True)]
+        for rank, entry in enumerate(ranked, start=1):
+            entry['rank'] = rank
+        yield {'type': 'top_k', 'processed': processed, 'failed': failed, 'skipped': skipped,
+               'job_skills': job_skills, 'results': ranked}
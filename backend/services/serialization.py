@@ -0,0 +1,133 @@
+"""
+Response Serialization Service
+Fast JSON rendering, field selection and compression for large API responses
+"""
+import gzip
+import json
+import os
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+import logging
+
+from fastapi import Request
+from fastapi.responses import Response
+
+# Optional: faster encoders/compressors when installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+COMPRESSION_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "1024"))
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+
+
+def dumps(payload: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON, via orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload, default=str,
+                            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(payload, default=str, ensure_ascii=False,
+                      separators=(',', ':')).encode('utf-8')
+
+
+async def ndjson_lines(events: AsyncIterator[Any]) -> AsyncIterator[bytes]:
+    """Newline-delimited JSON body for a StreamingResponse"""
+    async for event in events:
+        yield dumps(event) + b'\n'
+
+
+def parse_fields(fields: Optional[str]) -> Tuple[List[List[str]], Set[str]]:
+    """
+    Parse a `fields=` query value into include paths and excluded keys.
+    `fields=filename,analysis.overall_match` keeps only those (dotted) paths;
+    `fields=-text,-resources` drops those keys at any depth. Both can be mixed.
+    """
+    includes, excludes = [], set()
+    for raw in (fields or '').split(','):
+        name = raw.strip()
+        if not name:
+            continue
+        if name.startswith('-'):
+            excludes.add(name[1:])
+        else:
+            includes.append(name.split('.'))
+    return includes, excludes
+
+
+def _drop_keys(value: Any, excludes: Set[str]) -> Any:
+    if isinstance(value, dict):
+        return {k: _drop_keys(v, excludes) for k, v in value.items() if k not in excludes}
+    if isinstance(value, (list, tuple)):
+        return [_drop_keys(v, excludes) for v in value]
+    return value
+
+
+def _pick(value: Any, path: List[str]) -> Any:
+    if isinstance(value, (list, tuple)):
+        return [_pick(v, path) for v in value]
+    if not path or not isinstance(value, dict):
+        return value
+    head, rest = path[0], path[1:]
+    if head not in value:
+        return {}
+    return {head: _pick(value[head], rest)}
+
+
+def _merge(into: Dict, other: Any) -> Any:
+    if isinstance(into, dict) and isinstance(other, dict):
+        # Copied, since picked values may be shared (memoized) payloads
+        merged = dict(into)
+        for k, v in other.items():
+            merged[k] = _merge(merged[k], v) if k in merged else v
+        return merged
+    if isinstance(into, (list, tuple)) and isinstance(other, (list, tuple)):
+        return [_merge(a, b) for a, b in zip(into, other)]
+    return other
+
+
+def select_fields(payload: Any, fields: Optional[str]) -> Any:
+    """Apply a `fields=` selection to a response payload"""
+    includes, excludes = parse_fields(fields)
+    if includes and isinstance(payload, dict):
+        selected: Dict = {}
+        for path in includes:
+            selected = _merge(selected, _pick(payload, path))
+        payload = selected
+    if excludes:
+        payload = _drop_keys(payload, excludes)
+    return payload
+
+
+def compress(body: bytes, accept_encoding: str) -> Tuple[bytes, Optional[str]]:
+    """Compress a body with the best encoding the client accepts, if above the size threshold"""
+    if len(body) < COMPRESSION_MIN_BYTES:
+        return body, None
+    accepted = {part.split(';')[0].strip().lower() for part in accept_encoding.split(',')}
+    if BROTLI_AVAILABLE and 'br' in accepted:
+        return brotli.compress(body, quality=BROTLI_QUALITY), 'br'
+    if 'gzip' in accepted:
+        return gzip.compress(body, compresslevel=GZIP_LEVEL), 'gzip'
+    return body, None
+
+
+def json_response(request: Request, payload: Any, fields: Optional[str] = None,
+                  status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Render a payload through the fast path: field selection, fast encoder, compression"""
+    if fields:
+        payload = select_fields(payload, fields)
+    body, encoding = compress(dumps(payload), request.headers.get('accept-encoding', ''))
+    headers = {**(headers or {}), 'Vary': 'Accept-Encoding'}
+    if encoding:
+        headers['Content-Encoding'] = encoding
+    return Response(content=body, status_code=status_code,
+                    media_type='application/json', headers=headers)
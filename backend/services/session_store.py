@@ -0,0 +1,147 @@
+"""
+Mock Interview Session Store
+Pluggable session storage: in-process LRU/TTL or shared MongoDB with TTL indexes
+"""
+import os
+import threading
+from abc import ABC, abstractmethod
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+import logging
+
+from pymongo import ReturnDocument
+from pymongo.collection import Collection
+
+logger = logging.getLogger(__name__)
+
+
+def new_session_id() -> str:
+    """Globally unique session id (safe across workers and restarts)"""
+    return f"session_{uuid.uuid4().hex}"
+
+
+class SessionStore(ABC):
+    """Interface shared by all session store backends; calls may block, so run them off the event loop"""
+
+    @abstractmethod
+    def create(self, company_type: str) -> str:
+        """Create a session and return its id"""
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[Dict]:
+        """Return the session document, or None if missing/expired"""
+
+    @abstractmethod
+    def record_answer(self, session_id: str, answer: str) -> Optional[Dict]:
+        """Append an answer and advance the round atomically; returns the updated session"""
+
+
+class InMemorySessionStore(SessionStore):
+    def __init__(self, ttl_seconds: float = 3600.0, max_sessions: int = 10000):
+        """Single-process store with idle TTL and LRU eviction"""
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expired(self, sess: Dict, now: float) -> bool:
+        return sess["touched_at"] + self.ttl_seconds <= now
+
+    def create(self, company_type: str) -> str:
+        session_id = new_session_id()
+        with self._lock:
+            self._sessions[session_id] = {
+                "company_type": company_type,
+                "round": 0,
+                "answers": [],
+                "touched_at": time.monotonic(),
+            }
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        return session_id
+
+    def get(self, session_id: str) -> Optional[Dict]:
+        now = time.monotonic()
+        with self._lock:
+            sess = self._sessions.get(session_id)
+            if sess is None:
+                return None
+            if self._expired(sess, now):
+                del self._sessions[session_id]
+                return None
+            self._sessions.move_to_end(session_id)
+            return dict(sess, answers=list(sess["answers"]))
+
+    def record_answer(self, session_id: str, answer: str) -> Optional[Dict]:
+        now = time.monotonic()
+        with self._lock:
+            sess = self._sessions.get(session_id)
+            if sess is None or self._expired(sess, now):
+                self._sessions.pop(session_id, None)
+                return None
+            sess["answers"].append(answer)
+            sess["round"] += 1
+            sess["touched_at"] = now
+            self._sessions.move_to_end(session_id)
+            return dict(sess, answers=list(sess["answers"]))
+
+
+class MongoSessionStore(SessionStore):
+    def __init__(self, collection: Collection, ttl_seconds: float = 3600.0):
+        """
+        Shared store visible to every worker. Expiry is handled by a TTL index on
+        `expires_at`; any pymongo-compatible collection (e.g. mongomock) works locally.
+        """
+        self.collection = collection
+        self.ttl_seconds = ttl_seconds
+        try:
+            self.collection.create_index("expires_at", expireAfterSeconds=0)
+        except Exception as e:
+            logger.warning(f"Could not create TTL index on mock sessions: {e}")
+
+    def _expires_at(self) -> datetime:
+        return datetime.utcnow() + timedelta(seconds=self.ttl_seconds)
+
+    def create(self, company_type: str) -> str:
+        session_id = new_session_id()
+        self.collection.insert_one({
+            "_id": session_id,
+            "company_type": company_type,
+            "round": 0,
+            "answers": [],
+            "expires_at": self._expires_at(),
+        })
+        return session_id
+
+    def get(self, session_id: str) -> Optional[Dict]:
+        # TTL monitor runs periodically, so filter out documents it has not reaped yet
+        return self.collection.find_one({"_id": session_id, "expires_at": {"$gt": datetime.utcnow()}})
+
+    def record_answer(self, session_id: str, answer: str) -> Optional[Dict]:
+        return self.collection.find_one_and_update(
+            {"_id": session_id, "expires_at": {"$gt": datetime.utcnow()}},
+            {
+                "$push": {"answers": answer},
+                "$inc": {"round": 1},
+                "$set": {"expires_at": self._expires_at()},
+            },
+            return_document=ReturnDocument.AFTER,
+        )
+
+
+def create_session_store(db=None) -> SessionStore:
+    """Build the store selected by MOCK_SESSION_STORE (memory | mongo)"""
+    backend = os.getenv("MOCK_SESSION_STORE", "memory").lower()
+    ttl_seconds = float(os.getenv("MOCK_SESSION_TTL_SECONDS", "3600"))
+    if backend == "mongo":
+        if db is None:
+            raise ValueError("MOCK_SESSION_STORE=mongo requires a database handle")
+        logger.info("Using MongoDB mock interview session store")
+        return MongoSessionStore(db["mock_sessions"], ttl_seconds=ttl_seconds)
+    return InMemorySessionStore(
+        ttl_seconds=ttl_seconds,
+        max_sessions=int(os.getenv("MOCK_SESSION_MAX", "10000")),
+    )
@@ -0,0 +1,53 @@
+"""
+Single-Flight Service
+Coalesces identical concurrent requests: the first caller for a key starts the work,
+later callers with the same key await that result instead of recomputing it
+"""
+import asyncio
+import functools
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+import logging
+
+from services.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+FLIGHT_CALLS = REGISTRY.counter(
+    'single_flight_calls_total', 'Calls that started work (leader) or joined an in-flight one (coalesced)',
+    ('flight', 'result'))
+
+
+class SingleFlight:
+    def __init__(self, name: str, linger: float = 0.0):
+        """
+        `linger` keeps a successful result for that many seconds after it completes, so
+        retries that arrive just after the first request finishes are coalesced too
+        """
+        self.name = name
+        self.linger = linger
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        REGISTRY.gauge('single_flight_keys', 'Keys with in-flight or lingering results', ('flight',)) \
+            .set_function(lambda: len(self._calls), flight=name)
+
+    async def run(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """(result, shared): `shared` is True when another caller's run produced the result"""
+        task = self._calls.get(key)
+        shared = task is not None
+        if task is None:
+            # Its own task, so a leader whose client disconnects does not cancel the others' result
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(functools.partial(self._finished, key))
+        FLIGHT_CALLS.inc(flight=self.name, result='coalesced' if shared else 'leader')
+        return await asyncio.shield(task), shared
+
+    def _finished(self, key: Hashable, task: asyncio.Future) -> None:
+        # Failures are forgotten at once (and marked retrieved), so the next request retries
+        if task.cancelled() or task.exception() is not None or self.linger <= 0:
+            self._forget(key, task)
+        else:
+            task.get_loop().call_later(self.linger, self._forget, key, task)
+
+    def _forget(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
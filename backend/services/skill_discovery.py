@@ -0,0 +1,236 @@
+"""
+Skill Discovery Service
+Suggests skills missing from the parsers' fixed lists ("FastAPI", "Snowflake", "dbt"):
+candidate phrases are embedded in one batch and compared with the taxonomy embeddings
+"""
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, Iterable, List, Optional
+import logging
+
+import numpy as np
+from spacy.lang.en.stop_words import STOP_WORDS
+
+from services.metrics import REGISTRY, stage_timer
+
+logger = logging.getLogger(__name__)
+
+# List separators, sentence ends and dashes; '/' and '.' inside words are kept (CI/CD, Node.js)
+_SEGMENT_RE = re.compile(r'[\n,;:|•·()\[\]{}]|\.(?:\s|$)|\s[-–—]\s')
+_TOKEN_RE = re.compile(r'[A-Za-z][A-Za-z0-9+#./\-]*[A-Za-z0-9+#]|[A-Za-z]')
+_CONTACT_RE = re.compile(r'\S+@\S+|https?://\S+|www\.\S+|\b(?:[\w-]+\.)+(?:com|org|net|io|dev|me|co|in)(?:/\S*)?')
+# Section headings and job-ad vocabulary that look like proper nouns but are never skills
+_BOILERPLATE = STOP_WORDS | {
+    'about', 'benefits', 'candidate', 'company', 'contact', 'education', 'engineer', 'experience',
+    'junior', 'lead', 'nice', 'profile', 'projects', 'qualifications', 'requirements',
+    'responsibilities', 'resume', 'role', 'senior', 'skills', 'summary', 'team', 'years',
+}
+
+DISCOVERY_RUNS = REGISTRY.counter(
+    'skill_discovery_runs_total', 'Skill discovery runs by outcome', ('result',))
+
+
+_TECHNICAL_RE = re.compile(r'[0-9+#./]|.[A-Z]')  # digits, symbols or an inner capital (GraphQL, AWS)
+
+
+def _token_shape(token: str) -> int:
+    """How technical a word looks: inner capitals, digits, symbols or acronyms score 3, Title case 1"""
+    if _TECHNICAL_RE.search(token):
+        return 3
+    return 1 if token[0].isupper() else 0
+
+
+class PhraseFrequency:
+    def __init__(self, max_df: float = 0.05, min_documents: int = 200, max_phrases: int = 200000):
+        """
+        Document frequency of candidate phrases across ingested texts. Once `min_documents`
+        have been seen, phrases in more than `max_df` of them are treated as boilerplate.
+        """
+        self.max_df = max_df
+        self.min_documents = min_documents
+        self.max_phrases = max_phrases
+        self.documents = 0
+        self._counts: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def observe(self, phrases: Iterable[str]) -> None:
+        with self._lock:
+            self.documents += 1
+            self._counts.update(phrases)
+            if len(self._counts) > self.max_phrases:
+                # Keep the frequent half; rare phrases are never boilerplate anyway
+                self._counts = Counter(dict(self._counts.most_common(self.max_phrases // 2)))
+
+    def is_common(self, phrase: str) -> bool:
+        if self.documents < self.min_documents:
+            return False
+        return self._counts.get(phrase, 0) > self.max_df * self.documents
+
+
+class SkillDiscovery:
+    def __init__(self, matcher, taxonomy: Iterable[str], threshold: float = 0.5,
+                 budget_ms: float = 50.0, max_candidates: int = 64, max_suggestions: int = 10,
+                 cache_size: int = 10000):
+        """
+        Embeds `taxonomy` once. suggest() encodes only candidate phrases not already in
+        the embedding cache, and only as many as fit in what is left of `budget_ms`;
+        scoring is then one matrix multiply against the taxonomy matrix.
+        """
+        self.matcher = matcher
+        self.threshold = threshold
+        self.budget = budget_ms / 1000.0
+        self.max_candidates = max_candidates
+        self.max_suggestions = max_suggestions
+        self.cache_size = cache_size
+        self.frequency = PhraseFrequency()
+        self.taxonomy = sorted({s.strip().lower() for s in taxonomy if s and s.strip()})
+        self._canonical_names: Dict[str, str] = {}
+        self._known = {self._canonical(s) for s in self.taxonomy}
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._matrix = None
+        # Encode cost model: fixed + per_phrase * n, scaled by how recent calls compared
+        self._encode_fixed = self._encode_per_phrase = 0.0
+        self._cost_scale = 1.0
+        if matcher.model is not None and self.taxonomy:
+            self._embed(['warm up'])
+            start = time.perf_counter()
+            self._embed(['warm up'])
+            single = time.perf_counter() - start
+            start = time.perf_counter()
+            self._matrix = self._embed(self.taxonomy)
+            batch = time.perf_counter() - start
+            self._encode_per_phrase = max(batch - single, 0.0) / max(len(self.taxonomy) - 1, 1)
+            self._encode_fixed = max(single - self._encode_per_phrase, 0.0)
+
+    @property
+    def available(self) -> bool:
+        return self._matrix is not None
+
+    def _canonical(self, phrase: str) -> str:
+        name = self._canonical_names.get(phrase)
+        if name is None:
+            if len(self._canonical_names) > 100000:
+                self._canonical_names.clear()
+            name = self._canonical_names[phrase] = self.matcher.canonical_skill(phrase)
+        return name
+
+    def _embed(self, phrases: List[str]) -> "np.ndarray":
+        vectors = np.asarray(self.matcher.model.encode(phrases, batch_size=max(len(phrases), 1)),
+                             dtype=np.float32)
+        return vectors / (np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-12)
+
+    def candidates(self, text: str, known: Iterable[str] = ()) -> List[str]:
+        """
+        Words and 2-3 word runs of technical-looking words within one list item or clause,
+        excluding stopwords, known skills, pairs of known skills and boilerplate;
+        most technical-looking first
+        """
+        known_canonical = self._known | {self._canonical(s.lower()) for s in known}
+        counts: Counter = Counter()
+        spelling: Dict[str, str] = {}
+        shapes: Dict[str, int] = {}
+        for segment in _SEGMENT_RE.split(_CONTACT_RE.sub(' ', text)):
+            tokens = [t for t in (t.strip('.-/') for t in _TOKEN_RE.findall(segment)) if t]
+            lowered = [t.lower() for t in tokens]
+            known_tokens = [self._canonical(t) in known_canonical for t in lowered]
+            # Words inside a known multi-word skill ("Amazon Web Services") are known too
+            for i in range(len(tokens)):
+                for n in (3, 2):
+                    if i + n <= len(tokens) and self._canonical(' '.join(lowered[i:i + n])) in known_canonical:
+                        known_tokens[i:i + n] = [True] * n
+                        break
+            info = [(t, low in _BOILERPLATE, _token_shape(t), is_known)
+                    for t, low, is_known in zip(tokens, lowered, known_tokens)]
+            for i, (token, stop, shape, is_known) in enumerate(info):
+                if stop:
+                    continue
+                grams = [] if is_known else [(token, shape)]
+                if shape:
+                    # Multi-word skills are runs of capitalized/technical words ("AWS Lambda", "Apache Airflow")
+                    total, known_count = shape, int(is_known)
+                    for j in range(i + 1, min(i + 3, len(info))):
+                        _, stop_j, shape_j, known_j = info[j]
+                        known_count += known_j
+                        if stop_j or not shape_j or known_count > 1:
+                            break
+                        total += shape_j
+                        grams.append((' '.join(tokens[i:j + 1]), total))
+                for phrase, score in grams:
+                    key = phrase.lower()
+                    if 2 <= len(key) <= 40:
+                        counts[key] += 1
+                        spelling.setdefault(key, phrase)
+                        shapes[key] = score
+        self.frequency.observe(counts.keys())
+        ranked = []
+        for key, count in counts.items():
+            if shapes[key] == 0 and count == 1:
+                continue  # a lone lowercase word is almost never a skill
+            if self.frequency.is_common(key) or self._canonical(key) in known_canonical:
+                continue
+            ranked.append((-shapes[key], -count, len(key), spelling[key]))
+        ranked.sort()
+        return [item[3] for item in ranked]
+
+    def _cached(self, key: str) -> Optional["np.ndarray"]:
+        with self._cache_lock:
+            vector = self._cache.get(key)
+            if vector is not None:
+                self._cache.move_to_end(key)
+            return vector
+
+    def _remember(self, keys: List[str], vectors: "np.ndarray") -> None:
+        with self._cache_lock:
+            for key, vector in zip(keys, vectors):
+                self._cache[key] = vector
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def suggest(self, text: str, known: Iterable[str] = ()) -> List[Dict]:
+        """[{'skill', 'nearest', 'similarity'}] for phrases close to a taxonomy skill"""
+        if not self.available or not text:
+            return []
+        start = time.perf_counter()
+        with stage_timer('skill_discovery', 'candidates'):
+            phrases = self.candidates(text, known)[:self.max_candidates]
+        if not phrases:
+            DISCOVERY_RUNS.inc(result='no_candidates')
+            return []
+
+        vectors = {p: v for p in phrases if (v := self._cached(p.lower())) is not None}
+        missing = [p for p in phrases if p not in vectors]
+        # Encode only as many new phrases as the remaining budget allows
+        remaining = self.budget - (time.perf_counter() - start)
+        fixed = self._encode_fixed * self._cost_scale
+        per_phrase = self._encode_per_phrase * self._cost_scale
+        affordable = int((remaining - fixed) / per_phrase) if remaining > fixed and per_phrase else 0
+        encode = missing[:affordable] if per_phrase else missing
+        if encode:
+            encode_start = time.perf_counter()
+            with stage_timer('skill_discovery', 'embed', 'semantic'):
+                encoded = self._embed(encode)
+            elapsed = time.perf_counter() - encode_start
+            predicted = self._encode_fixed + self._encode_per_phrase * len(encode)
+            if predicted:
+                self._cost_scale = 0.8 * self._cost_scale + 0.2 * (elapsed / predicted)
+            self._remember([p.lower() for p in encode], encoded)
+            vectors.update(zip(encode, encoded))
+        DISCOVERY_RUNS.inc(result='truncated' if len(encode) < len(missing) else 'complete')
+
+        scored = [p for p in phrases if p in vectors]
+        if not scored:
+            return []
+        with stage_timer('skill_discovery', 'score'):
+            similarities = np.stack([vectors[p] for p in scored]) @ self._matrix.T
+            nearest = similarities.argmax(axis=1)
+            best = similarities[np.arange(len(scored)), nearest]
+        suggestions = [
+            {'skill': phrase, 'nearest': self.taxonomy[j].title(), 'similarity': round(float(score), 3)}
+            for phrase, j, score in zip(scored, nearest, best)
+            if score >= self.threshold
+        ]
+        suggestions.sort(key=lambda s: -s['similarity'])
+        return suggestions[:self.max_suggestions]
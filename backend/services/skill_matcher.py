@@ -3,10 +3,13 @@ Skill Matcher Service
 Advanced NLP-based skill matching using semantic similarity
 """
 import re
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 import logging
 from difflib import SequenceMatcher
 
+from services.metrics import stage_timer
+from services.response_cache import fingerprint
+
 # Optional: If sentence-transformers is available
 try:
     from sentence_transformers import SentenceTransformer
@@ -18,14 +21,17 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 class SkillMatcher:
-    def __init__(self):
-        """Initialize the skill matcher"""
+    def __init__(self, load_model: bool = True):
+        """Initialize the skill matcher (load_model=False skips semantic similarity)"""
         self.similarity_threshold = 0.8  # Threshold for partial matches
+        self.model_name = 'all-MiniLM-L6-v2'
 
         # Load sentence transformer model if available
-        if SENTENCE_TRANSFORMERS_AVAILABLE:
+        if not load_model:
+            self.model = None
+        elif SENTENCE_TRANSFORMERS_AVAILABLE:
             try:
-                self.model = SentenceTransformer('all-MiniLM-L6-v2')
+                self.model = SentenceTransformer(self.model_name)
                 logger.info("Loaded SentenceTransformer model for semantic similarity")
             except Exception as e:
                 logger.warning(f"Could not load SentenceTransformer: {e}")
@@ -58,6 +64,12 @@ class SkillMatcher:
             'gcp': ['gcp', 'google cloud', 'google cloud platform']
         }
 
+    @property
+    def version(self) -> str:
+        """Fingerprint of everything that influences match output (model, threshold, synonyms)"""
+        return fingerprint(self.model_name if self.model else None,
+                           self.similarity_threshold, self.skill_synonyms)
+
     def normalize_skill(self, skill: str) -> str:
         """Normalize skill name for better matching"""
         return skill.lower().strip().replace('.', '').replace('-', ' ')
@@ -72,16 +84,60 @@ class SkillMatcher:
 
         return [skill]
 
+    def canonical_skill(self, skill: str) -> str:
+        """Normalized skill with synonyms folded onto their main name ('JS' -> 'javascript')"""
+        if getattr(self, '_canonical_source', None) is not self.skill_synonyms:
+            self._canonical = {
+                self.normalize_skill(synonym): self.normalize_skill(main_skill)
+                for main_skill, synonyms in self.skill_synonyms.items()
+                for synonym in synonyms + [main_skill]
+            }
+            self._canonical_source = self.skill_synonyms
+        normalized = self.normalize_skill(skill)
+        return self._canonical.get(normalized, normalized)
+
     def calculate_text_similarity(self, text1: str, text2: str) -> float:
         """Calculate text similarity using SequenceMatcher"""
         return SequenceMatcher(None, text1.lower(), text2.lower()).ratio()
 
-    def calculate_semantic_similarity(self, skills1: List[str], skills2: List[str]) -> float:
-        """Calculate semantic similarity using sentence transformers"""
+    def embed_skills(self, skills: Sequence[str]) -> Dict[str, "np.ndarray"]:
+        """Unit-length embeddings for the distinct skills, encoded in one batch"""
+        unique = list(dict.fromkeys(skills))
+        if not self.model or not unique:
+            return {}
+        vectors = self.model.encode(unique)
+        vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        return dict(zip(unique, vectors))
+
+    def pooled_embedding(self, skills: Sequence[str]) -> Optional["np.ndarray"]:
+        """Unit-length mean of the skill embeddings: one vector per resume or job"""
+        embeddings = self.embed_skills(skills)
+        if not embeddings:
+            return None
+        pooled = np.mean(list(embeddings.values()), axis=0)
+        return (pooled / (np.linalg.norm(pooled) + 1e-12)).astype(np.float32)
+
+    def embeddings_with(self, embeddings: Dict[str, "np.ndarray"], skills: Sequence[str]) -> Dict[str, "np.ndarray"]:
+        """Copy of `embeddings` extended with any of `skills` not yet encoded"""
+        missing = [s for s in skills if s not in embeddings]
+        if not missing:
+            return embeddings
+        return {**embeddings, **self.embed_skills(missing)}
+
+    def calculate_semantic_similarity(self, skills1: List[str], skills2: List[str],
+                                      embeddings: Optional[Dict[str, "np.ndarray"]] = None) -> float:
+        """
+        Calculate semantic similarity using sentence transformers.
+        `embeddings` (from embed_skills) lets callers share one encode across many matches.
+        """
         if not self.model:
             return 0.0
 
         try:
+            if embeddings is not None:
+                embeddings1 = np.stack([embeddings[s] for s in skills1])
+                embeddings2 = np.stack([embeddings[s] for s in skills2])
+                return float(np.mean(embeddings1 @ embeddings2.T))
             embeddings1 = self.model.encode(skills1)
             embeddings2 = self.model.encode(skills2)
             similarities = np.dot(embeddings1, embeddings2.T) / (
@@ -194,7 +250,8 @@ class SkillMatcher:
 
         return prioritized
 
-    def match(self, resume_skills: List[str], job_skills: List[str], job_text: str = "") -> Dict:
+    def match(self, resume_skills: List[str], job_skills: List[str], job_text: str = "",
+              embeddings: Optional[Dict[str, "np.ndarray"]] = None) -> Dict:
         """Main method to match skills between resume and job requirements"""
         try:
             if not resume_skills or not job_skills:
@@ -207,17 +264,22 @@ class SkillMatcher:
                     'prioritized_missing': []
                 }
 
-            exact_matches = self.find_exact_matches(resume_skills, job_skills)
-            partial_matches = self.find_partial_matches(resume_skills, job_skills, exact_matches)
+            with stage_timer('skill_matcher', 'exact', 'match'):
+                exact_matches = self.find_exact_matches(resume_skills, job_skills)
+            with stage_timer('skill_matcher', 'fuzzy', 'match'):
+                partial_matches = self.find_partial_matches(resume_skills, job_skills, exact_matches)
             all_matches = set(exact_matches + partial_matches)
             missing_skills = [skill for skill in job_skills if skill not in all_matches]
             overall_match = self.calculate_match_score(exact_matches, partial_matches, len(job_skills))
 
             semantic_similarity = 0.0
             if self.model and resume_skills and job_skills:
-                semantic_similarity = self.calculate_semantic_similarity(resume_skills, job_skills)
+                with stage_timer('skill_matcher', 'embedding', 'semantic'):
+                    semantic_similarity = self.calculate_semantic_similarity(
+                        resume_skills, job_skills, embeddings)
 
-            prioritized_missing = self.prioritize_missing_skills(missing_skills, job_text)
+            with stage_timer('skill_matcher', 'prioritize', 'match'):
+                prioritized_missing = self.prioritize_missing_skills(missing_skills, job_text)
 
             return {
                 'overall_match': overall_match,
@@ -231,14 +293,29 @@ class SkillMatcher:
             logger.error(f"Error in skill matching: {str(e)}")
             raise e
 
+    def match_many(self, resume_skills: List[str], job_skill_lists: List[List[str]],
+                   job_texts: Optional[List[str]] = None) -> List[Dict]:
+        """Match one resume against many jobs, encoding every distinct skill only once"""
+        embeddings = None
+        if self.model and resume_skills:
+            with stage_timer('skill_matcher', 'embedding', 'semantic'):
+                embeddings = self.embed_skills(
+                    list(resume_skills) + [skill for skills in job_skill_lists for skill in skills])
+        job_texts = job_texts or [""] * len(job_skill_lists)
+        return [
+            self.match(resume_skills, job_skills, job_text, embeddings)
+            for job_skills, job_text in zip(job_skill_lists, job_texts)
+        ]
+
 # ---- ADD BELOW: DB SAVE HELPER ----
 
 from models.analysis import Analysis
-from config.database import db  # Adjust as needed for your actual DB connection
 
-def save_analysis_result(user_id, resume_id, job_description_id, resume_filename, match_result):
+def save_analysis_result(user_id, resume_id, job_description_id, resume_filename, match_result,
+                         writer=None):
     """
     Save the result to the Analysis collection for dashboard/history.
+    Pass the app's AnalysisWriter as `writer` to batch the insert off the request path.
     """
     analysis = Analysis(
         user_id=user_id,
@@ -251,6 +328,16 @@ def save_analysis_result(user_id, resume_id, job_description_id, resume_filename
         partial_matches=match_result.get('partial_matches', []),
         semantic_similarity=match_result.get('semantic_similarity', 0.0),
         recommendations=[],  # Add if any
+        match_version=match_result.get('match_version'),
     )
-    db.analysis.insert_one(analysis.dict(by_alias=True))
+    doc = analysis.model_dump(by_alias=True)
+    # The analyses collection stores created_at as ISO strings (see /api/analyze), so
+    # sorting and merging buffered with stored documents compare like with like
+    doc['created_at'] = analysis.created_at.isoformat()
+    if writer is not None:
+        writer.enqueue(doc)
+    else:
+        # Imported lazily: config.database connects on import, which must not happen before a fork
+        from config.database import analyses_collection
+        analyses_collection.insert_one(doc)
     return analysis
@@ -0,0 +1,157 @@
+"""
+User Summary Service
+Per-user dashboard aggregates maintained incrementally on every analysis insert,
+so the dashboard summary is a single indexed read regardless of history length
+"""
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+import logging
+
+from pymongo import UpdateOne
+from pymongo.collection import Collection
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+REBUILD_ATTEMPTS = 5
+# Ids of the latest analyses counted in a summary. An analysis is folded right after it
+# is inserted, so one that a rebuild already counted is always among the newest.
+FOLDED_IDS_WINDOW = 200
+DUPLICATE_KEY = 11000
+
+
+def _skill_key(skill: str) -> str:
+    """Mongo field-safe key for a skill ('.' and leading '$' are not allowed in paths)"""
+    key = skill.strip().replace('.', '．')
+    return '＄' + key[1:] if key.startswith('$') else key
+
+
+def _skill_name(key: str) -> str:
+    return key.replace('．', '.').replace('＄', '$')
+
+
+class UserSummaryStore:
+    def __init__(self, collection: Collection, trend_window: int = 20, top_missing: int = 10):
+        """`collection` holds one document per user, keyed by user_id as _id"""
+        self.collection = collection
+        self.trend_window = trend_window
+        self.top_missing = top_missing
+
+    def _recent_entry(self, doc: Dict) -> Dict:
+        return {
+            'analysis_id': str(doc.get('_id')),
+            'score': float(doc.get('overall_match') or 0.0),
+            'filename': doc.get('resume_filename'),
+            'date': doc.get('created_at'),
+        }
+
+    def _update_for(self, doc: Dict) -> UpdateOne:
+        score = float(doc.get('overall_match') or 0.0)
+        # `version` changes on every fold, so a concurrent rebuild can tell it raced one
+        inc = {'count': 1, 'score_total': score, 'version': 1}
+        for skill in set(doc.get('missing_skills') or []):
+            inc[f'missing_counts.{_skill_key(skill)}'] = 1
+        analysis_id = str(doc.get('_id'))
+        return UpdateOne(
+            # Skipped when the summary already counts it (a rebuild read it from history)
+            {'_id': doc['user_id'], 'folded_ids': {'$ne': analysis_id}},
+            {
+                '$inc': inc,
+                '$max': {'best_score': score},
+                '$push': {
+                    'recent': {'$each': [self._recent_entry(doc)], '$slice': -self.trend_window},
+                    'folded_ids': {'$each': [analysis_id], '$slice': -FOLDED_IDS_WINDOW},
+                },
+                '$set': {'updated_at': datetime.utcnow()},
+            },
+            upsert=True,
+        )
+
+    def record(self, docs: Iterable[Dict]) -> None:
+        """Fold newly inserted analyses into their users' summaries (one bulk write)"""
+        ops = [self._update_for(doc) for doc in docs if doc.get('user_id')]
+        if not ops:
+            return
+        try:
+            self.collection.bulk_write(ops, ordered=False)
+        except BulkWriteError as e:
+            # An already-counted analysis fails its filter, and the upsert then collides on _id
+            errors = [err for err in e.details.get('writeErrors', []) if err.get('code') != DUPLICATE_KEY]
+            if errors:
+                raise
+
+    def _aggregate(self, user_id: str, history: List[Dict], version: int) -> Dict:
+        """The summary document `record` would have built from `history` (oldest first)"""
+        missing: Dict[str, int] = {}
+        for doc in history:
+            for skill in set(doc.get('missing_skills') or []):
+                key = _skill_key(skill)
+                missing[key] = missing.get(key, 0) + 1
+        scores = [float(doc.get('overall_match') or 0.0) for doc in history]
+        return {
+            '_id': user_id,
+            'count': len(history),
+            'score_total': sum(scores),
+            'best_score': max(scores),
+            'missing_counts': missing,
+            'recent': [self._recent_entry(doc) for doc in history[-self.trend_window:]],
+            'folded_ids': [str(doc.get('_id')) for doc in history[-FOLDED_IDS_WINDOW:]],
+            'updated_at': datetime.utcnow(),
+            'version': version,
+        }
+
+    def rebuild(self, user_id: str, analyses: Collection) -> Optional[Dict]:
+        """
+        Recompute a summary from full history (backfill for users predating summaries).
+        The result is written in one operation: inserted only if no summary exists yet,
+        or replaced only if no analysis was folded in since the history was read.
+        Otherwise the history is read again. Analyses it counts are listed in `folded_ids`,
+        so a fold still pending for one of them (inserted, not yet recorded) is skipped.
+        """
+        for _ in range(REBUILD_ATTEMPTS):
+            current = self.collection.find_one({'_id': user_id}, {'version': 1})
+            history = list(analyses.find({'user_id': user_id}).sort('created_at', 1))
+            if not history:
+                return self.collection.find_one({'_id': user_id}) if current else None
+            if current is None:
+                summary = self._aggregate(user_id, history, 0)
+                try:
+                    self.collection.insert_one(summary)
+                    return summary
+                except DuplicateKeyError:
+                    continue  # a first analysis was folded in meanwhile
+            version = current.get('version')
+            summary = self._aggregate(user_id, history, (version or 0) + 1)
+            if self.collection.replace_one({'_id': user_id, 'version': version}, summary).matched_count:
+                return summary
+        logger.warning("Summary rebuild for user %s kept racing new analyses; left as is", user_id)
+        return self.collection.find_one({'_id': user_id})
+
+    def rebuild_many(self, user_ids: Iterable[str], analyses: Collection) -> None:
+        """Recompute summaries whose analyses were changed in place (e.g. re-scored)"""
+        for user_id in user_ids:
+            self.rebuild(user_id, analyses)
+
+    def format(self, summary: Dict) -> Dict:
+        count = summary.get('count', 0)
+        missing = sorted(summary.get('missing_counts', {}).items(), key=lambda kv: (-kv[1], kv[0]))
+        return {
+            'user_id': summary['_id'],
+            'count': count,
+            'average_score': round(summary.get('score_total', 0.0) / count, 1) if count else 0.0,
+            'best_score': summary.get('best_score', 0.0),
+            'recent': summary.get('recent', []),
+            'top_missing_skills': [
+                {'skill': _skill_name(key), 'count': n} for key, n in missing[:self.top_missing]
+            ],
+            'updated_at': summary.get('updated_at'),
+        }
+
+    def get(self, user_id: str, analyses: Optional[Collection] = None) -> Dict:
+        """Formatted summary; built from `analyses` on first access if missing"""
+        summary = self.collection.find_one({'_id': user_id})
+        if summary is None and analyses is not None:
+            summary = self.rebuild(user_id, analyses)
+        if summary is None:
+            return self.format({'_id': user_id})
+        return self.format(summary)
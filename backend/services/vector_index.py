@@ -0,0 +1,253 @@
+"""
+Vector Index Service
+In-memory cosine-similarity index over unit vectors: exact (brute-force NumPy)
+for small collections, IVF (k-means inverted lists) for large ones. Supports
+incremental add/delete and atomic snapshots to disk.
+"""
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def kmeans(vectors: np.ndarray, k: int, iterations: int = 10, sample: int = 50000,
+           seed: int = 0) -> np.ndarray:
+    """Spherical k-means centroids (unit length) trained on a sample of `vectors`"""
+    rng = np.random.default_rng(seed)
+    if len(vectors) > sample:
+        vectors = vectors[rng.choice(len(vectors), sample, replace=False)]
+    centroids = vectors[rng.choice(len(vectors), k, replace=False)].copy()
+    for _ in range(iterations):
+        assign = np.argmax(vectors @ centroids.T, axis=1)
+        for c in range(k):
+            members = vectors[assign == c]
+            if len(members):
+                centroids[c] = members.sum(axis=0)
+            else:
+                # Re-seed empty clusters so no list goes unused
+                centroids[c] = vectors[rng.integers(len(vectors))]
+        centroids /= np.linalg.norm(centroids, axis=1, keepdims=True) + 1e-12
+    return centroids.astype(np.float32)
+
+
+class VectorIndex:
+    def __init__(self, dim: int, ivf_threshold: int = 20000, nprobe: int = 16):
+        """
+        Exact search below `ivf_threshold` live vectors; above it an IVF index with
+        ~sqrt(N) lists is trained and `nprobe` lists are scanned per query.
+        """
+        self.dim = dim
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+
+        self._lock = threading.RLock()
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._ids: List[Optional[str]] = []  # None marks a deleted row
+        self._rows: Dict[str, int] = {}
+        self._size = 0  # rows used in _vectors (live + deleted)
+
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[List[int]] = []
+        self._trained_at = 0  # live count when the IVF was trained
+        self._training = False
+        self._compactions = 0  # row numbers change on every compaction
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def mode(self) -> str:
+        return 'ivf' if self._centroids is not None else 'exact'
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._rows
+
+    # ------------------------------------------------------------ updates
+    def add(self, item_id: str, vector: Sequence[float]) -> None:
+        """Insert or replace one vector (normalized on the way in)"""
+        self.add_many([item_id], np.asarray([vector], dtype=np.float32))
+
+    def add_many(self, item_ids: List[str], vectors: np.ndarray) -> None:
+        """Insert or replace vectors; an id repeated within the batch keeps its last vector"""
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        last = {item_id: i for i, item_id in enumerate(item_ids)}
+        if len(last) < len(item_ids):
+            keep = sorted(last.values())
+            item_ids, vectors = [item_ids[i] for i in keep], vectors[keep]
+        vectors = vectors / (np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-12)
+        with self._lock:
+            for item_id in item_ids:
+                if item_id in self._rows:
+                    self._delete_row(self._rows.pop(item_id))
+            needed = self._size + len(item_ids)
+            if needed > len(self._vectors):
+                grown = np.zeros((max(needed, 2 * len(self._vectors), 1024), self.dim), dtype=np.float32)
+                grown[:self._size] = self._vectors[:self._size]
+                self._vectors = grown
+            start = self._size
+            self._vectors[start:needed] = vectors
+            for offset, item_id in enumerate(item_ids):
+                self._ids.append(item_id)
+                self._rows[item_id] = start + offset
+            self._size = needed
+            if self._centroids is not None:
+                assign = np.argmax(vectors @ self._centroids.T, axis=1)
+                for offset, c in enumerate(assign):
+                    self._lists[c].append(start + offset)
+            retrain = self._needs_training()
+        if retrain:
+            self.train()
+
+    def delete(self, item_id: str) -> bool:
+        with self._lock:
+            row = self._rows.pop(item_id, None)
+            if row is None:
+                return False
+            self._delete_row(row)
+            # Compact once a fifth of the rows are tombstones
+            if self._size - len(self._rows) > max(1024, self._size // 5):
+                self._compact()
+            return True
+
+    def _delete_row(self, row: int) -> None:
+        self._ids[row] = None
+
+    def _compact(self) -> None:
+        live = [row for row in range(self._size) if self._ids[row] is not None]
+        self._vectors = self._vectors[live].copy()
+        self._ids = [self._ids[row] for row in live]
+        self._rows = {item_id: row for row, item_id in enumerate(self._ids)}
+        self._size = len(live)
+        self._compactions += 1
+        if self._centroids is not None:
+            self._assign_all()
+
+    def _needs_training(self) -> bool:
+        live = len(self._rows)
+        if live < self.ivf_threshold:
+            if self._centroids is not None and live < self.ivf_threshold // 2:
+                self._centroids, self._lists = None, []
+            return False
+        # (Re)train when first crossing the threshold and whenever the set doubles
+        return not self._training and (self._centroids is None or live >= 2 * self._trained_at)
+
+    def train(self) -> None:
+        """
+        Fit IVF centroids on the live vectors and rebuild the inverted lists. k-means runs
+        on a snapshot outside the lock, so searches and adds continue meanwhile (exact, or
+        on the old lists); the new centroids are swapped in at the end.
+        """
+        with self._lock:
+            if self._training:
+                return
+            self._training = True
+            if self._size - len(self._rows):
+                self._compact()
+            # Rows below _size are never written in place (growth and compaction copy), so
+            # this view stays valid after the lock is released
+            snapshot, size, compactions = self._vectors[:self._size], self._size, self._compactions
+        try:
+            nlist = max(1, int(np.sqrt(size)))
+            centroids = kmeans(snapshot, nlist)
+            assign = np.argmax(snapshot @ centroids.T, axis=1)
+            with self._lock:
+                if len(self._rows) < self.ivf_threshold // 2:
+                    return  # shrank below the threshold while training
+                self._centroids = centroids
+                if compactions != self._compactions:
+                    self._assign_all()  # rows were renumbered meanwhile
+                else:
+                    self._lists = [[] for _ in range(nlist)]
+                    for row, c in enumerate(assign):
+                        self._lists[c].append(row)
+                    if self._size > size:
+                        added = np.argmax(self._vectors[size:self._size] @ centroids.T, axis=1)
+                        for row, c in enumerate(added, start=size):
+                            self._lists[c].append(row)
+                self._trained_at = size
+            logger.info("Trained IVF index: %d vectors in %d lists", size, nlist)
+        finally:
+            with self._lock:
+                self._training = False
+
+    def _assign_all(self) -> None:
+        self._lists = [[] for _ in range(len(self._centroids))]
+        if self._size:
+            assign = np.argmax(self._vectors[:self._size] @ self._centroids.T, axis=1)
+            for row, c in enumerate(assign):
+                self._lists[c].append(row)
+
+    # ------------------------------------------------------------ search
+    def search(self, query: Sequence[float], k: int = 10,
+               nprobe: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Top-k (id, cosine similarity) for `query`, best first"""
+        q = np.asarray(query, dtype=np.float32).reshape(self.dim)
+        q = q / (np.linalg.norm(q) + 1e-12)
+        with self._lock:
+            if not self._rows:
+                return []
+            if self._centroids is None:
+                rows = np.arange(self._size)
+                scores = self._vectors[:self._size] @ q  # contiguous slice: no gather copy
+            else:
+                probe = min(nprobe or self.nprobe, len(self._centroids))
+                nearest = np.argpartition(-(self._centroids @ q), probe - 1)[:probe]
+                rows = np.fromiter((r for c in nearest for r in self._lists[c]), dtype=np.int64)
+                if not len(rows):
+                    return []
+                scores = self._vectors[rows] @ q
+            ids = self._ids
+            # Over-fetch to allow for tombstoned rows
+            fetch = min(len(rows), k + (self._size - len(self._rows)))
+            top = np.argpartition(-scores, fetch - 1)[:fetch]
+            top = top[np.argsort(-scores[top])]
+            results = []
+            for i in top:
+                item_id = ids[rows[i]]
+                if item_id is not None:
+                    results.append((item_id, float(scores[i])))
+                    if len(results) == k:
+                        break
+            return results
+
+    # ------------------------------------------------------------ persistence
+    def save(self, path: str, **meta) -> None:
+        """Atomic snapshot: write a temp file, then rename over `path`"""
+        with self._lock:
+            live = [row for row in range(self._size) if self._ids[row] is not None]
+            payload = {
+                'ids': np.array([self._ids[row] for row in live], dtype=object),
+                'vectors': self._vectors[live],
+                'centroids': self._centroids if self._centroids is not None else np.zeros((0, self.dim), np.float32),
+                'meta': np.array([meta], dtype=object),
+            }
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as fh:
+            np.savez(fh, **payload)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, dim: int, **kwargs) -> Tuple['VectorIndex', Dict]:
+        """Restore a snapshot; returns (index, meta saved with it)"""
+        index = cls(dim, **kwargs)
+        with np.load(path, allow_pickle=True) as data:
+            vectors = data['vectors']
+            if vectors.shape[1:] != (dim,):
+                raise ValueError(f'Snapshot dimension {vectors.shape[1:]} != {dim}')
+            ids = [str(i) for i in data['ids']]
+            centroids = data['centroids']
+            meta = data['meta'][0] if len(data['meta']) else {}
+        index._vectors = vectors.astype(np.float32)
+        index._ids = ids
+        index._rows = {item_id: row for row, item_id in enumerate(ids)}
+        index._size = len(ids)
+        if len(centroids):
+            index._centroids = centroids.astype(np.float32)
+            index._assign_all()
+            index._trained_at = len(ids)
+        return index, meta